@@ -0,0 +1,277 @@
+# ai_players.py
+
+import random
+import time
+import weakref
+
+from journal import MISSING
+from score_maps import CellScoreMap
+from transposition import TranspositionTable
+from zobrist import mix64, name_key
+
+DEFAULT_TIME_BUDGET = 0.2  # Seconds the "AI (Hard)" player may think per turn
+TRUSTED_ROLLOUTS = 4  # Rollouts after which a transposition's average replaces new rollouts
+FIXED_ROLLOUTS = 128  # Rollouts per turn of a reproducible "AI (Hard)" player, about the time budget's worth
+
+# Every policy is called as policy(game_state, player) -> (selected_cell, message) to play
+# its move, and offers choose_cell(game_state, player, stop=None) -> cell or None to only
+# pick it (e.g. on a snapshot in a background thread, see ai_worker.py). stop, if given,
+# is polled by long searches and ends them early when it returns True.
+
+
+class RandomPlayer:
+    """
+    The "AI (Easy)" player: a uniformly random empty cell.
+    """
+
+    def __call__(self, game_state, player):
+        return game_state.ai_take_turn(player)
+
+    def choose_cell(self, game_state, player, stop=None):
+        index = game_state.board.random_empty_index(game_state.rng)
+        return game_state.board.coords_of(index) if index is not None else None
+
+
+easy_move = RandomPlayer()
+
+
+def play_random_turn(game_state):
+    """
+    Plays the current player's turn with a random cell, the diamond absorption that
+    follows and end_turn, without notifications or journaling overhead (for clones).
+
+    Returns:
+        bool: False if the board was full.
+    """
+    player = game_state.players[game_state.current_player_index]
+    selected_cell, _ = game_state.ai_take_turn(player)
+    game_state.expand_into_adjacent_diamonds(player)
+    game_state.end_turn()
+    return selected_cell is not None
+
+
+class MonteCarloPlayer:
+    """
+    The "AI (Hard)" player: flat Monte Carlo search over a sample of empty cells.
+
+    Each turn it samples `candidates` empty cells and plays each one, with the diamond
+    absorption and end_turn after it, on a clone of the game. Then, round-robin until
+    the time budget runs out, it plays `rollout_turns` random turns for every player
+    from each resulting position. A rollout scores the player's wealth minus the best
+    opponent's; the cell with the best average score is played.
+
+    Candidates that lead to the same position (e.g. diamonds that complete the same
+    company) share one arm. Inside rollouts, the positions of the first
+    `transposition_plies` turns are kept in a TranspositionTable keyed by position_key():
+    placing the same diamonds in another order reaches the same key, so rollouts of
+    different arms share their statistics, and a position with TRUSTED_ROLLOUTS rollouts
+    ends a rollout with their average instead of playing on. Give every game its own
+    player (see game_move_policies()) so games do not share a table.
+
+    Rollouts run on GameState.clone() copies, which are flat buffer copies with no
+    callbacks, journal or logging, so a rollout allocates little beyond the clone itself.
+    The budget is checked before every rollout, so a turn overruns it by at most one
+    rollout of `rollout_turns` turns.
+
+    Usage:
+        player = MonteCarloPlayer(time_budget=0.2)
+        selected_cell, message = player(game_state, player_name)
+    """
+
+    def __init__(self, time_budget=DEFAULT_TIME_BUDGET, candidates=16, rollout_turns=8,
+                 max_rollouts=None, rng=None, transpositions=MISSING, transposition_plies=3):
+        self.time_budget = time_budget
+        self.candidates = candidates
+        self.rollout_turns = rollout_turns
+        self.max_rollouts = max_rollouts  # Optional cap, e.g. for reproducible tests
+        self.rng = rng
+        # Position key -> (score total, rollouts); None searches every turn from scratch
+        self.transpositions = TranspositionTable() if transpositions is MISSING else transpositions
+        self.transposition_plies = transposition_plies  # Rollout turns looked up in the table
+        self.last_rollouts = 0  # Rollouts played for the last choice
+
+    def __call__(self, game_state, player):
+        selected_cell = self.choose_cell(game_state, player)
+        return game_state.ai_take_turn(player, selected_cell)
+
+    def choose_cell(self, game_state, player, stop=None):
+        """
+        Returns the cell the player should take, or None if the board is full.
+        The search ends at the time budget (none if time_budget is None), after max_rollouts,
+        or as soon as stop() is true.
+        """
+        deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else float('inf')
+        # Without an own generator, follow the game's so a seeded game stays seeded
+        rng = self.rng if self.rng is not None else random.Random(game_state.rng.getrandbits(64))
+        board = game_state.board
+        candidates = board.sample_empty_indices(self.candidates, rng)
+        self.last_rollouts = 0
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return board.coords_of(candidates[0])
+
+        # One arm per distinct resulting position: [cell, position, score total, rollouts]
+        arms = {}
+        for index in candidates:
+            selected_cell = board.coords_of(index)
+            position = self._play_candidate(game_state, player, selected_cell, rng)
+            arms.setdefault(position_key(position, player), [selected_cell, position, 0, 0])
+        arms = list(arms.values())
+
+        rollouts = 0
+        while True:
+            for arm in arms:
+                if time.perf_counter() >= deadline or rollouts == self.max_rollouts or (stop and stop()):
+                    break
+                arm[2] += self._rollout(arm[1], player, rng)
+                arm[3] += 1
+                rollouts += 1
+            else:
+                continue
+            break
+        self.last_rollouts = rollouts
+
+        best = max(arms, key=lambda arm: arm[2] / arm[3] if arm[3] else float('-inf'))
+        return best[0]
+
+    def _play_candidate(self, game_state, player, selected_cell, rng):
+        position = game_state.clone(rng)
+        position.ai_take_turn(player, selected_cell)
+        position.expand_into_adjacent_diamonds(player)
+        position.end_turn()
+        return position
+
+    def _rollout(self, position, player, rng):
+        """
+        Plays one rollout from position and returns its score. The positions of the first
+        transposition_plies turns are looked up in the transposition table: one that already
+        has TRUSTED_ROLLOUTS rollouts ends the rollout with their average score, and every
+        position reached before it gets this rollout's score added to its statistics.
+        """
+        table = self.transpositions
+        simulation = position.clone(rng)
+        path = []  # (key, (score total, rollouts)) of the positions to update
+        score = None
+        for ply in range(self.rollout_turns):
+            if not play_random_turn(simulation):
+                break
+            if table is not None and ply < self.transposition_plies:
+                key = position_key(simulation, player)
+                total, visits = table.lookup(key) or (0, 0)
+                if visits >= TRUSTED_ROLLOUTS:
+                    score = total / visits
+                    break
+                path.append((key, (total, visits)))
+        if score is None:
+            wealth = simulation.wealth_summary()
+            own = wealth.pop(player)
+            score = own - max(wealth.values()) if wealth else own
+        for key, (total, visits) in path:
+            table.store(key, (total + score, visits + 1), depth=visits + 1)
+        return score
+
+
+class GreedyPlayer:
+    """
+    The "AI (Medium)" player: takes the cell that gains it the most share wealth now.
+
+    Cells are scored by a CellScoreMap per game (see score_maps.py): value gained for
+    companies the player holds shares in, merger payoffs and the 'O' marker bonus,
+    less the best gain the move hands an opponent. The map follows the game through
+    its callback diffs, so choosing a move only scores the cells next to companies and
+    the cells where a company can be founded. When no cell gains anything the player
+    places a diamond on a random cell that costs it nothing.
+
+    Ties are broken with game_state.rng, so seeded games stay reproducible.
+    """
+
+    def __init__(self):
+        self._score_maps = weakref.WeakKeyDictionary()  # GameState -> CellScoreMap
+
+    def __call__(self, game_state, player):
+        selected_cell = self.choose_cell(game_state, player)
+        return game_state.ai_take_turn(player, selected_cell)
+
+    def score_map(self, game_state):
+        """
+        Returns the CellScoreMap following game_state, creating it on first use.
+        """
+        score_map = self._score_maps.get(game_state)
+        if score_map is None:
+            score_map = self._score_maps[game_state] = CellScoreMap(game_state)
+        elif not score_map.in_sync():
+            score_map.rebuild()  # The board was replaced wholesale, without a diff
+        return score_map
+
+    def follow_clone(self, game_state, clone):
+        """
+        Gives clone, a fresh game_state.clone(), a copy of game_state's score map. A snapshot
+        searched on a worker thread (see ai_worker) then starts from the map the live game
+        keeps up to date rather than building one. Call it on the thread that owns game_state.
+        """
+        self._score_maps[clone] = self.score_map(game_state).copy(clone)
+
+    def choose_cell(self, game_state, player, stop=None):
+        """
+        Returns the cell the player should take, or None if the board is full.
+        """
+        board = game_state.board
+        if not board.empty_count():
+            return None
+        score_map = self.score_map(game_state)
+        score, best = score_map.best_cells(player)
+        if score > 0:
+            return board.coords_of(game_state.rng.choice(best))
+        # Nothing gains: a diamond where no company is next door costs nothing
+        for _ in range(8):
+            index = board.random_empty_index(game_state.rng)
+            if index not in score_map.frontier:
+                return board.coords_of(index)
+        return board.coords_of(game_state.rng.choice(best)) if best else board.coords_of(index)
+
+
+def position_key(game_state, player):
+    """
+    Returns the transposition key of a position as evaluated for player: the Zobrist
+    hash of the position plus every player's cash, which the hash leaves out.
+    """
+    key = game_state.zobrist_hash() ^ mix64(name_key(player))
+    for player_index, player_name in enumerate(game_state.players):
+        key ^= mix64((player_index << 48) ^ game_state.player_wealth[player_name])
+    return key
+
+
+# Player type -> move function(game_state, player) returning (selected_cell, message).
+MOVE_POLICIES = {
+    "AI (Easy)": easy_move,
+    "AI (Medium)": GreedyPlayer(),
+    "AI (Hard)": MonteCarloPlayer(),
+}
+AI_PLAYER_TYPES = tuple(MOVE_POLICIES)
+
+
+def game_move_policies(**hard_options):
+    """
+    Returns move policies for one game: MOVE_POLICIES, except that "AI (Hard)" is a new
+    MonteCarloPlayer(**hard_options) with a transposition table of its own, so searches
+    of different games never share (or fight over) a table.
+    """
+    return dict(MOVE_POLICIES, **{"AI (Hard)": MonteCarloPlayer(**hard_options)})
+
+
+def reproducible_move_policies(max_rollouts=FIXED_ROLLOUTS):
+    """
+    Returns move policies for one seeded game: game_move_policies() with an "AI (Hard)"
+    player that stops after max_rollouts rollouts instead of at a time budget. Its moves
+    then depend only on the game's random generator, not on the machine's speed or on
+    games played before.
+    """
+    return game_move_policies(time_budget=None, max_rollouts=max_rollouts)
+
+
+def default_ai_name(seat_number, player_type):
+    """
+    Returns the start screen's default name for an AI seat, e.g. "AI 2 (Hard)".
+    """
+    return player_type.replace("AI", f"AI {seat_number}", 1)
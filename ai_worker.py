@@ -0,0 +1,125 @@
+# ai_worker.py
+
+import threading
+
+
+class AIMoveRequest:
+    """
+    Computes one AI move in a background thread on a snapshot of the game.
+
+    The snapshot is a GameState.clone() taken when the request is created, on the
+    caller's (UI) thread, so the worker never reads the live game. The snapshot has its
+    own random generator, so the policy's draws never advance the live game's. When the
+    policy has chosen a cell, deliver(request, selected_cell, error) is called from the
+    worker thread; the UI passes a function that hands the result back to its own thread
+    (Kivy's Clock) and applies the move there with game_state.ai_take_turn(player, cell).
+
+    A policy that keeps state per game has it copied onto the snapshot when the request
+    is created: it defines follow_clone(game_state, snapshot), as GreedyPlayer does for
+    its score maps, so each turn starts from the live game's state instead of rebuilding it.
+
+    cancel() marks the request as abandoned: a policy that supports stopping (see
+    MonteCarloPlayer) ends its search early and the result is never delivered. A result
+    already on its way is recognised as stale by checking request.cancelled (or whether
+    the request is still the current one) before applying it.
+
+    Usage:
+        request = AIMoveRequest(policy, game_state, player, deliver)
+        request.start()
+        ...
+        request.cancel()   # Game restarted or left
+    """
+
+    def __init__(self, policy, game_state, player, deliver):
+        self.policy = policy
+        self.player = player
+        self.turn = game_state.turn_counter  # The turn the move is for
+        self.snapshot = game_state.clone()
+        if policy is not None:
+            _follow_snapshot([policy], game_state, self.snapshot)
+        self._deliver = deliver
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"AI move for {player}", daemon=True)
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        result, error = None, None
+        try:
+            result = self._compute()
+        except Exception as exc:  # Reported to the UI thread rather than lost with the worker
+            error = exc
+        if not self.cancelled:
+            self._deliver(self, result, error)
+
+    def _compute(self):
+        return self.policy.choose_cell(self.snapshot, self.player, stop=self._cancelled.is_set)
+
+
+class AIStretchRequest(AIMoveRequest):
+    """
+    Resolves a run of consecutive AI turns in a background thread (fast-forward).
+
+    Starting with the current player, each AI player's policy (looked up by player type
+    in `policies`) chooses a cell on the snapshot, and the turn is played there with the
+    diamond absorption and end_turn after it. The run stops at the first player without
+    a policy (a human), when the snapshot reaches `turn_limit`, or when the request is
+    cancelled. deliver(request, moves, error) then receives the list of
+    (player, selected_cell) turns in order; selected_cell is None for a turn with no
+    free cell.
+
+    Cells are only chosen with randomness, so replaying the moves on the live game with
+    ai_take_turn(player, cell), expand_into_adjacent_diamonds and end_turn reaches the
+    same position the snapshot did.
+
+    Usage:
+        request = AIStretchRequest(MOVE_POLICIES, game_state, turn_limit, deliver).start()
+    """
+
+    def __init__(self, policies, game_state, turn_limit, deliver):
+        player = game_state.players[game_state.current_player_index]
+        super().__init__(None, game_state, player, deliver)
+        self.policies = policies
+        self.turn_limit = turn_limit
+        seat_types = set(game_state.player_types.values())
+        _follow_snapshot({policies[player_type] for player_type in seat_types if player_type in policies},
+                         game_state, self.snapshot)
+
+    def _compute(self):
+        snapshot = self.snapshot
+        moves = []
+        while not self.cancelled and snapshot.turn_counter < self.turn_limit:
+            player = snapshot.players[snapshot.current_player_index]
+            policy = self.policies.get(snapshot.get_player_type(player))
+            if policy is None:
+                break
+            selected_cell = policy.choose_cell(snapshot, player, stop=self._cancelled.is_set)
+            selected_cell, _ = snapshot.ai_take_turn(player, selected_cell)
+            snapshot.expand_into_adjacent_diamonds(player)
+            snapshot.end_turn()
+            moves.append((player, selected_cell))
+        return moves
+
+
+def _follow_snapshot(policies, game_state, snapshot):
+    # Policies that keep state per game (GreedyPlayer's score maps) hand the snapshot a copy
+    # of the live game's, on this (the UI) thread
+    for policy in policies:
+        follow_clone = getattr(policy, 'follow_clone', None)
+        if follow_clone is not None:
+            follow_clone(game_state, snapshot)
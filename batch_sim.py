@@ -0,0 +1,338 @@
+# batch_sim.py
+
+try:
+    import numpy as np
+except ImportError:  # The batch simulator is the one module that needs NumPy
+    np = None
+
+from board import COMPANY, DIAMOND, EMPTY, O_MARKER
+from game_logic import COMPANY_NAMES
+from score_maps import FOUNDER_SHARES, O_MARKER_BONUS, SHARE_VALUE_PER_TILE
+
+STARTING_CASH = 6000      # Mirrors GameState.player_wealth
+SPLIT_THRESHOLD = 3200    # Mirrors GameState.check_share_split
+NO_COMPANY_ID = -1
+
+# Merger ties go to the alphabetically first name (see GameState.merge_companies)
+_NAME_ORDER = sorted(range(len(COMPANY_NAMES)), key=COMPANY_NAMES.__getitem__)
+_TIE_BONUS = [0] * len(COMPANY_NAMES)
+for _rank, _company in enumerate(_NAME_ORDER):
+    _TIE_BONUS[_company] = len(COMPANY_NAMES) - 1 - _rank
+
+
+class BatchSimulator:
+    """
+    Plays many independent games of random ("AI (Easy)") players in lockstep with NumPy.
+
+    Every game lives in one row of a set of arrays:
+      - cells: (games, rows * cols + 1) cell states (board.EMPTY, DIAMOND, O_MARKER, COMPANY).
+        The extra last column is an always-empty cell that off-board neighbours point to.
+      - company: the same shape, the company id (index into COMPANY_NAMES) of each company
+        tile, NO_COMPANY_ID elsewhere.
+      - company_size, company_value, active: (games, companies) per company.
+      - shares: (games, players, companies) share holdings.
+      - name_queue / name_count: each game's available company names, in GameState order.
+
+    step() plays one turn in every unfinished game: a uniformly random empty cell per game,
+    classified and played as GameState.ai_take_turn would, then the diamond absorption of
+    GameState.expand_into_adjacent_diamonds. Each rule is applied to all the games that
+    need it at once, as array operations over those rows. The semantics follow GameState
+    exactly, including its quirks (a merged company's value leaves out the tile that
+    triggered the merger, and a company over the split threshold splits again on every
+    expansion), and tests/test_batch_sim.py replays the same cells through GameState turn
+    by turn to check this.
+
+    Random players never trade, so cash stays at STARTING_CASH. Holdings are int64; a
+    split that would overflow them raises OverflowError (long games on large boards
+    double holdings hundreds of times; the default 80-turn game stays far below), and
+    wealth() falls back to Python integers when holdings times values would overflow.
+
+    Usage:
+        simulator = BatchSimulator(10000, (28, 24), players=4, seed=1)
+        simulator.run(80)
+        wealth = simulator.wealth()   # (games, players)
+    """
+
+    def __init__(self, games, grid_size, players=4, marker_percentage=0.1, seed=None):
+        if np is None:
+            raise ImportError("NumPy is required for the batch simulator.")
+        self.rng = np.random.default_rng(seed)
+        self.games = games
+        self.grid_size = grid_size
+        self.players = players
+        rows, cols = grid_size
+        size = self.size = rows * cols
+        self.turn = 0
+
+        # Neighbours in North, South, West, East order; off the board is the sentinel cell `size`
+        index = np.arange(size).reshape(rows, cols)
+        padded = np.pad(index, 1, constant_values=size)
+        self.neighbours = np.stack([padded[:-2, 1:-1], padded[2:, 1:-1],
+                                    padded[1:-1, :-2], padded[1:-1, 2:]], axis=-1).reshape(size, 4)
+        self._indices = np.arange(size)
+
+        companies = len(COMPANY_NAMES)
+        self.cells = np.zeros((games, size + 1), dtype=np.int8)
+        self.company = np.full((games, size + 1), NO_COMPANY_ID, dtype=np.int8)
+        self.o_adjacent = np.zeros((games, size + 1), dtype=np.int8)
+        self.company_neighbours = np.zeros((games, size + 1), dtype=np.int8)  # Adjacent company tiles
+        self.company_size = np.zeros((games, companies), dtype=np.int32)
+        self.o_marker_tiles = np.zeros((games, companies), dtype=np.int32)
+        self.company_value = np.zeros((games, companies), dtype=np.int64)
+        self.active = np.zeros((games, companies), dtype=bool)
+        self.shares = np.zeros((games, players, companies), dtype=np.int64)
+        self.name_queue = np.tile(np.arange(companies, dtype=np.int8), (games, 1))
+        self.name_count = np.full(games, companies, dtype=np.int8)
+        self.merger_count = np.zeros(games, dtype=np.int32)
+        self.moves = np.zeros(games, dtype=np.int32)
+        self.finished = np.zeros(games, dtype=bool)   # Board full
+        self.last_cells = np.full(games, -1)          # Cell index played last step, -1 if none
+        self._pending = np.zeros(games, dtype=bool)   # May have a diamond next to a company
+
+        # 'O' markers: int(size * marker_percentage) distinct cells per game, as random_o_marker_locations
+        all_games = np.arange(games)[:, None]
+        markers = self.rng.random((games, size)).argsort(axis=1)[:, :int(size * marker_percentage)]
+        self.cells[all_games, markers] = O_MARKER
+        self.o_adjacent[all_games[:, :, None], self.neighbours[markers]] = 1
+        self.o_adjacent[:, size] = 0
+
+        # Empty cells as a list per game; the first free_count entries of a row are still empty
+        self.free = np.ascontiguousarray(np.nonzero(self.cells[:, :size] == EMPTY)[1].reshape(games, -1))
+        self.free_count = np.full(games, self.free.shape[1], dtype=np.intp)
+
+    # --- Queries ---
+
+    def o_marker_locations(self, game):
+        """
+        Returns the (row, col) of every 'O' marker of one game, e.g. to set up a GameState.
+        """
+        cols = self.grid_size[1]
+        return {divmod(int(index), cols) for index in np.flatnonzero(self.cells[game, :self.size] == O_MARKER)}
+
+    def current_player(self):
+        return self.turn % self.players
+
+    def wealth(self):
+        """
+        Returns a (games, players) array of cash plus share value, as GameState.wealth_summary.
+        """
+        values = np.where(self.active, self.company_value, 0)
+        shares = self.shares
+        if int(shares.max(initial=0)) * int(values.max(initial=0)) * len(COMPANY_NAMES) >= 1 << 62:
+            shares, values = shares.astype(object), values.astype(object)  # Exact, in Python ints
+        return STARTING_CASH + (shares * values[:, None, :]).sum(axis=2)
+
+    # --- Play ---
+
+    def run(self, turns):
+        """
+        Plays up to `turns` turns, stopping early once every board is full.
+        """
+        for _ in range(turns):
+            if self.finished.all():
+                break
+            self.step()
+        return self
+
+    def step(self):
+        """
+        Plays one turn of the current player in every unfinished game.
+        """
+        player = self.current_player()
+        self.last_cells[:] = -1
+        self.finished |= self.free_count == 0
+        games = np.flatnonzero(~self.finished)
+        if len(games):
+            cells = self._draw_cells(games)
+            self.last_cells[games] = cells
+            self.moves[games] += 1
+            self._play(games, cells, player, moving=True)
+            self._absorb_diamonds(games, player)
+        self.turn += 1
+
+    def _draw_cells(self, games):
+        # A uniform draw from each game's free list, swap-removed from it (flat offsets are
+        # much cheaper than 2-D fancy indexing at this batch size)
+        free = self.free.reshape(-1)
+        rows = games * self.free.shape[1]
+        last = self.free_count[games] - 1
+        picks = rows + (self.rng.random(len(games)) * (last + 1)).astype(np.intp)
+        cells = free.take(picks)
+        free.put(picks, free.take(rows + last))
+        self.free_count[games] = last
+        return cells
+
+    def _adjacent_companies(self, games, cells):
+        # Bit mask of the distinct companies next to each cell, the neighbours and their states
+        neighbours = self.neighbours[cells]
+        flat = (games * (self.size + 1))[:, None] + neighbours
+        bits = _COMPANY_BIT.take(self.company.reshape(-1).take(flat) + 1)
+        bits = bits[:, 0] | bits[:, 1] | bits[:, 2] | bits[:, 3]
+        neighbour_states = self.cells.reshape(-1).take(flat)
+        return bits, neighbours, neighbour_states
+
+    def _play(self, games, cells, player, moving):
+        """
+        Plays cells[i] in games[i]: the move itself (moving=True) or the absorption of a
+        diamond that has a company next to it (moving=False).
+        """
+        bits, neighbours, neighbour_states = self._adjacent_companies(games, cells)
+        company_count = _POPCOUNT[bits]
+        adjacent_diamonds = (neighbour_states == DIAMOND).sum(axis=1)
+        names_left = self.name_count[games] > 0
+
+        merge = company_count >= 2
+        from_diamonds = merge & (adjacent_diamonds >= 2) & names_left
+        if from_diamonds.any():
+            # A merger next to two or more diamonds founds a new company from them instead
+            self._found_from_diamonds(games[from_diamonds], cells[from_diamonds],
+                                      neighbours[from_diamonds], neighbour_states[from_diamonds], player)
+        merge &= ~from_diamonds
+        if merge.any():
+            self._merge(games[merge], cells[merge], bits[merge], player)
+        expand = company_count == 1
+        if expand.any():
+            names = _LOWEST_BIT[bits[expand]]
+            self._expand(games[expand], cells[expand], names)
+        if moving:
+            occupied = (neighbour_states != EMPTY).any(axis=1)
+            found = (company_count == 0) & occupied & names_left
+            if found.any():
+                self._found(games[found], cells[found][:, None], player)
+            diamond = (company_count == 0) & ~found
+            if diamond.any():
+                games, cells = games[diamond], cells[diamond]
+                self.cells[games, cells] = DIAMOND
+                self._pending[games] |= self.company_neighbours[games, cells] > 0
+
+    def _attach(self, games, cells, names):
+        # Makes each cell a tile of its company, moving it out of the company it was in
+        stride = self.size + 1
+        flat = games * stride + cells
+        states = self.cells.reshape(-1)
+        sizes = self.company_size.reshape(-1)
+        o_marker_tiles = self.o_marker_tiles.reshape(-1)
+        o_adjacent = self.o_adjacent.reshape(-1).take(flat)
+        moved = states.take(flat) == COMPANY
+        if moved.any():
+            old = games[moved] * len(COMPANY_NAMES) + self.company.reshape(-1).take(flat[moved])
+            sizes[old] -= 1
+            o_marker_tiles[old] -= o_adjacent[moved]
+            new = ~moved
+            games, cells, flat_new = games[new], cells[new], flat[new]
+        else:
+            flat_new = flat
+        if len(flat_new):
+            neighbours = (games * stride)[:, None] + self.neighbours[cells]
+            self.company_neighbours.reshape(-1)[neighbours] += 1
+            self._pending[games] |= (states.take(neighbours) == DIAMOND).any(axis=1)
+            states[flat_new] = COMPANY
+        self.company.reshape(-1)[flat] = names
+        slots = (flat // stride) * len(COMPANY_NAMES) + names
+        sizes[slots] += 1
+        o_marker_tiles[slots] += o_adjacent
+
+    def _update_value(self, games, names):
+        value = self.company_size[games, names] * SHARE_VALUE_PER_TILE
+        value += np.where(self.o_marker_tiles[games, names] > 0, O_MARKER_BONUS, 0)
+        self.company_value[games, names] = value
+
+    def _expand(self, games, cells, names):
+        self._attach(games, cells, names)
+        self._update_value(games, names)
+        split = self.company_value[games, names] >= SPLIT_THRESHOLD
+        if split.any():
+            games, names = games[split], names[split]
+            holdings = self.shares[games, :, names]
+            if holdings.max() >= 1 << 62:
+                raise OverflowError("Share holdings outgrew int64; simulate fewer turns or a smaller board.")
+            self.shares[games, :, names] = holdings * 2
+            self.company_value[games, names] //= 2
+
+    def _take_names(self, games):
+        names = self.name_queue[games, 0].astype(np.intp)
+        self.name_queue[games, :-1] = self.name_queue[games, 1:]
+        self.name_queue[games, -1] = NO_COMPANY_ID
+        self.name_count[games] -= 1
+        self.active[games, names] = True
+        return names
+
+    def _found(self, games, tiles, player):
+        # tiles: (games, k) cell indices of each new company, -1 for unused slots
+        names = self._take_names(games)
+        for column in tiles.T:
+            used = column >= 0
+            self._attach(games[used], column[used], names[used])
+        self._update_value(games, names)
+        self.shares[games, player, names] += FOUNDER_SHARES
+
+    def _found_from_diamonds(self, games, cells, neighbours, neighbour_states, player):
+        tiles = np.where(neighbour_states == DIAMOND, neighbours, -1)
+        self._found(games, np.column_stack([tiles, cells]), player)
+
+    def _merge(self, games, cells, bits, player):
+        # Order the merging companies by size, largest first, ties by name
+        members = (bits[:, None] >> np.arange(len(COMPANY_NAMES))) & 1 == 1
+        scores = np.where(members, self.company_size[games] * 8 + np.array(_TIE_BONUS), -1)
+        acquirers = scores.argmax(axis=1)
+        rows = np.arange(len(games))
+        scores[rows, acquirers] = -1
+        while True:
+            acquired = scores.argmax(axis=1)
+            merging = scores[rows, acquired] >= 0
+            if not merging.any():
+                break
+            scores[rows, acquired] = -1
+            self._absorb_company(games[merging], acquired[merging], acquirers[merging])
+        self._update_value(games, acquirers)
+        # The triggering cell joins after the value update, as in GameState.merge_companies
+        joining = self.cells[games, cells] != COMPANY
+        self._attach(games[joining], cells[joining], acquirers[joining])
+
+    def _absorb_company(self, games, acquired, acquirers):
+        tiles = self.company[games] == acquired[:, None]
+        self.company[games] = np.where(tiles, acquirers[:, None], self.company[games])
+        self.company_size[games, acquirers] += self.company_size[games, acquired]
+        self.o_marker_tiles[games, acquirers] += self.o_marker_tiles[games, acquired]
+        self.shares[games, :, acquirers] += self.shares[games, :, acquired]
+        self.shares[games, :, acquired] = 0
+        self.company_size[games, acquired] = 0
+        self.o_marker_tiles[games, acquired] = 0
+        self.company_value[games, acquired] = 0
+        self.active[games, acquired] = False
+        # The acquired company's name goes back to the end of the queue
+        self.name_queue[games, self.name_count[games]] = acquired
+        self.name_count[games] += 1
+        self.merger_count[games] += 1
+
+    def _absorb_diamonds(self, games, player):
+        """
+        GameState.expand_into_adjacent_diamonds for every game that may need it: the
+        diamonds on the board when it starts are visited in index order, and each one that
+        has a company next to it at that point is absorbed before the next is looked at.
+        """
+        games = games[self._pending[games]]
+        if not len(games):
+            return
+        size = self.size
+        visiting = self.cells[games, :size] == DIAMOND
+        cursor = np.full(len(games), -1)
+        rows = np.arange(len(games))
+        while len(rows):
+            candidates = visiting[rows] & (self.company_neighbours[games[rows], :size] > 0) \
+                & (self._indices > cursor[rows, None])
+            found = candidates.any(axis=1)
+            rows = rows[found]
+            if not len(rows):
+                break
+            cells = candidates[found].argmax(axis=1)
+            cursor[rows] = cells
+            self._play(games[rows], cells, player, moving=False)
+        cells = self.cells[games, :size]
+        self._pending[games] = ((cells == DIAMOND) & (self.company_neighbours[games, :size] > 0)).any(axis=1)
+
+
+if np is not None:
+    _COMPANY_BIT = np.array([0] + [1 << company for company in range(len(COMPANY_NAMES))])  # By company id + 1
+    _POPCOUNT = np.array([bin(bits).count('1') for bits in range(1 << len(COMPANY_NAMES))])
+    _LOWEST_BIT = np.array([(bits & -bits).bit_length() - 1 for bits in range(1 << len(COMPANY_NAMES))])
@@ -0,0 +1,52 @@
+# benchmarks/bench_batch_sim.py
+#
+# Measures moves/sec of the NumPy BatchSimulator against headless GameState play of the
+# same all-random games.
+#
+#   python benchmarks/bench_batch_sim.py [--games 10000] [--turns 80]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from batch_sim import BatchSimulator
+from headless import ai_player_configurations, play_game
+
+GRID_SIZE = (28, 24)
+PLAYERS = 4
+
+
+def batch_moves_per_second(games, turns):
+    simulator = BatchSimulator(games, GRID_SIZE, PLAYERS, seed=1)
+    start = time.perf_counter()
+    simulator.run(turns)
+    return simulator.moves.sum() / (time.perf_counter() - start)
+
+
+def game_state_moves_per_second(games, turns):
+    player_configurations = ai_player_configurations(PLAYERS)
+    moves = 0
+    start = time.perf_counter()
+    for seed in range(games):
+        moves += play_game(player_configurations, GRID_SIZE, turns, seed=seed).moves
+    return moves / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure BatchSimulator moves/sec against headless GameState play.")
+    parser.add_argument('--games', type=int, default=10000, help="games simulated in lockstep")
+    parser.add_argument('--turns', type=int, default=80)
+    args = parser.parse_args()
+
+    batched = batch_moves_per_second(args.games, args.turns)
+    single = game_state_moves_per_second(max(1, args.games // 100), args.turns)
+
+    print(f"BatchSimulator: {batched:12.0f} moves/sec")
+    print(f"GameState:      {single:12.0f} moves/sec")
+    print(f"Speed-up: {batched / single:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_event_log.py
+#
+# Measures AI moves/sec on the largest board with the GameState event log disabled
+# and with full DEBUG logging written to os.devnull.
+#
+#   python benchmarks/bench_event_log.py [--moves 20000]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from event_log import DEBUG, OFF, EventLog
+from game_logic import GameState
+
+GRID_SIZE = (28, 24)
+MARKER_PERCENTAGE = 0.1
+PLAYER_CONFIGURATIONS = [
+    {'name': f'AI {i} (Easy)', 'profile_username': None, 'type': 'AI (Easy)'} for i in range(1, 5)
+]
+
+
+def new_game(log):
+    game_state = GameState(PLAYER_CONFIGURATIONS, GRID_SIZE, os.path.dirname(os.path.abspath(__file__)))
+    game_state.log = log
+    game_state.journal = None  # Headless play needs no undo history
+    all_coordinates = [(r, c) for r in range(GRID_SIZE[0]) for c in range(GRID_SIZE[1])]
+    random.shuffle(all_coordinates)
+    game_state.set_initial_o_marker_locations(all_coordinates[:int(len(all_coordinates) * MARKER_PERCENTAGE)])
+    return game_state
+
+
+def moves_per_second(log, total_moves):
+    random.seed(1234)
+    game_state = new_game(log)
+    start = time.perf_counter()
+    for _ in range(total_moves):
+        player = game_state.players[game_state.current_player_index]
+        selected_cell, _ = game_state.ai_take_turn(player)
+        if selected_cell is None:  # Board full: start a fresh game
+            game_state = new_game(log)
+            continue
+        game_state.end_turn()
+    return total_moves / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure AI moves/sec with the GameState event log off and at DEBUG.")
+    parser.add_argument('--moves', type=int, default=20000)
+    args = parser.parse_args()
+
+    disabled = moves_per_second(EventLog(level=OFF), args.moves)
+    with open(os.devnull, 'w') as devnull:
+        enabled = moves_per_second(EventLog(level=DEBUG, stream=devnull), args.moves)
+
+    print(f"Logging off:   {disabled:10.0f} moves/sec")
+    print(f"Logging DEBUG: {enabled:10.0f} moves/sec")
+    print(f"Speed-up with logging off: {disabled / enabled:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,901 @@
+# board.py
+
+import random
+from array import array
+from functools import lru_cache
+from collections.abc import Mapping, MutableMapping, MutableSet
+from collections.abc import Set as AbstractSet
+
+from zobrist import MASK64, cell_keys, company_key, tile_keys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the engine itself only needs the stdlib arrays
+    np = None
+
+# Cell states stored in Board.cells
+EMPTY = 0
+DIAMOND = 1
+O_MARKER = 2
+COMPANY = 3
+
+NO_COMPANY = -1  # Board.company_ids value for cells without a company tile
+
+# Undo records appended to Board.journal while a journaled GameState action runs.
+# CompanyMap.revert() and CompanyMap.reapply() undo and redo them.
+CELL_CHANGED = 0   # (kind, index, old_state, new_state): a diamond placed or removed
+TILE_ADDED = 1     # (kind, index, node, owner_id, old_state)
+TILE_REMOVED = 2   # (kind, index, node, owner_id)
+NODE_ADDED = 3     # (kind, node, company_name)
+COMPANY_MERGED = 4 # (kind, acquired_name, acquirer_name, acquired_root, acquirer_root, root, child, root_before)
+VALUE_CHANGED = 5  # (kind, root, old_value, new_value)
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(grid_size):
+    """
+    Returns, for every cell index of a (rows, cols) grid, a tuple with the indices of
+    its in-bounds orthogonal neighbours (North, South, West, East order).
+    Built once per grid size and shared by every board of that size.
+    """
+    rows, cols = grid_size
+    table = []
+    for r in range(rows):
+        for c in range(cols):
+            index = r * cols + c
+            neighbours = []
+            if r > 0:
+                neighbours.append(index - cols)
+            if r < rows - 1:
+                neighbours.append(index + cols)
+            if c > 0:
+                neighbours.append(index - 1)
+            if c < cols - 1:
+                neighbours.append(index + 1)
+            table.append(tuple(neighbours))
+    return tuple(table)
+
+
+class Board:
+    """
+    Flat, array-backed storage for the game grid.
+
+    Cells are addressed by index = row * cols + col.
+      - cells: one int8 state per cell (EMPTY, DIAMOND, O_MARKER or COMPANY).
+      - company_ids: one int16 company node id per cell (NO_COMPANY where there is no tile).
+      - owner_ids: one index into owner_names per company tile.
+      - o_marker_adjacent: 1 where the cell is orthogonally adjacent to an 'O' marker.
+      - neighbours: the shared neighbour_table for this grid size.
+
+    The board also keeps a list of empty cell indices plus each cell's position in it,
+    maintained with swap-remove by set_state, so a random empty cell is an O(1) draw.
+    All state changes must go through set_state to keep that list in step.
+
+    While journal is a list, CompanyMap and DiamondPositions append an undo record
+    to it for every change they make.
+
+    version is bumped on every change to a cell's state and on every merger, so
+    results derived from the board can be cached until it moves on. zobrist is the
+    XOR of the Zobrist keys of every cell's state, updated by set_state.
+
+    The arrays are stdlib bytearray / array('h') so the engine runs without NumPy.
+    When NumPy is installed, state_array(), company_id_array() and empty_mask() expose
+    them as zero-copy, read-only 2-D views for vectorized queries.
+    """
+
+    def __init__(self, grid_size):
+        self.rows, self.cols = grid_size
+        self.size = self.rows * self.cols
+        self.cells = bytearray(self.size)
+        self.company_ids = array('h', [NO_COMPANY]) * self.size
+        self.owner_ids = bytearray(self.size)
+        self.owner_names = [None]
+        self._owner_lookup = {None: 0}
+        self.o_marker_adjacent = bytearray(self.size)
+        self.neighbours = neighbour_table((self.rows, self.cols))
+        self._free_cells = list(range(self.size))             # Indices of EMPTY cells, unordered
+        self._free_position = array('i', range(self.size))    # Index -> position in _free_cells, -1 if occupied
+        self.journal = None
+        self.version = 0
+        self._zobrist_keys = cell_keys((self.rows, self.cols))
+        self.zobrist = 0
+
+    def copy(self):
+        """
+        Returns an independent copy of the board.
+
+        The cell arrays are duplicated with flat buffer copies. The neighbour table and
+        the 'O' marker adjacency array are shared: neither is ever modified in place
+        (set_o_markers installs a new adjacency array).
+        """
+        board = Board.__new__(Board)
+        board.rows, board.cols, board.size = self.rows, self.cols, self.size
+        board.cells = bytearray(self.cells)
+        board.company_ids = self.company_ids[:]
+        board.owner_ids = bytearray(self.owner_ids)
+        board.owner_names = self.owner_names.copy()
+        board._owner_lookup = self._owner_lookup.copy()
+        board.o_marker_adjacent = self.o_marker_adjacent
+        board.neighbours = self.neighbours
+        board._free_cells = self._free_cells.copy()
+        board._free_position = self._free_position[:]
+        board.journal = None
+        board.version = self.version
+        board._zobrist_keys = self._zobrist_keys
+        board.zobrist = self.zobrist
+        return board
+
+    def set_state(self, index, state):
+        """
+        Sets the state of the cell at index, keeping the empty-cell list up to date.
+        """
+        old_state = self.cells[index]
+        if old_state == state:
+            return
+        self.cells[index] = state
+        self.version += 1
+        keys = self._zobrist_keys
+        self.zobrist ^= keys[old_state][index] ^ keys[state][index]
+        if old_state == EMPTY:
+            # Swap-remove the cell from the empty-cell list
+            position = self._free_position[index]
+            last = self._free_cells.pop()
+            if last != index:
+                self._free_cells[position] = last
+                self._free_position[last] = position
+            self._free_position[index] = -1
+        elif state == EMPTY:
+            self._free_position[index] = len(self._free_cells)
+            self._free_cells.append(index)
+
+    def empty_count(self):
+        return len(self._free_cells)
+
+    def random_empty_index(self, rng=random):
+        """
+        Returns the index of a uniformly random empty cell, or None if the board is full.
+        """
+        if not self._free_cells:
+            return None
+        return rng.choice(self._free_cells)
+
+    def sample_empty_indices(self, count, rng=random):
+        """
+        Returns up to count distinct empty cell indices drawn uniformly at random.
+        """
+        if count >= len(self._free_cells):
+            return list(self._free_cells)
+        return rng.sample(self._free_cells, count)
+
+    def index_of(self, coords):
+        """
+        Returns the flat index of coords, or -1 if coords is not a cell of this board.
+        """
+        try:
+            r, c = coords
+        except (TypeError, ValueError):
+            return -1
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return r * self.cols + c
+        return -1
+
+    def checked_index(self, coords):
+        """
+        Returns the flat index of coords, raising ValueError if it is off the board.
+        """
+        index = self.index_of(coords)
+        if index < 0:
+            raise ValueError(f"Coordinate {coords} is outside the {self.rows}x{self.cols} grid.")
+        return index
+
+    def coords_of(self, index):
+        return divmod(index, self.cols)
+
+    def state_at(self, coords):
+        """
+        Returns the state of the cell at coords, or None if coords is off the board.
+        """
+        index = self.index_of(coords)
+        return self.cells[index] if index >= 0 else None
+
+    def owner_id(self, owner):
+        """
+        Returns the small integer id used for owner in owner_ids, registering it if new.
+        """
+        owner_id = self._owner_lookup.get(owner)
+        if owner_id is None:
+            owner_id = len(self.owner_names)
+            self.owner_names.append(owner)
+            self._owner_lookup[owner] = owner_id
+        return owner_id
+
+    def positions(self, state):
+        """
+        Yields the flat index of every cell in the given state.
+        """
+        cells = self.cells
+        index = cells.find(state)
+        while index >= 0:
+            yield index
+            index = cells.find(state, index + 1)
+
+    def clear_state(self, state):
+        """
+        Resets every cell in the given state to EMPTY.
+        """
+        for index in list(self.positions(state)):
+            self.set_state(index, EMPTY)
+            self.company_ids[index] = NO_COMPANY
+            self.owner_ids[index] = 0
+
+    def set_o_markers(self, locations):
+        """
+        Replaces the 'O' marker layout and rebuilds the marker adjacency flags.
+        """
+        indices = [self.checked_index(coords) for coords in locations]
+        self.clear_state(O_MARKER)
+        for index in indices:
+            if self.cells[index] != EMPTY:
+                raise ValueError(f"Cannot place an 'O' marker on occupied cell {self.coords_of(index)}.")
+            self.set_state(index, O_MARKER)
+
+        adjacent = bytearray(self.size)
+        for index in indices:
+            for neighbour in self.neighbours[index]:
+                adjacent[neighbour] = 1
+        self.o_marker_adjacent = adjacent
+
+    # --- NumPy views (optional) ---
+
+    def _require_numpy(self):
+        if np is None:
+            raise ImportError("NumPy is required for array views of the board.")
+
+    def state_array(self):
+        """
+        Returns a read-only (rows, cols) int8 NumPy view of the cell states.
+        """
+        self._require_numpy()
+        view = np.frombuffer(self.cells, dtype=np.int8).reshape(self.rows, self.cols)
+        view.flags.writeable = False
+        return view
+
+    def company_id_array(self, root_ids=None):
+        """
+        Returns a (rows, cols) int16 NumPy array of company node ids.
+
+        Without root_ids this is a read-only zero-copy view of the raw node ids. With
+        root_ids (a node -> root node sequence, see CompanyMap.root_ids) it is a new
+        array where every tile carries the id of the company it currently belongs to.
+        """
+        self._require_numpy()
+        view = np.frombuffer(self.company_ids, dtype=np.int16).reshape(self.rows, self.cols)
+        view.flags.writeable = False
+        if root_ids is None:
+            return view
+        resolved = np.full(view.shape, NO_COMPANY, dtype=np.int16)
+        has_tile = view != NO_COMPANY
+        resolved[has_tile] = np.asarray(root_ids, dtype=np.int16)[view[has_tile]]
+        return resolved
+
+    def empty_mask(self):
+        """
+        Returns a (rows, cols) boolean NumPy array that is True on empty cells.
+        """
+        return self.state_array() == EMPTY
+
+    def tile_counts(self, root_ids):
+        """
+        Returns a NumPy array with the number of tiles per company root node id.
+        """
+        resolved = self.company_id_array(root_ids)
+        return np.bincount(resolved[resolved != NO_COMPANY], minlength=len(root_ids))
+
+
+class DisjointSet:
+    """
+    Union-find forest over integer node ids, with union by rank.
+    GameState uses one node per company founding; a merger is a single union.
+
+    There is deliberately no path compression: finds never rewrite the forest, so the
+    last union can be rolled back exactly (see split). The forest only holds one node
+    per founding, and union by rank alone keeps every find within log2(nodes) steps.
+    """
+
+    def __init__(self):
+        self._parent = []
+        self._rank = []
+
+    def __len__(self):
+        return len(self._parent)
+
+    def make_set(self):
+        """
+        Adds a new singleton set and returns its node id.
+        """
+        node = len(self._parent)
+        self._parent.append(node)
+        self._rank.append(0)
+        return node
+
+    def find(self, node):
+        """
+        Returns the root node of the set containing node.
+        """
+        parent = self._parent
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    def union(self, node_a, node_b):
+        """
+        Joins the sets containing node_a and node_b.
+
+        Returns:
+            tuple: (root, absorbed_root). absorbed_root is None if both were already in the same set.
+        """
+        root_a = self.find(node_a)
+        root_b = self.find(node_b)
+        if root_a == root_b:
+            return root_a, None
+        if self._rank[root_a] < self._rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if self._rank[root_a] == self._rank[root_b]:
+            self._rank[root_a] += 1
+        return root_a, root_b
+
+    def rank_of(self, node):
+        return self._rank[node]
+
+    def split(self, root, child, root_rank):
+        """
+        Undoes union() that attached child under root, restoring root's previous rank.
+        Only valid while that union is the most recent change still in effect.
+        """
+        self._parent[child] = child
+        self._rank[root] = root_rank
+
+    def pop_set(self):
+        """
+        Removes the most recently made set, which must still be a singleton.
+        """
+        self._parent.pop()
+        self._rank.pop()
+
+    def copy(self):
+        duplicate = DisjointSet()
+        duplicate._parent = self._parent.copy()
+        duplicate._rank = self._rank.copy()
+        return duplicate
+
+    def root_ids(self):
+        """
+        Returns a list mapping every node id to its root node id.
+        """
+        return [self.find(node) for node in range(len(self._parent))]
+
+
+class TileInfo(Mapping):
+    """
+    Read-only view of one company tile with "company_name", "owner" and "value" keys.
+    The company name and value are resolved through the company forest on access,
+    so tiles of an acquired company report the acquirer without being rewritten.
+    """
+    __slots__ = ('_company_map', '_index')
+    _KEYS = ("company_name", "owner", "value")
+
+    def __init__(self, company_map, index):
+        self._company_map = company_map
+        self._index = index
+
+    def __getitem__(self, key):
+        board = self._company_map.board
+        if key == "company_name":
+            return self._company_map.company_of_node(board.company_ids[self._index])
+        if key == "owner":
+            return board.owner_names[board.owner_ids[self._index]]
+        if key == "value":
+            return self._company_map.value_of_node(board.company_ids[self._index])
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class TileUpdates:
+    """
+    The (coords, company_name) updates produced by a merger.
+
+    Tiles of the acquired companies are not listed when the merger happens; they are
+    enumerated, and their company resolved, only when the updates are iterated
+    (normally by the UI callback).
+    """
+
+    def __init__(self, company_map, entries=None, absorbed_nodes=None):
+        self._company_map = company_map
+        self.entries = list(entries) if entries else []
+        self.absorbed_nodes = list(absorbed_nodes) if absorbed_nodes else []
+
+    def append(self, entry):
+        self.entries.append(entry)
+
+    def __iter__(self):
+        yield from self.entries
+        company_map = self._company_map
+        coords_of = company_map.board.coords_of
+        for node in self.absorbed_nodes:
+            company_name = company_map.company_of_node(node)
+            for index in company_map._node_tiles[node]:
+                yield (coords_of(index), company_name)
+
+    def __len__(self):
+        node_tiles = self._company_map._node_tiles
+        return len(self.entries) + sum(len(node_tiles[node]) for node in self.absorbed_nodes)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __repr__(self):
+        return f"TileUpdates({list(self)!r})"
+
+
+class CompanyMap(MutableMapping):
+    """
+    Maps coordinates to company tile info, like the plain dict it replaces, as a view
+    over the COMPANY cells of a Board.
+
+    Every founding of a company gets a node in a DisjointSet, and Board.company_ids
+    records the node each tile joined under. A tile's company is the name attached to
+    that node's root, so a merger is one union instead of a relabel of every acquired
+    tile. Per-node sets of cell indices form the company -> tiles index, and the roots
+    carry each company's tile count, share value and number of tiles touching an 'O'
+    marker, so none of those need a walk over the tiles.
+
+    Reading an entry returns a TileInfo view. Assigning a dict with "company_name" and
+    "owner" keys adds or moves a tile; its "value" only seeds a company that has none.
+
+    Roots also carry the sum of their tiles' zobrist.tile_keys, and zobrist is the XOR
+    of company_key(name, sum) over every company with tiles: which cells belong together
+    and under what name, kept up to date in O(1) per tile and per merger.
+    """
+
+    def __init__(self, board, entries=None):
+        self.board = board
+        self._sets = DisjointSet()
+        self._node_tiles = []     # node -> set of cell indices that joined under that node
+        self._node_name = []      # root -> company name
+        self._node_value = []     # root -> company share value
+        self._node_size = []      # root -> number of tiles in the whole set
+        self._node_o_count = []   # root -> number of tiles in the set touching an 'O' marker
+        self._node_members = []   # root -> list of nodes in the set
+        self._company_nodes = {}  # company name -> root node
+        self._tiles_owned = []    # node -> False while its tile set is shared with a copy
+        self._node_sum = []       # root -> sum of the set's tile keys (mod 2**64)
+        self._tile_keys = tile_keys((board.rows, board.cols))
+        self._tile_count = 0
+        self.zobrist = 0
+        if entries:
+            self.update(entries)
+
+    def _tile_index(self, coords):
+        index = self.board.index_of(coords)
+        if index < 0 or self.board.cells[index] != COMPANY:
+            raise KeyError(coords)
+        return index
+
+    def __getitem__(self, coords):
+        return TileInfo(self, self._tile_index(coords))
+
+    def __setitem__(self, coords, info):
+        self.add_tile(coords, info["company_name"], info["owner"], info.get("value"))
+
+    def __delitem__(self, coords):
+        self._remove_index(self._tile_index(coords))
+
+    def __iter__(self):
+        coords_of = self.board.coords_of
+        for tiles in self._node_tiles:
+            for index in list(tiles):
+                yield coords_of(index)
+
+    def __len__(self):
+        return self._tile_count
+
+    def __contains__(self, coords):
+        index = self.board.index_of(coords)
+        return index >= 0 and self.board.cells[index] == COMPANY
+
+    def __repr__(self):
+        return f"CompanyMap({ {coords: dict(info) for coords, info in self.items()}!r})"
+
+    def _node_for(self, company_name):
+        node = self._company_nodes.get(company_name)
+        if node is None:
+            node = self._sets.make_set()
+            self._node_tiles.append(set())
+            self._node_name.append(company_name)
+            self._node_value.append(None)
+            self._node_size.append(0)
+            self._node_o_count.append(0)
+            self._node_members.append([node])
+            self._tiles_owned.append(True)
+            self._node_sum.append(0)
+            self._company_nodes[company_name] = node
+            if self.board.journal is not None:
+                self.board.journal.append((NODE_ADDED, node, company_name))
+        return node
+
+    def _pop_node(self, node, company_name):
+        # Inverse of _node_for for the most recently created node
+        self._sets.pop_set()
+        for column in (self._node_tiles, self._node_name, self._node_value, self._node_size,
+                       self._node_o_count, self._node_members, self._tiles_owned, self._node_sum):
+            column.pop()
+        if self._company_nodes.get(company_name) == node:
+            del self._company_nodes[company_name]
+
+    def _writable_tiles(self, node):
+        # Copy-on-write: a tile set shared with a copy is duplicated before its first change
+        if not self._tiles_owned[node]:
+            self._node_tiles[node] = set(self._node_tiles[node])
+            self._tiles_owned[node] = True
+        return self._node_tiles[node]
+
+    def copy(self, board):
+        """
+        Returns a copy of this map over board, which must be a copy of self.board.
+
+        The per-node tile sets are shared copy-on-write between the two maps, so the
+        copy costs one list copy per node attribute rather than a walk over the tiles.
+        """
+        duplicate = CompanyMap(board)
+        duplicate._sets = self._sets.copy()
+        duplicate._node_tiles = self._node_tiles.copy()
+        duplicate._node_name = self._node_name.copy()
+        duplicate._node_value = self._node_value.copy()
+        duplicate._node_size = self._node_size.copy()
+        duplicate._node_o_count = self._node_o_count.copy()
+        duplicate._node_members = self._node_members.copy()  # Member lists are replaced, never extended
+        duplicate._company_nodes = self._company_nodes.copy()
+        duplicate._node_sum = self._node_sum.copy()
+        duplicate._tile_count = self._tile_count
+        duplicate.zobrist = self.zobrist
+        self._tiles_owned = [False] * len(self._node_tiles)
+        duplicate._tiles_owned = self._tiles_owned.copy()
+        return duplicate
+
+    def _attach(self, index, node, owner_id):
+        # Puts a company tile on a non-company cell under node
+        board = self.board
+        board.set_state(index, COMPANY)
+        board.company_ids[index] = node
+        board.owner_ids[index] = owner_id
+        self._writable_tiles(node).add(index)
+        root = self._sets.find(node)
+        self._node_size[root] += 1
+        self._node_o_count[root] += board.o_marker_adjacent[index]
+        self._add_to_sum(root, self._tile_keys[index])
+        self._tile_count += 1
+
+    def _detach(self, index, state):
+        # Takes the company tile off a cell, leaving the cell in state
+        board = self.board
+        node = board.company_ids[index]
+        board.set_state(index, state)
+        board.company_ids[index] = NO_COMPANY
+        board.owner_ids[index] = 0
+        self._writable_tiles(node).discard(index)
+        root = self._sets.find(node)
+        self._node_size[root] -= 1
+        self._node_o_count[root] -= board.o_marker_adjacent[index]
+        self._add_to_sum(root, -self._tile_keys[index])
+        self._tile_count -= 1
+
+    def _zobrist_term(self, root):
+        # A company without tiles does not contribute, so it hashes like no company at all
+        tile_sum = self._node_sum[root]
+        return company_key(self._node_name[root], tile_sum) if tile_sum else 0
+
+    def _add_to_sum(self, root, key):
+        term = self._zobrist_term(root)
+        self._node_sum[root] = (self._node_sum[root] + key) & MASK64
+        self.zobrist ^= term ^ self._zobrist_term(root)
+
+    def _remove_index(self, index):
+        board = self.board
+        if board.journal is not None:
+            board.journal.append((TILE_REMOVED, index, board.company_ids[index], board.owner_ids[index]))
+        self._detach(index, EMPTY)
+
+    def company_of_node(self, node):
+        return self._node_name[self._sets.find(node)]
+
+    def value_of_node(self, node):
+        return self._node_value[self._sets.find(node)]
+
+    def add_tile(self, coords, company_name, owner, value=None):
+        """
+        Assigns coords to company_name, moving it out of any company it belonged to.
+        A diamond on the cell is replaced; an 'O' marker cell raises ValueError.
+        """
+        board = self.board
+        index = board.checked_index(coords)
+        state = board.cells[index]
+        if state == O_MARKER:
+            raise ValueError(f"Cannot place a company tile on 'O' marker cell {coords}.")
+        if state == COMPANY:
+            self._remove_index(index)
+            state = EMPTY
+        node = self._node_for(company_name)
+        owner_id = board.owner_id(owner)
+        if board.journal is not None:
+            board.journal.append((TILE_ADDED, index, node, owner_id, state))
+        self._attach(index, node, owner_id)
+        if self._node_value[node] is None and value is not None:
+            self._set_root_value(node, value)
+
+    def company_at(self, coords):
+        """
+        Returns the company name of the tile at coords, or None if there is no tile.
+        """
+        index = self.board.index_of(coords)
+        if index < 0 or self.board.cells[index] != COMPANY:
+            return None
+        return self.company_of_node(self.board.company_ids[index])
+
+    def company_at_index(self, index):
+        """
+        Returns the company name of the tile at a board index known to hold a company tile.
+        """
+        return self._node_name[self._sets.find(self.board.company_ids[index])]
+
+    def tiles_of(self, company_name):
+        """
+        Returns a new set with the coordinates owned by company_name (empty if none).
+        """
+        root = self._company_nodes.get(company_name)
+        if root is None:
+            return set()
+        coords_of = self.board.coords_of
+        node_tiles = self._node_tiles
+        return {coords_of(index) for node in self._node_members[root] for index in node_tiles[node]}
+
+    def size_of(self, company_name):
+        """
+        Returns the number of tiles owned by company_name.
+        """
+        root = self._company_nodes.get(company_name)
+        return self._node_size[root] if root is not None else 0
+
+    def o_marker_tiles_of(self, company_name):
+        """
+        Returns how many tiles of company_name are orthogonally adjacent to an 'O' marker.
+        """
+        root = self._company_nodes.get(company_name)
+        return self._node_o_count[root] if root is not None else 0
+
+    def recount_o_marker_adjacency(self):
+        """
+        Recounts every company's tiles touching an 'O' marker from Board.o_marker_adjacent.
+        Only needed when the marker layout changes, i.e. once per game.
+        """
+        node_o_count = self._node_o_count
+        for node in range(len(node_o_count)):
+            node_o_count[node] = 0
+        adjacent = self.board.o_marker_adjacent
+        find = self._sets.find
+        for node, tiles in enumerate(self._node_tiles):
+            if tiles:
+                node_o_count[find(node)] += sum(adjacent[index] for index in tiles)
+
+    def root_ids(self):
+        """
+        Returns a node id -> root node id list, for resolving Board.company_ids in bulk.
+        """
+        return self._sets.root_ids()
+
+    def company_of_root(self, root):
+        return self._node_name[root]
+
+    def _set_root_value(self, root, value):
+        if self.board.journal is not None:
+            self.board.journal.append((VALUE_CHANGED, root, self._node_value[root], value))
+        self._node_value[root] = value
+
+    def set_company_value(self, company_name, value):
+        """
+        Sets the share value reported by every tile of company_name.
+        """
+        root = self._company_nodes.get(company_name)
+        if root is not None:
+            self._set_root_value(root, value)
+
+    def absorb_company(self, acquired_name, acquirer_name):
+        """
+        Merges acquired_name into acquirer_name with a single union.
+
+        Returns:
+            list: The nodes whose tiles now belong to acquirer_name, for lazy enumeration.
+        """
+        acquired_root = self._company_nodes.pop(acquired_name, None)
+        if acquired_root is None:
+            return []
+        acquirer_root = self._node_for(acquirer_name)
+        absorbed_nodes = self._node_members[acquired_root]
+        value = self._node_value[acquirer_root]
+
+        ranks = {acquirer_root: self._sets.rank_of(acquirer_root), acquired_root: self._sets.rank_of(acquired_root)}
+        self.zobrist ^= self._zobrist_term(acquirer_root) ^ self._zobrist_term(acquired_root)
+        root, child = self._sets.union(acquirer_root, acquired_root)
+        if self.board.journal is not None:
+            # Only the surviving root's bookkeeping is overwritten; keep it for revert()
+            root_before = (self._node_size[root], self._node_o_count[root], self._node_members[root],
+                           self._node_name[root], self._node_value[root], ranks[root], self._node_sum[root])
+            self.board.journal.append((COMPANY_MERGED, acquired_name, acquirer_name,
+                                       acquired_root, acquirer_root, root, child, root_before))
+        self._node_size[root] = self._node_size[acquirer_root] + self._node_size[acquired_root]
+        self._node_o_count[root] = self._node_o_count[acquirer_root] + self._node_o_count[acquired_root]
+        self._node_members[root] = self._node_members[acquirer_root] + absorbed_nodes
+        self._node_sum[root] = (self._node_sum[acquirer_root] + self._node_sum[acquired_root]) & MASK64
+        self._node_name[root] = acquirer_name
+        self._node_value[root] = value
+        self.zobrist ^= self._zobrist_term(root)
+        self._company_nodes[acquirer_name] = root
+        self.board.version += 1  # The acquired tiles changed company without changing state
+        return list(absorbed_nodes)
+
+    # --- Undo / redo of journal records ---
+
+    def revert(self, record):
+        """
+        Undoes one record from Board.journal. Records must be reverted newest first.
+
+        Returns:
+            iterable: Indices of the cells whose contents changed.
+        """
+        kind = record[0]
+        if kind == CELL_CHANGED:
+            _, index, old_state, _ = record
+            self.board.set_state(index, old_state)
+            return (index,)
+        if kind == TILE_ADDED:
+            _, index, _, _, old_state = record
+            self._detach(index, old_state)
+            return (index,)
+        if kind == TILE_REMOVED:
+            _, index, node, owner_id = record
+            self._attach(index, node, owner_id)
+            return (index,)
+        if kind == NODE_ADDED:
+            _, node, company_name = record
+            self._pop_node(node, company_name)
+            return ()
+        if kind == COMPANY_MERGED:
+            _, acquired_name, acquirer_name, acquired_root, acquirer_root, root, child, root_before = record
+            self.zobrist ^= self._zobrist_term(root)
+            (self._node_size[root], self._node_o_count[root], self._node_members[root],
+             self._node_name[root], self._node_value[root], root_rank, self._node_sum[root]) = root_before
+            self._sets.split(root, child, root_rank)
+            self.zobrist ^= self._zobrist_term(acquirer_root) ^ self._zobrist_term(acquired_root)
+            self._company_nodes[acquirer_name] = acquirer_root
+            self._company_nodes[acquired_name] = acquired_root
+            self.board.version += 1
+            node_tiles = self._node_tiles
+            return [index for node in self._node_members[acquired_root] for index in node_tiles[node]]
+        if kind == VALUE_CHANGED:
+            _, root, old_value, _ = record
+            self._node_value[root] = old_value
+            return ()
+        raise ValueError(f"Unknown journal record {record!r}")
+
+    def reapply(self, record):
+        """
+        Redoes one record that revert() undid. Records must be reapplied oldest first.
+
+        Returns:
+            iterable: Indices of the cells whose contents changed.
+        """
+        kind = record[0]
+        if kind == CELL_CHANGED:
+            _, index, _, new_state = record
+            self.board.set_state(index, new_state)
+            return (index,)
+        if kind == TILE_ADDED:
+            _, index, node, owner_id, _ = record
+            self._attach(index, node, owner_id)
+            return (index,)
+        if kind == TILE_REMOVED:
+            _, index, _, _ = record
+            self._detach(index, EMPTY)
+            return (index,)
+        if kind == NODE_ADDED:
+            _, node, company_name = record
+            self._node_for(company_name)
+            return ()
+        if kind == COMPANY_MERGED:
+            _, acquired_name, acquirer_name = record[:3]
+            node_tiles = self._node_tiles
+            return [index for node in self.absorb_company(acquired_name, acquirer_name) for index in node_tiles[node]]
+        if kind == VALUE_CHANGED:
+            _, root, _, new_value = record
+            self._node_value[root] = new_value
+            return ()
+        raise ValueError(f"Unknown journal record {record!r}")
+
+
+class _CellStateSet(AbstractSet):
+    """
+    Set-like view of the coordinates of every board cell in one state.
+    """
+    _state = None
+
+    def __init__(self, board):
+        self.board = board
+
+    def __contains__(self, coords):
+        index = self.board.index_of(coords)
+        return index >= 0 and self.board.cells[index] == self._state
+
+    def __iter__(self):
+        coords_of = self.board.coords_of
+        for index in list(self.board.positions(self._state)):
+            yield coords_of(index)
+
+    def __len__(self):
+        return self.board.cells.count(self._state)
+
+    def __repr__(self):
+        return repr(set(self))
+
+
+class DiamondPositions(_CellStateSet, MutableSet):
+    """
+    Mutable set of diamond coordinates, backed by the DIAMOND cells of a Board.
+    Diamonds can only be added to empty cells; a diamond absorbed by a company
+    simply stops being a member.
+    """
+    _state = DIAMOND
+
+    def add(self, coords):
+        board = self.board
+        index = board.checked_index(coords)
+        state = board.cells[index]
+        if state == DIAMOND:
+            return
+        if state != EMPTY:
+            raise ValueError(f"Cannot place a diamond on occupied cell {coords}.")
+        self._set_cell(index, DIAMOND)
+
+    def discard(self, coords):
+        index = self.board.index_of(coords)
+        if index >= 0 and self.board.cells[index] == DIAMOND:
+            self._set_cell(index, EMPTY)
+
+    def _set_cell(self, index, state):
+        board = self.board
+        if board.journal is not None:
+            board.journal.append((CELL_CHANGED, index, board.cells[index], state))
+        board.set_state(index, state)
+
+    def update(self, coords_iterable):
+        for coords in coords_iterable:
+            self.add(coords)
+
+    def difference_update(self, coords_iterable):
+        for coords in coords_iterable:
+            self.discard(coords)
+
+
+class OMarkerLocations(_CellStateSet):
+    """
+    Read-only set of 'O' marker coordinates, backed by the O_MARKER cells of a Board.
+    Replace the layout by assigning GameState.initial_o_marker_locations.
+    """
+    _state = O_MARKER
@@ -0,0 +1,76 @@
+# event_log.py
+
+import sys
+
+# Levels, lowest to highest. Records below EventLog.level are dropped before any formatting.
+DEBUG = 10    # Per-tile and per-lookup detail
+INFO = 20     # One record per game action (company created, shares bought, turn ended, ...)
+WARNING = 30  # Rejected actions and unusual rule paths
+ERROR = 40    # Inconsistent state the engine had to repair
+OFF = 100     # Disables the channel entirely
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+class LogRecord:
+    """
+    One structured engine event: a level, a stable event name and the raw fields.
+    The human-readable message is only built when something asks for it.
+    """
+    __slots__ = ('level', 'event', 'template', 'fields')
+
+    def __init__(self, level, event, template, fields):
+        self.level = level
+        self.event = event
+        self.template = template
+        self.fields = fields
+
+    @property
+    def message(self):
+        return self.template.format(**self.fields)
+
+    def __repr__(self):
+        return f"LogRecord({LEVEL_NAMES.get(self.level, self.level)}, {self.event!r}, {self.fields!r})"
+
+
+class EventLog:
+    """
+    Levelled event channel used by GameState in place of print().
+
+    Each call names an event and passes a str.format template plus keyword fields.
+    When the level is disabled the call returns after a single integer comparison:
+    no record is created and no string is formatted. Enabled records are handed to
+    the sink, a callable taking a LogRecord (print to stdout by default; pass e.g.
+    a list's append method to collect records).
+
+    Usage:
+        log = EventLog(level=DEBUG)
+        log.debug("tile_assigned", "Assigned '{company}' to {coords}.", company=name, coords=coords)
+    """
+
+    def __init__(self, level=WARNING, sink=None, stream=None):
+        self.level = level
+        self.stream = stream
+        self.sink = sink if sink is not None else self.print_record
+
+    def enabled_for(self, level):
+        return level >= self.level
+
+    def print_record(self, record):
+        print(record.message, file=self.stream if self.stream is not None else sys.stdout)
+
+    def debug(self, event, template, **fields):
+        if self.level <= DEBUG:
+            self.sink(LogRecord(DEBUG, event, template, fields))
+
+    def info(self, event, template, **fields):
+        if self.level <= INFO:
+            self.sink(LogRecord(INFO, event, template, fields))
+
+    def warning(self, event, template, **fields):
+        if self.level <= WARNING:
+            self.sink(LogRecord(WARNING, event, template, fields))
+
+    def error(self, event, template, **fields):
+        if self.level <= ERROR:
+            self.sink(LogRecord(ERROR, event, template, fields))
@@ -1,8 +1,99 @@
 # game_logic.py
 
 import os
-import random # Added random import
+import random
 from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import numpy as np
+except ImportError:  # legal_moves() falls back to a per-cell pass
+    np = None
+
+from board import (
+    COMPANY, DIAMOND, EMPTY, NO_COMPANY, Board, CompanyMap, DiamondPositions, OMarkerLocations, TileUpdates,
+)
+from event_log import DEBUG, OFF, EventLog
+from holdings import HoldingsMatrix, SharesByPlayer
+from price_history import PriceHistory
+from journal import MISSING, Journal, JournalEntry, diff_ledgers
+from zobrist import turn_key
+
+# company_name values in callback entries for cells without a company tile.
+# Only undo() and redo() send these; normal play reports company tiles only.
+EMPTY_TILE = None
+DIAMOND_TILE = "<diamond>"
+
+# What a move on an empty cell does, see GameState.legal_moves()
+MOVE_DIAMOND = "diamond"  # Places a diamond (no occupied neighbour, or no company names left)
+MOVE_FOUND = "found"      # Founds a new company
+MOVE_EXPAND = "expand"    # Expands the one adjacent company
+MOVE_MERGE = "merge"      # Merges the adjacent companies
+
+# Every company name, in the order new companies take them
+COMPANY_NAMES = ("Nerdniss", "Beetleguice", "StronCannon", "DebbiesKnees", "Pacifica")
+
+
+class LegalMove:
+    """
+    The classified outcome of playing one empty cell.
+
+    - coords: the (row, col) of the cell.
+    - kind: MOVE_DIAMOND, MOVE_FOUND, MOVE_EXPAND or MOVE_MERGE.
+    - companies: sorted tuple of the adjacent company names (one for an expansion,
+      two or more for a merger, none otherwise).
+    """
+    __slots__ = ('coords', 'kind', 'companies')
+
+    def __init__(self, coords, kind, companies=()):
+        self.coords = coords
+        self.kind = kind
+        self.companies = companies
+
+    def __eq__(self, other):
+        if not isinstance(other, LegalMove):
+            return NotImplemented
+        return (self.coords, self.kind, self.companies) == (other.coords, other.kind, other.companies)
+
+    def __repr__(self):
+        return f"LegalMove({self.coords!r}, {self.kind!r}, {self.companies!r})"
+
+
+def random_o_marker_locations(grid_size, marker_percentage, rng=random):
+    """
+    Picks the 'O' marker cells for a new game.
+
+    Parameters:
+        grid_size (tuple): (rows, cols) of the board.
+        marker_percentage (float): Fraction of the cells that get a marker (e.g. 0.1).
+        rng: Source of randomness with a shuffle() method (the random module by default).
+
+    Returns:
+        set: int(rows * cols * marker_percentage) distinct (row, col) coordinates.
+    """
+    rows, cols = grid_size
+    all_coordinates = [(r, c) for r in range(rows) for c in range(cols)]
+    rng.shuffle(all_coordinates)
+    return set(all_coordinates[:int(rows * cols * marker_percentage)])
+
+
+def _journaled(method):
+    """
+    Makes a GameState method one undo step, or part of the enclosing one when it is
+    called from another journaled method or inside batch_updates().
+    """
+    @wraps(method)
+    def journaled(self, *args, **kwargs):
+        if self.journal is None:
+            return method(self, *args, **kwargs)
+        self._begin_action(method.__name__)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._end_action()
+    return journaled
+
 
 class GameState:
     def __init__(self, player_configurations, grid_size, script_dir): # Changed players to player_configurations
@@ -23,16 +114,24 @@ class GameState:
             for p in player_configurations
         }
 
+        # Structured, lazily formatted event log (warnings and errors only by default)
+        self.log = EventLog()
+        # Bounded undo / redo history; None disables journaling (e.g. for lookahead clones)
+        self.journal = Journal()
+        # Randomness used by the AI (the random module unless a seeded random.Random is set)
+        self.rng = random
+        # Optional game_record.GameRecorder that every move, trade and end of turn is written to
+        self.recorder = None
+
         self.grid_size = grid_size  # (rows, cols)
         self.current_player_index = 0
         self.company_count = 0
         self.active_companies = 0
         self.turn_counter = 0
+        self.merger_count = 0  # Companies acquired in mergers so far
 
         # Managing available company names
-        self.all_company_names = [
-            "Nerdniss", "Beetleguice", "StronCannon", "DebbiesKnees", "Pacifica"
-        ]
+        self.all_company_names = list(COMPANY_NAMES)
         self.available_company_names = self.all_company_names.copy()
 
         # Company logos with absolute paths
@@ -46,24 +145,95 @@ class GameState:
         }
         self.diamond_image_path = os.path.join(script_dir, 'assets', 'images', 'diamond.png')
 
+        # Array-backed grid. company_map, diamond_positions and initial_o_marker_locations
+        # below are views over it.
+        self.board = Board(grid_size)
+
         # Game data
-        self.company_map = {}  # Maps coordinates to company info
+        self.company_map = {}  # Maps coordinates to company info (a CompanyMap view of the board)
         self.company_info = {}  # Maps company names to their details
+        # Each company's recent share prices with turn stamps, in fixed-size ring buffers
+        self.price_history = PriceHistory()
         # Initialize player_wealth, player_shares, and player_has_moved using display names from self.players
         self.player_wealth = {name: 6000 for name in self.players}
-        self.player_shares = {name: {} for name in self.players}
-        self.diamond_positions = set()  # Set of coordinates with diamonds
+        # Share counts as a players x companies matrix (seat and company ids); player_shares
+        # is the {player: {company_name: shares}} view over it
+        self.holdings = HoldingsMatrix(self.players, self.all_company_names)
+        self.player_shares = SharesByPlayer(self.holdings)
+        # Net-worth ledger: the current value of each player's shares, kept up to date by every
+        # trade, price change, share split and merger so net_worth() needs no recomputation
+        self.holdings_value = {name: 0 for name in self.players}
+        self.diamond_positions = set()  # Set of coordinates with diamonds (a view of the board)
 
         # Track if players have made a move during their turn
         self.player_has_moved = {name: False for name in self.players}  # New flag
 
         # Callbacks for UI updates
         self.callbacks = []
+        # Open batch_updates() contexts and the updates they have held back
+        self._batch_depth = 0
+        self._pending_updates = []
+        # Open journaled actions and the undo data gathered for the outermost one
+        self._action_depth = 0
+        self._action_label = None
+        self._action_turn = 0
+        self._action_ledger = None
+        # legal_moves() result and the (board version, names left) it was computed for
+        self._legal_moves = None
+        self._legal_moves_key = None
         self.initial_o_marker_locations = set()
 
+    @property
+    def company_map(self):
+        return self._company_map
+
+    @company_map.setter
+    def company_map(self, entries):
+        # Accept plain dicts (e.g. from tests or saved state): the board's company tiles
+        # are replaced by the given entries.
+        if entries is getattr(self, '_company_map', None):
+            return
+        entries = {coords: dict(info) for coords, info in entries.items()}
+        self.board.clear_state(COMPANY)
+        self._company_map = CompanyMap(self.board, entries)
+        self._clear_journal()
+
+    @property
+    def diamond_positions(self):
+        return self._diamond_positions
+
+    @diamond_positions.setter
+    def diamond_positions(self, positions):
+        # In-place set operators (e.g. `diamond_positions -= absorbed`) hand back the view itself
+        if positions is getattr(self, '_diamond_positions', None):
+            return
+        positions = list(positions)
+        self.board.clear_state(DIAMOND)
+        self._diamond_positions = DiamondPositions(self.board)
+        self._diamond_positions.update(positions)
+        self._clear_journal()
+
+    @property
+    def initial_o_marker_locations(self):
+        return self._initial_o_marker_locations
+
+    @initial_o_marker_locations.setter
+    def initial_o_marker_locations(self, locations):
+        # The marker layout is fixed for a game, so the board precomputes which cells touch
+        # a marker and every company keeps a running count of its tiles that do.
+        self.board.set_o_markers(locations)
+        self._initial_o_marker_locations = OMarkerLocations(self.board)
+        self.company_map.recount_o_marker_adjacency()
+        self._clear_journal()
+
+    def _clear_journal(self):
+        # Wholesale replacements of board contents are not journaled, so older entries no longer apply
+        if self.journal is not None:
+            self.journal.clear()
+
     def set_initial_o_marker_locations(self, locations_set):
         self.initial_o_marker_locations = locations_set
-        print(f"Initial O marker locations set: {self.initial_o_marker_locations}") # Optional: for debugging
+        self.log.debug("o_markers_set", "Initial O marker locations set: {locations}", locations=self.initial_o_marker_locations)
 
     def register_callback(self, callback):
         """
@@ -71,17 +241,273 @@ class GameState:
         The callback should accept a list of tuples: (coords, company_name)
         """
         self.callbacks.append(callback)
-        print("Registered a new callback for game state updates.")
+        self.log.debug("callback_registered", "Registered a new callback for game state updates.")
 
     def notify_callbacks(self, updated_entries):
         """
         Notifies all registered callbacks with the list of updated entries.
         Each entry is a tuple: (coords, company_name)
+
+        Inside batch_updates() the entries are held back and delivered, deduplicated,
+        when the outermost batch closes.
         """
+        if self._batch_depth:
+            self._pending_updates.append(updated_entries)
+            return
+        self._deliver_updates(updated_entries)
+
+    def _deliver_updates(self, updated_entries):
         for callback in self.callbacks:
             callback(updated_entries)
-        print(f"Notified {len(self.callbacks)} callbacks with {len(updated_entries)} updates.")
+        if self.log.enabled_for(DEBUG):  # len() of merge updates walks the absorbed tiles
+            self.log.debug("callbacks_notified", "Notified {callbacks} callbacks with {updates} updates.",
+                           callbacks=len(self.callbacks), updates=len(updated_entries))
+
+    @contextmanager
+    def batch_updates(self):
+        """
+        Coalesces every notify_callbacks call made inside the block into a single diff.
+
+        A move can notify several times (create, expand, merge, diamond absorption). In a
+        batch, callbacks instead receive one list of (coords, company_name) entries when
+        the outermost batch exits, with one entry per cell and the last write winning.
+        Batches nest; only the outermost one delivers. The outermost batch is also a
+        single undo step.
+
+        Usage:
+            with game_state.batch_updates():
+                game_state.expand_company(coords, company_name, player)
+        """
+        self._batch_depth += 1
+        self._begin_action("move")
+        try:
+            yield self
+        finally:
+            self._end_action()
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_updates:
+                pending, self._pending_updates = self._pending_updates, []
+                merged = {}
+                for updated_entries in pending:
+                    for coords, company_name in updated_entries:
+                        merged.pop(coords, None)  # Re-insert so the diff follows the order of last writes
+                        merged[coords] = company_name
+                self._deliver_updates(list(merged.items()))
+
+    def clone(self, rng=None):
+        """
+        Returns an independent copy of the game for trying out moves (lookahead, previews).
+
+        The board arrays are copied as flat buffers and company tile sets are shared
+        copy-on-write, so a clone costs microseconds and changes to either game never
+        show up in the other. Per-game dictionaries are copied one level deep; immutable
+        configuration (players, logos, paths) is shared.
+
+        The clone has no callbacks and its event log is switched off, so hypothetical
+        moves neither redraw the UI nor print.
+
+        Parameters:
+            rng: Random generator for the clone. By default the clone gets its own
+                random.Random starting from this game's generator state, so draws made on
+                the clone (e.g. by an AI search in a worker thread) never advance this
+                game's generator.
+
+        Returns:
+            GameState: The copy.
+        """
+        clone = GameState.__new__(GameState)
+        clone.players = self.players
+        clone.player_types = self.player_types
+        clone.player_profile_details = self.player_profile_details
+        clone.log = EventLog(level=OFF)
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        clone.rng = rng
+        clone.grid_size = self.grid_size
+        clone.current_player_index = self.current_player_index
+        clone.company_count = self.company_count
+        clone.active_companies = self.active_companies
+        clone.turn_counter = self.turn_counter
+        clone.merger_count = self.merger_count
+        clone.all_company_names = self.all_company_names
+        clone.available_company_names = self.available_company_names.copy()
+        clone.script_dir = self.script_dir
+        clone.company_logos = self.company_logos
+        clone.diamond_image_path = self.diamond_image_path
+
+        clone.board = self.board.copy()
+        clone._company_map = self._company_map.copy(clone.board)
+        clone._diamond_positions = DiamondPositions(clone.board)
+        clone._initial_o_marker_locations = OMarkerLocations(clone.board)
+        clone.company_info = {name: info.copy() for name, info in self.company_info.items()}
+        clone.price_history = self.price_history.copy()
+        clone.player_wealth = self.player_wealth.copy()
+        clone.holdings = self.holdings.copy()
+        clone.player_shares = SharesByPlayer(clone.holdings)
+        clone.holdings_value = self.holdings_value.copy()
+        clone.player_has_moved = self.player_has_moved.copy()
+
+        clone.journal = None
+        clone.recorder = None
+        clone.callbacks = []
+        clone._batch_depth = 0
+        clone._pending_updates = []
+        clone._action_depth = 0
+        clone._action_label = None
+        clone._action_turn = 0
+        clone._action_ledger = None
+        # The cache describes the copied board too, until either game moves on
+        clone._legal_moves = self._legal_moves
+        clone._legal_moves_key = self._legal_moves_key
+        return clone
+
+    # --- Undo / redo ---
+
+    def _ledger(self):
+        """
+        Returns the per-game bookkeeping as a flat {key: value} dict. The journal stores
+        the keys whose values an action changed, so entries hold deltas rather than copies.
+        """
+        ledger = {
+            ('counters',): (self.current_player_index, self.turn_counter, self.company_count,
+                            self.active_companies, self.merger_count),
+            ('names',): tuple(self.available_company_names),
+        }
+        if self.recorder is not None:
+            ledger[('record',)] = self.recorder.length  # Undo drops the action's records too
+        for player in self.players:
+            ledger[('wealth', player)] = self.player_wealth[player]
+            ledger[('holdings', player)] = self.holdings_value[player]
+            ledger[('moved', player)] = self.player_has_moved[player]
+            for company_name, shares in self.player_shares[player].items():
+                ledger[('shares', player, company_name)] = shares
+        for company_name, info in self.company_info.items():
+            ledger[('info', company_name)] = tuple(info.items())
+        for company_name, ring in self.price_history.items():
+            ledger[('prices', company_name)] = (ring.start, ring.end)
+        return ledger
+
+    def _apply_ledger(self, ledger_changes, side):
+        # side 1 restores the old values (undo), side 2 the new ones (redo)
+        for change in ledger_changes:
+            key, value = change[0], change[side]
+            kind = key[0]
+            if kind == 'counters':
+                (self.current_player_index, self.turn_counter, self.company_count,
+                 self.active_companies, self.merger_count) = value
+            elif kind == 'names':
+                self.available_company_names[:] = value
+            elif kind == 'record':
+                self.recorder.length = value
+            elif kind == 'wealth':
+                self.player_wealth[key[1]] = value
+            elif kind == 'holdings':
+                self.holdings_value[key[1]] = value
+            elif kind == 'moved':
+                self.player_has_moved[key[1]] = value
+            elif kind == 'shares':
+                if value is MISSING:
+                    self.player_shares[key[1]].pop(key[2], None)
+                else:
+                    self.player_shares[key[1]][key[2]] = value
+            elif kind == 'info':
+                if value is MISSING:
+                    self.company_info.pop(key[1], None)
+                else:
+                    self.company_info[key[1]] = dict(value)
+            elif kind == 'prices':
+                self.price_history.restore(key[1], (0, 0) if value is MISSING else value)
+
+    def _begin_action(self, label):
+        self._action_depth += 1
+        if self._action_depth == 1 and self.journal is not None:
+            self._action_label = label
+            self._action_turn = self.turn_counter
+            self._action_ledger = self._ledger()
+            self.board.journal = []  # CompanyMap and DiamondPositions append undo records here
+
+    def _end_action(self):
+        self._action_depth -= 1
+        if self._action_depth or self.board.journal is None:
+            return
+        records, self.board.journal = self.board.journal, None
+        ledger_changes = diff_ledgers(self._action_ledger, self._ledger())
+        self._action_ledger = None
+        if records or ledger_changes:
+            self.journal.record(JournalEntry(self._action_label, self._action_turn, records, ledger_changes))
+
+    def cell_updates(self, indices):
+        """
+        Returns (coords, company_name) callback entries with the current contents of the
+        given cells, reporting diamonds and empty cells as DIAMOND_TILE and EMPTY_TILE.
+        """
+        board = self.board
+        cells = board.cells
+        updated_entries = []
+        for index in dict.fromkeys(indices):
+            state = cells[index]
+            if state == COMPANY:
+                company_name = self.company_map.company_at_index(index)
+            elif state == DIAMOND:
+                company_name = DIAMOND_TILE
+            else:
+                company_name = EMPTY_TILE
+            updated_entries.append((board.coords_of(index), company_name))
+        return updated_entries
+
+    def _notify_cells(self, indices):
+        updated_entries = self.cell_updates(indices)
+        if updated_entries:
+            self.notify_callbacks(updated_entries)
+
+    def undo(self):
+        """
+        Reverts the most recent journaled action (a move, a share trade or end_turn).
 
+        Board records are reverted newest first and the bookkeeping deltas restored.
+        Callbacks are notified for the affected cells only; cells that are now a diamond
+        or empty are reported as DIAMOND_TILE or EMPTY_TILE.
+
+        Returns:
+            tuple: (success (bool), message (str))
+        """
+        if self._action_depth:
+            raise RuntimeError("Cannot undo while an action is in progress.")
+        if self.journal is None or not self.journal.can_undo():
+            return False, "Nothing to undo."
+        entry = self.journal.pop_undo()
+        changed = []
+        revert = self.company_map.revert
+        for record in reversed(entry.records):
+            changed.extend(revert(record))
+        self._apply_ledger(entry.ledger_changes, 1)
+        self.log.info("undo", "Undid '{action}' from turn {turn}.", action=entry.label, turn=entry.turn)
+        self._notify_cells(changed)
+        return True, f"Undid {entry.label.replace('_', ' ')}."
+
+    def redo(self):
+        """
+        Reapplies the action most recently reverted by undo().
+
+        Returns:
+            tuple: (success (bool), message (str))
+        """
+        if self._action_depth:
+            raise RuntimeError("Cannot redo while an action is in progress.")
+        if self.journal is None or not self.journal.can_redo():
+            return False, "Nothing to redo."
+        entry = self.journal.pop_redo()
+        changed = []
+        reapply = self.company_map.reapply
+        for record in entry.records:
+            changed.extend(reapply(record))
+        self._apply_ledger(entry.ledger_changes, 2)
+        self.log.info("redo", "Redid '{action}' from turn {turn}.", action=entry.label, turn=entry.turn)
+        self._notify_cells(changed)
+        return True, f"Redid {entry.label.replace('_', ' ')}."
+
+    @_journaled
     def create_new_company(self, coords_input, current_player):
         """
         Creates a new company at the specified coordinates.
@@ -107,11 +533,11 @@ class GameState:
             if not (isinstance(coord, tuple) and len(coord) == 2):
                 raise TypeError(f"Each coordinate must be a tuple of (row, col). Invalid coord: {coord}")
             if coord in self.initial_o_marker_locations:
-                print(f"Error: Cannot create company at {coord}. Position is an 'O' marker tile.")
+                self.log.warning("create_rejected", "Error: Cannot create company at {coords}. Position is an 'O' marker tile.", coords=coord)
                 return None, "Cannot create company on an 'O' marker tile."
 
         if not self.available_company_names:
-            print("No more available company names to create a new company.")
+            self.log.warning("create_rejected", "No more available company names to create a new company.")
             return None, "No more available company names!"
 
         company_name = self.available_company_names.pop(0)
@@ -124,6 +550,8 @@ class GameState:
             'size': len(coords_list),
             'value': initial_value,
         }
+        # A name freed by a merger starts a new price history; update_company_value records the first price
+        self.price_history.restart(company_name)
 
         updated_entries = []
 
@@ -134,26 +562,32 @@ class GameState:
                 "value": initial_value
             }
             updated_entries.append((coord, company_name))
-            print(f"Assigned '{company_name}' to {coord} owned by '{current_player if current_player else 'Diamond'}'.")
+            self.log.debug("tile_assigned", "Assigned '{company}' to {coords} owned by '{owner}'.",
+                           company=company_name, coords=coord, owner=current_player or "Diamond")
 
         # Update the new company's value to include any "O" marker bonuses
         self.update_company_value(company_name)
 
-        print(f"Created new company '{company_name}' at {coords_list} owned by '{current_player if current_player else 'Diamond'}'.")
+        self.log.info("company_created", "Created new company '{company}' at {coords} owned by '{owner}'.",
+                      company=company_name, coords=coords_list, owner=current_player or "Diamond")
 
         # Notify callbacks about the new company
         self.notify_callbacks(updated_entries)
 
         if current_player:
             # Award 5 bonus shares to the player who created the company
-            self.player_shares[current_player][company_name] = self.player_shares[current_player].get(company_name, 0) + 5
-            print(f"Awarded 5 bonus shares of '{company_name}' to player '{current_player}'.")
+            holdings = self.holdings
+            holdings.add(holdings.player_ids[current_player], holdings.company_id(company_name), 5)
+            self.holdings_value[current_player] += 5 * self.company_info[company_name]['value']
+            self.log.debug("bonus_shares", "Awarded 5 bonus shares of '{company}' to player '{player}'.",
+                           company=company_name, player=current_player)
             
             self.player_has_moved[current_player] = True  # Player has made a move
             return company_name, f"{current_player} created {company_name}!"
         else:
             return company_name, f"A new company '{company_name}' was created from diamonds!"
 
+    @_journaled
     def expand_company(self, coords, company_name, current_player):
         """
         Expands an existing company into the specified coordinates.
@@ -167,11 +601,11 @@ class GameState:
             list: List of coordinates that have been updated.
         """
         if coords in self.initial_o_marker_locations:
-            print(f"Error: Cannot expand company into {coords}. Position is an 'O' marker tile.")
+            self.log.warning("expand_rejected", "Error: Cannot expand company into {coords}. Position is an 'O' marker tile.", coords=coords)
             return []
 
         if company_name not in self.company_info:
-            print(f"Error: Company '{company_name}' does not exist.")
+            self.log.warning("expand_rejected", "Error: Company '{company}' does not exist.", company=company_name)
             return []
 
         # Assign the company to the new coordinates
@@ -180,7 +614,8 @@ class GameState:
             "owner": current_player,
             "value": 0  # Will be updated below
         }
-        print(f"Expanded company '{company_name}' into {coords} by '{current_player}'.")
+        self.log.info("company_expanded", "Expanded company '{company}' into {coords} by '{player}'.",
+                      company=company_name, coords=coords, player=current_player)
 
         # Update company size and value
         self.update_company_value(company_name)
@@ -202,6 +637,7 @@ class GameState:
             self.player_has_moved[current_player] = True  # Player has made a move
             return [coords]
 
+    @_journaled
     def merge_companies(self, coords, companies, current_player):
         """
         Merges multiple companies into the largest one or creates a new company if multiple diamonds are involved.
@@ -215,20 +651,20 @@ class GameState:
             list: List of all coordinates updated during the merge.
         """
         if not companies or len(companies) < 2:
-            print("No need to merge; insufficient companies.")
+            self.log.debug("merge_skipped", "No need to merge; insufficient companies.")
             return []
 
         # Determine if multiple diamonds are adjacent
-        row, col = coords
-        adjacent_cells = [
-            (row - 1, col), (row + 1, col),
-            (row, col - 1), (row, col + 1)
+        board = self.board
+        index = board.index_of(coords)
+        adjacent_diamonds = [
+            board.coords_of(neighbour) for neighbour in (board.neighbours[index] if index >= 0 else ())
+            if board.cells[neighbour] == DIAMOND
         ]
-        adjacent_diamonds = [cell for cell in adjacent_cells if cell in self.diamond_positions]
 
         # **Handle Diamond Mergers into New Companies**
         if len(adjacent_diamonds) >= 2:
-            print(f"Multiple diamonds adjacent to {coords}. Creating a new company.")
+            self.log.debug("diamond_merge", "Multiple diamonds adjacent to {coords}. Creating a new company.", coords=coords)
             # Include the current coords in the new company
             diamonds_to_merge = set(adjacent_diamonds)
             # Add the triggering coordinate to the set of tiles that would form the new company
@@ -237,7 +673,8 @@ class GameState:
             potential_new_company_tiles = set(adjacent_diamonds)
             potential_new_company_tiles.add(coords)
 
-            print(f"Attempting to create a new company from diamonds and triggering tile: {potential_new_company_tiles}")
+            self.log.debug("diamond_merge", "Attempting to create a new company from diamonds and triggering tile: {tiles}",
+                           tiles=potential_new_company_tiles)
             new_company_name, message = self.create_new_company(list(potential_new_company_tiles), current_player)
 
             if new_company_name:
@@ -247,7 +684,8 @@ class GameState:
                 for cell in potential_new_company_tiles:
                     self.diamond_positions.discard(cell) # discard is safe if cell wasn't a diamond
                 
-                print(f"Successfully merged diamonds and tile {coords} into new company '{new_company_name}'.")
+                self.log.info("diamond_merge", "Successfully merged diamonds and tile {coords} into new company '{company}'.",
+                              coords=coords, company=new_company_name)
                 # Notify callbacks is handled by create_new_company
                 # The player_has_moved flag is also handled by create_new_company
                 return [(tile, new_company_name) for tile in potential_new_company_tiles]
@@ -255,69 +693,73 @@ class GameState:
                 # Failed to create a new company from diamonds (e.g., no names available)
                 # Do not return. Instead, proceed to normal merger logic for the 'coords' tile.
                 # The adjacent_diamonds remain on the board.
-                print(f"Failed to create a new company from diamonds and tile {coords} (e.g., '{message}'). Proceeding with normal merger for the tile.")
+                self.log.warning("diamond_merge_failed",
+                                 "Failed to create a new company from diamonds and tile {coords} (e.g., '{reason}'). "
+                                 "Proceeding with normal merger for the tile.", coords=coords, reason=message)
                 # No return here; execution will fall through.
 
         # **Proceed with Normal Merge into the Largest Existing Company**
-        companies = list(companies)
-        companies.sort(key=lambda x: self.company_info[x]['size'], reverse=True)
+        # Sizes are tiles on the board (company_info's size lags a tile behind after a merger
+        # placed the tile); equal sizes keep name order, so the acquirer never depends on set
+        # iteration order
+        companies = sorted(companies)
+        companies.sort(key=self.company_map.size_of, reverse=True)
         largest_company = companies[0]
         merged_companies = companies[1:]
 
-        print(f"Merging companies into '{largest_company}'. Companies to merge: {merged_companies}")
+        self.log.info("companies_merging", "Merging companies into '{acquirer}'. Companies to merge: {acquired}",
+                      acquirer=largest_company, acquired=merged_companies)
 
-        updated_entries = []
-        # Initialize share transfer dictionary
-        player_shares_to_transfer = {player: 0 for player in self.players}
+        # Tiles of the acquired companies are resolved lazily, when the updates are iterated
+        updated_entries = TileUpdates(self.company_map)
+        holdings = self.holdings
+        acquirer_id = holdings.company_id(largest_company)
+        acquirer_value = self.company_info[largest_company]['value']
 
         for company in merged_companies:
             if company == largest_company:
                 continue  # Skip the largest company
 
-            # Update grid and company map
-            for coord_key, info in self.company_map.items():
-                if info["company_name"] == company:
-                    self.company_map[coord_key]["company_name"] = largest_company
-                    updated_entries.append((coord_key, largest_company))
-                    print(f"Updated company_map at {coord_key} to '{largest_company}'.")
+            # Fold the acquired company into the largest one with a single union
+            updated_entries.absorbed_nodes.extend(self.company_map.absorb_company(company, largest_company))
+            self.log.debug("tiles_merged", "Merged company_map tiles of '{acquired}' into '{acquirer}'.",
+                           acquired=company, acquirer=largest_company)
 
             # Update company info
-            self.company_info[largest_company]['size'] += self.company_info[company]['size']
-            print(f"Increased size of '{largest_company}' to {self.company_info[largest_company]['size']}.")
-
-            # Collect shares to transfer
-            for player, shares in self.player_shares.items():
-                if company in shares:
-                    num_shares = shares.pop(company)
-                    player_shares_to_transfer[player] += num_shares
-                    print(f"Player '{player}' has {num_shares} shares in '{company}' to transfer.")
+            self.company_info[largest_company]['size'] = self.company_map.size_of(largest_company)
+            self.log.debug("company_resized", "Increased size of '{company}' to {size}.",
+                           company=largest_company, size=self.company_info[largest_company]['size'])
+
+            # Shares in the acquired company become shares in the acquirer: one column add
+            acquired_id = holdings.company_id(company)
+            value_change = acquirer_value - self.company_info[company]['value']
+            for player, num_shares in zip(self.players, holdings.column(acquired_id)):
+                if num_shares:
+                    self.holdings_value[player] += num_shares * value_change
+            holdings.add_column(acquired_id, acquirer_id)
+            self.log.debug("shares_transferred", "Transferred shares in '{acquired}' to '{acquirer}'.",
+                           acquired=company, acquirer=largest_company)
 
             del self.company_info[company]
-            print(f"Deleted company '{company}' from company_info.")
+            self.log.debug("company_dissolved", "Deleted company '{company}' from company_info.", company=company)
 
             # Reduce active companies count
             self.active_companies -= 1
-            print(f"Decremented active_companies to {self.active_companies}.")
+            self.merger_count += 1
+            self.log.debug("active_companies", "Decremented active_companies to {count}.", count=self.active_companies)
 
             # Add the dissolved company's name back to the available list if not already present
             if company not in self.available_company_names:
                 self.available_company_names.append(company)
-                print(f"Added '{company}' back to available_company_names.")
-
-        # Transfer the collected shares to the largest company
-        for player, total_shares in player_shares_to_transfer.items():
-            if total_shares > 0:
-                self.player_shares[player][largest_company] = self.player_shares[player].get(
-                    largest_company, 0
-                ) + total_shares
-                print(f"Player '{player}' now has {self.player_shares[player][largest_company]} shares in '{largest_company}'.")
+                self.log.debug("company_name_released", "Added '{company}' back to available_company_names.", company=company)
 
         # After merging, update the largest company's value
         self.update_company_value(largest_company)
 
         # **Bug Fix:** Ensure coords exists in company_map before accessing
         if coords not in self.company_map:
-            print(f"Error: coords {coords} not in company_map. Assigning to '{largest_company}'.")
+            self.log.error("merge_tile_missing", "Error: coords {coords} not in company_map. Assigning to '{company}'.",
+                           coords=coords, company=largest_company)
             self.company_map[coords] = {
                 "company_name": largest_company,
                 "owner": current_player,
@@ -325,9 +767,8 @@ class GameState:
             }
             updated_entries.append((coords, largest_company))
         else:
-            self.company_map[coords]["value"] = self.company_info[largest_company]['value']
+            # The tile's value is read from its company, which update_company_value has just set
             updated_entries.append((coords, largest_company))
-            print(f"Set value at {coords} to {self.company_info[largest_company]['value']}.")
 
         # Notify callbacks about the merged companies
         self.notify_callbacks(updated_entries)
@@ -345,30 +786,14 @@ class GameState:
             company_name (str): The name of the company to update.
         """
         if company_name not in self.company_info:
-            print(f"Error: Company '{company_name}' does not exist.")
+            self.log.warning("unknown_company", "Error: Company '{company}' does not exist.", company=company_name)
             return
 
-        size = 0
-        company_positions = []
-        for c_coords, c_info in self.company_map.items():
-            if c_info["company_name"] == company_name:
-                size += 1
-                company_positions.append(c_coords)
-        
+        size = self.company_map.size_of(company_name)
+
         o_marker_bonus = 0 # Initialize to 0
-        is_adjacent_to_any_o_marker = False
-        for company_coord in company_positions:
-            r, c = company_coord
-            potential_adjacent_o_markers = [
-                (r - 1, c), (r + 1, c),  # North, South
-                (r, c - 1), (r, c + 1)   # West, East
-            ]
-            for adj_coord in potential_adjacent_o_markers:
-                if adj_coord in self.initial_o_marker_locations:
-                    is_adjacent_to_any_o_marker = True
-                    break # Found an adjacency, no need to check further for this company_coord
-            if is_adjacent_to_any_o_marker:
-                break # Found an adjacency for the company, no need to check other company_coords
+        # The company map counts the company's tiles that touch an 'O' marker as they join
+        is_adjacent_to_any_o_marker = self.company_map.o_marker_tiles_of(company_name) > 0
 
         if is_adjacent_to_any_o_marker:
             o_marker_bonus = 200 # Flat bonus
@@ -376,19 +801,24 @@ class GameState:
         base_value = size * 100
         total_value = base_value + o_marker_bonus # Use the flat bonus
 
+        value_change = total_value - self.company_info[company_name]['value']
         self.company_info[company_name]['size'] = size
         self.company_info[company_name]['value'] = total_value
+        # Merger acquirers are revalued here too, so this records every price but a split's
+        self.price_history.record(company_name, self.turn_counter, total_value)
+        if value_change:
+            # Every holder's shares are worth value_change more (or less) each
+            for player, shares in zip(self.players, self.holdings.column(self.holdings.company_id(company_name))):
+                if shares:
+                    self.holdings_value[player] += shares * value_change
         
-        print(f"Updated company '{company_name}': size={size}, base_value={base_value}, o_marker_bonus={o_marker_bonus}, total_value={total_value}.")
+        self.log.debug("company_value", "Updated company '{company}': size={size}, base_value={base_value}, "
+                       "o_marker_bonus={o_marker_bonus}, total_value={total_value}.",
+                       company=company_name, size=size, base_value=base_value,
+                       o_marker_bonus=o_marker_bonus, total_value=total_value)
 
-        # Update the value in company_map entries
-        for c_coords in company_positions:
-            self.company_map[c_coords]['value'] = total_value
-            # The existing print statement for company_map update can remain or be adjusted if needed.
-            # For now, let's keep it as is, or we can make it more detailed.
-            # print(f"Set value at {c_coords} for company '{company_name}' to {total_value}.")
-            # Keeping the old one for consistency with previous logs unless a change is specifically requested for this line.
-            print(f"Set value at {c_coords} to {total_value}.")
+        # Every tile of the company reports this value through the company map
+        self.company_map.set_company_value(company_name, total_value)
 
     def check_share_split(self, company_name):
         """
@@ -398,18 +828,24 @@ class GameState:
             company_name (str): The name of the company to check.
         """
         if company_name not in self.company_info:
-            print(f"Error: Company '{company_name}' does not exist.")
+            self.log.warning("unknown_company", "Error: Company '{company}' does not exist.", company=company_name)
             return
 
-        if self.company_info[company_name]["value"] >= 3200:
-            print(f"Share split triggered for '{company_name}'.")
-            for player in self.players:
-                if company_name in self.player_shares[player]:
-                    original_shares = self.player_shares[player][company_name]
-                    self.player_shares[player][company_name] *= 2
-                    print(f"Doubled shares for player '{player}' in '{company_name}' from {original_shares} to {self.player_shares[player][company_name]}.")
+        value = self.company_info[company_name]["value"]
+        if value >= 3200:
+            self.log.info("share_split", "Share split triggered for '{company}'.", company=company_name)
+            # Every holder's shares double: one column scale
+            company_id = self.holdings.company_id(company_name)
+            if value % 2:
+                # Twice the shares at half the price, which rounds down
+                for player, original_shares in zip(self.players, self.holdings.column(company_id)):
+                    self.holdings_value[player] -= original_shares
+            self.holdings.scale_column(company_id, 2)
+            self.log.debug("shares_doubled", "Doubled every player's shares in '{company}'.", company=company_name)
             self.company_info[company_name]["value"] //= 2
-            print(f"Halved value of '{company_name}' to {self.company_info[company_name]['value']}.")
+            self.price_history.record(company_name, self.turn_counter, self.company_info[company_name]["value"])
+            self.log.debug("value_halved", "Halved value of '{company}' to {value}.",
+                           company=company_name, value=self.company_info[company_name]['value'])
 
     def get_adjacent_companies(self, coords):
         """
@@ -421,20 +857,18 @@ class GameState:
         Returns:
             set: Set of adjacent company names.
         """
-        row, col = coords
-        adjacent_cells = [
-            (row - 1, col), (row + 1, col),
-            (row, col - 1), (row, col + 1)
-        ]
+        board = self.board
+        cells = board.cells
         companies = set()
-        for r, c in adjacent_cells:
-            if 0 <= r < self.grid_size[0] and 0 <= c < self.grid_size[1]:
-                if (r, c) in self.company_map:
-                    company_name = self.company_map[(r, c)]["company_name"]
-                    companies.add(company_name)
-        print(f"Adjacent companies to {coords}: {companies}")
+        index = board.index_of(coords)
+        if index >= 0:
+            for neighbour in board.neighbours[index]:
+                if cells[neighbour] == COMPANY:
+                    companies.add(self.company_map.company_at_index(neighbour))
+        self.log.debug("adjacent_companies", "Adjacent companies to {coords}: {companies}", coords=coords, companies=companies)
         return companies
 
+    @_journaled
     def buy_shares(self, company_name, player, amount):
         """
         Allows a player to buy shares in a company.
@@ -455,15 +889,21 @@ class GameState:
                 self.player_shares[player][company_name] = self.player_shares[player].get(
                     company_name, 0
                 ) + amount
-                print(f"{player} bought {amount} shares in '{company_name}' for £{total_cost}.")
+                self.holdings_value[player] += total_cost
+                self.log.info("shares_bought", "{player} bought {amount} shares in '{company}' for £{cost}.",
+                              player=player, amount=amount, company=company_name, cost=total_cost)
+                if self.recorder is not None:
+                    self.recorder.trade(self.players.index(player), company_name, amount, buying=True)
                 return True, f"{player} bought {amount} shares in {company_name} for £{total_cost}!"
             else:
-                print(f"{player} does not have enough money to buy shares in '{company_name}'.")
+                self.log.warning("buy_rejected", "{player} does not have enough money to buy shares in '{company}'.",
+                                 player=player, company=company_name)
                 return False, f"{player} doesn't have enough money!"
         else:
-            print(f"Company '{company_name}' does not exist.")
+            self.log.warning("buy_rejected", "Company '{company}' does not exist.", company=company_name)
             return False, f"{company_name} does not exist."
 
+    @_journaled
     def sell_shares(self, company_name, player, amount):
         """
         Allows a player to sell shares in a company.
@@ -481,16 +921,20 @@ class GameState:
                 company_value = self.company_info[company_name]["value"]
                 total_earnings = amount * company_value
                 self.player_wealth[player] += total_earnings
-                self.player_shares[player][company_name] -= amount
-                if self.player_shares[player][company_name] == 0:
-                    del self.player_shares[player][company_name]
-                print(f"{player} sold {amount} shares in '{company_name}' for £{total_earnings}.")
+                self.player_shares[player][company_name] -= amount  # At 0 the company drops out of the view
+                self.holdings_value[player] -= total_earnings
+                self.log.info("shares_sold", "{player} sold {amount} shares in '{company}' for £{earnings}.",
+                              player=player, amount=amount, company=company_name, earnings=total_earnings)
+                if self.recorder is not None:
+                    self.recorder.trade(self.players.index(player), company_name, amount, buying=False)
                 return True, f"{player} sold {amount} shares in {company_name} for £{total_earnings}!"
             else:
-                print(f"{player} does not own {amount} shares in '{company_name}'.")
+                self.log.warning("sell_rejected", "{player} does not own {amount} shares in '{company}'.",
+                                 player=player, amount=amount, company=company_name)
                 return False, f"{player} does not own {amount} shares in {company_name}!"
         else:
-            print(f"{player} does not own any shares in '{company_name}'.")
+            self.log.warning("sell_rejected", "{player} does not own any shares in '{company}'.",
+                             player=player, company=company_name)
             return False, f"{player} does not own any shares in {company_name}!"
 
     def _get_connected_diamonds(self, start_coords):
@@ -503,24 +947,26 @@ class GameState:
         Returns:
             set: Set of connected diamond coordinates.
         """
-        connected = set()
-        queue = deque()
-        queue.append(start_coords)
-        connected.add(start_coords)
-
+        board = self.board
+        cells = board.cells
+        neighbours = board.neighbours
+        connected = {start_coords}
+        start_index = board.index_of(start_coords)
+        if start_index < 0:
+            return connected
+
+        visited = {start_index}
+        queue = deque([start_index])
         while queue:
             current = queue.popleft()
-            row, col = current
-            adjacent = [
-                (row - 1, col), (row + 1, col),
-                (row, col - 1), (row, col + 1)
-            ]
-            for cell in adjacent:
-                if cell in self.diamond_positions and cell not in connected:
-                    connected.add(cell)
-                    queue.append(cell)
+            for neighbour in neighbours[current]:
+                if cells[neighbour] == DIAMOND and neighbour not in visited:
+                    visited.add(neighbour)
+                    connected.add(board.coords_of(neighbour))
+                    queue.append(neighbour)
         return connected
 
+    @_journaled
     def place_diamond(self, coords, current_player):
         """
         Places a diamond at the specified coordinates and handles potential mergers.
@@ -533,34 +979,39 @@ class GameState:
             tuple: (success (bool), message (str))
         """
         if coords in self.initial_o_marker_locations:
-            print(f"Error: Cannot place diamond at {coords}. Position is an 'O' marker tile.")
+            self.log.warning("diamond_rejected", "Error: Cannot place diamond at {coords}. Position is an 'O' marker tile.", coords=coords)
             return False, "Cannot place diamond on an 'O' marker tile."
 
         if not (isinstance(coords, tuple) and len(coords) == 2):
-            print(f"Error: coords must be a tuple of (row, col). Received: {coords}")
+            self.log.warning("diamond_rejected", "Error: coords must be a tuple of (row, col). Received: {coords}", coords=coords)
             return False, "Invalid coordinates format."
 
         if coords in self.company_map or coords in self.diamond_positions:
-            print(f"Error: Cannot place diamond at {coords}. Position already occupied.")
+            self.log.warning("diamond_rejected", "Error: Cannot place diamond at {coords}. Position already occupied.", coords=coords)
             return False, f"Position {coords} is already occupied."
 
         self.diamond_positions.add(coords)
-        print(f"Placed diamond at {coords}.")
+        self.log.info("diamond_placed", "Placed diamond at {coords}.", coords=coords)
+        # Report the diamond too, so callback diffs cover every cell a move changes
+        self.notify_callbacks([(coords, DIAMOND_TILE)])
 
         # Find all connected diamonds including the newly placed one
         connected_diamonds = self._get_connected_diamonds(coords)
-        print(f"Connected diamonds after placing at {coords}: {connected_diamonds}")
+        self.log.debug("connected_diamonds", "Connected diamonds after placing at {coords}: {connected}",
+                       coords=coords, connected=connected_diamonds)
 
         if len(connected_diamonds) >= 2:
             # Scenario 1: Diamond connects to 2 or more existing diamonds
             if self.available_company_names:
                 # Scenario 1.a: Company names are available - form a new company
-                print(f"Attempting to form a new company with diamonds: {connected_diamonds} by player {current_player}")
+                self.log.debug("diamond_company", "Attempting to form a new company with diamonds: {connected} by player {player}",
+                               connected=connected_diamonds, player=current_player)
                 new_company_name, message = self.create_new_company(list(connected_diamonds), current_player=current_player)
                 if new_company_name:
                     # Remove the merged diamonds from diamond_positions as they are now part of a company
                     self.diamond_positions.difference_update(connected_diamonds)
-                    print(f"Merged diamonds at {connected_diamonds} into new company '{new_company_name}'.")
+                    self.log.debug("diamond_company", "Merged diamonds at {connected} into new company '{company}'.",
+                                   connected=connected_diamonds, company=new_company_name)
                     # player_has_moved is handled by create_new_company when current_player is provided and company is formed.
                     return True, message
                 else:
@@ -576,7 +1027,7 @@ class GameState:
                     # If the failure was due to an 'O' marker, then the diamond at 'coords' might need to be reverted too if strict.
                     # Current logic: if new_company_name is None, it's a failure to form company.
                     # The initial diamond at 'coords' remains in diamond_positions.
-                    print(f"Failed to create a new company from diamonds: {message}")
+                    self.log.warning("diamond_company_failed", "Failed to create a new company from diamonds: {reason}", reason=message)
                     # This path indicates a complex failure. The player did attempt a move.
                     # It's debatable if player_has_moved should be True if the *intended* company formation failed.
                     # However, a diamond *was* placed.
@@ -584,18 +1035,22 @@ class GameState:
                     return False, message # Return the message from create_new_company
             else:
                 # Scenario 1.b: All company names are in use - place diamond, no new company
-                print(f"Diamond placed at {coords}, connects to {len(connected_diamonds)-1} other diamonds. All company names in use. No new company formed.")
+                self.log.debug("diamond_company", "Diamond placed at {coords}, connects to {others} other diamonds. "
+                               "All company names in use. No new company formed.",
+                               coords=coords, others=len(connected_diamonds) - 1)
                 # The diamond was already added to self.diamond_positions at the start of the function.
                 # No company is formed, so diamonds remain in self.diamond_positions.
                 self.player_has_moved[current_player] = True
                 return True, f"Diamond placed at {coords}. All companies formed, no new company created."
         else:
             # Scenario 2: Standalone diamond or connects to only one other diamond (not enough to form company)
-            print(f"Diamond at {coords} does not form a new company. Connected diamonds: {len(connected_diamonds)}")
+            self.log.debug("diamond_company", "Diamond at {coords} does not form a new company. Connected diamonds: {connected}",
+                           coords=coords, connected=len(connected_diamonds))
             # The diamond was already added to self.diamond_positions at the start of the function.
             self.player_has_moved[current_player] = True  # Player has made a move
             return True, f"Diamond placed at {coords}."
 
+    @_journaled
     def end_turn(self):
         """
         Ends the current player's turn and resets necessary flags.
@@ -605,62 +1060,83 @@ class GameState:
         """
         current_player = self.players[self.current_player_index]
         if not self.player_has_moved[current_player]:
-            print(f"{current_player} has not made a move yet!")
+            self.log.warning("end_turn_rejected", "{player} has not made a move yet!", player=current_player)
             return False, f"{current_player}, please make a move before ending your turn."
         else:
             self.player_has_moved[current_player] = False  # Reset move flag
+            player_index = self.current_player_index
             self.current_player_index = (self.current_player_index + 1) % len(self.players)
             self.turn_counter += 1
-            print(f"Turn ended. It's now {self.players[self.current_player_index]}'s turn.")
+            if self.recorder is not None:
+                self.recorder.end_of_turn(self, player_index)
+            self.log.info("turn_ended", "Turn ended. It's now {player}'s turn.", player=self.players[self.current_player_index])
             return True, f"Turn ended. It's now {self.players[self.current_player_index]}'s turn."
 
+    def record_placement(self, player_name, coords):
+        """
+        Adds the player's move on the empty cell coords to the game record, if one is kept.
+        ai_take_turn records its own moves; the UI calls this for the moves it plays
+        through the individual rule methods, before playing them.
+        """
+        if self.recorder is not None:
+            self.recorder.place(self.players.index(player_name), self.board.index_of(coords))
+
     def get_player_type(self, player_name):
         """
         Returns the type of the given player.
         """
         return self.player_types.get(player_name)
 
-    def ai_take_turn(self, player_name):
+    @_journaled
+    def ai_take_turn(self, player_name, selected_cell=None):
         """
         Allows an AI player to take a turn.
+
+        Parameters:
+            player_name (str): The AI player.
+            selected_cell (tuple): The empty cell to play. When None a random empty cell is
+                drawn, which is the whole "AI (Easy)" strategy; stronger AIs pass their choice.
+
+        Returns:
+            tuple: (selected_cell or None if the board is full, message)
         """
         current_player = player_name
-        available_cells = []
-        # Iterate c from 0 to self.grid_size[1]-1 (cols) and r from 0 to self.grid_size[0]-1 (rows)
-        for r in range(self.grid_size[0]): # rows
-            for c in range(self.grid_size[1]): # cols
-                cell = (r, c)
-                if cell not in self.company_map and \
-                   cell not in self.diamond_positions and \
-                   cell not in self.initial_o_marker_locations:
-                    available_cells.append(cell)
-
-        if not available_cells:
-            print(f"AI Warning: No available cells for {player_name} to make a move.") # Changed print message
-            self.player_has_moved[player_name] = True # Allow turn to pass
-            return None, f"{player_name} (AI) has no available moves." # Changed returned message
-
-        selected_cell = random.choice(available_cells)
-        print(f"AI {current_player} selected cell: {selected_cell}")
-
-        adj_companies = self.get_adjacent_companies(selected_cell)
+        if selected_cell is None:
+            # The board keeps a list of its empty cells, so picking one is a single random draw
+            selected_index = self.board.random_empty_index(self.rng)
+
+            if selected_index is None:
+                self.log.warning("ai_no_moves", "AI Warning: No available cells for {player} to make a move.", player=player_name)
+                self.player_has_moved[player_name] = True # Allow turn to pass
+                if self.recorder is not None:
+                    self.recorder.pass_turn(self.players.index(player_name))
+                return None, f"{player_name} (AI) has no available moves." # Changed returned message
+
+            selected_cell = self.board.coords_of(selected_index)
+        self.log.debug("ai_selected", "AI {player} selected cell: {coords}", player=current_player, coords=selected_cell)
+
+        # The same classification the UI and legal_moves() use decides what the move does
+        move = self.legal_move_at(selected_cell)
+        if move is None:
+            self.log.warning("ai_rejected", "AI {player} selected occupied cell {coords}.", player=player_name, coords=selected_cell)
+            return None, f"{player_name} (AI) cannot play occupied cell {selected_cell}."
+        self.record_placement(player_name, selected_cell)
         action_taken_message = ""
 
-        if adj_companies:
-            # ... existing logic for expanding or merging ...
-            if len(adj_companies) == 1:
-                company_to_expand = list(adj_companies)[0]
+        if move.kind in (MOVE_EXPAND, MOVE_MERGE):
+            if move.kind == MOVE_EXPAND:
+                company_to_expand = move.companies[0]
                 self.expand_company(selected_cell, company_to_expand, current_player)
                 action_taken_message = f"{current_player} (AI) expanded {company_to_expand} at {selected_cell}."
             else: # Multiple adjacent companies
-                self.merge_companies(selected_cell, adj_companies, current_player)
+                self.merge_companies(selected_cell, move.companies, current_player)
                 if selected_cell in self.company_map:
                     merged_company_name = self.company_map[selected_cell]["company_name"]
                     action_taken_message = f"{current_player} (AI) merged companies into {merged_company_name} at {selected_cell}."
                 else:
                     action_taken_message = f"{current_player} (AI) initiated a merge at {selected_cell}."
         else: # No adjacent companies to selected_cell
-            if self.available_company_names and self._can_found_company_at(selected_cell): # Condition A
+            if move.kind == MOVE_FOUND: # Condition A
                 new_company_name, message = self.create_new_company(selected_cell, current_player)
                 # THE FOLLOWING 'if/else' BLOCK (Condition B) MUST BE NESTED INSIDE THE 'THEN' OF Condition A
                 if new_company_name: # Condition B (Correctly Nested)
@@ -697,28 +1173,199 @@ class GameState:
         # However, the above logic tries to ensure it's set if any operation is attempted.
         # Let's rely on the action methods themselves or the initial "no available cells" check.
 
-        print(action_taken_message) # Keep for debugging
+        self.log.info("ai_action", "{message}", message=action_taken_message)
         return selected_cell, action_taken_message
 
-    def _can_found_company_at(self, coords):
-        row, col = coords
-        # Define orthogonal neighbors
-        potential_neighbors = [
-            (row - 1, col), (row + 1, col), # North, South
-            (row, col - 1), (row, col + 1)   # West, East
-        ]
+    @_journaled
+    def expand_into_adjacent_diamonds(self, current_player):
+        """
+        Lets companies absorb every diamond next to them, as happens after each move.
+        A diamond touching one company extends it; a diamond touching several merges them.
+
+        The diamonds on the board when the pass starts are visited once each, in board
+        (row-major) order, and a diamond is absorbed if it touches a company when it is
+        visited. An absorbed diamond is a company tile from then on, so a diamond further
+        along can join through it, but a later merger never counts it as a loose diamond.
+
+        Parameters:
+            current_player (str): The player whose move triggered the absorption.
+
+        Returns:
+            list: (coords, company_name, merged) for every absorbed diamond, in order.
+        """
+        absorbed = []
+        for diamond_coords in list(self.diamond_positions):
+            adjacent_companies = self.get_adjacent_companies(diamond_coords)
+            if not adjacent_companies:
+                continue
+            if len(adjacent_companies) == 1:
+                company_name = adjacent_companies.pop()
+                self.expand_company(diamond_coords, company_name, current_player)
+                absorbed.append((diamond_coords, company_name, False))
+            else:
+                self.merge_companies(diamond_coords, adjacent_companies, current_player)
+                absorbed.append((diamond_coords, self.company_map[diamond_coords]["company_name"], True))
+        # Absorbed diamonds are company tiles now; drop any that are somehow still listed
+        self.diamond_positions -= {coords for coords, _, _ in absorbed}
+        return absorbed
+
+    def net_worth(self, player):
+        """
+        Returns the player's cash plus the value of their shares in existing companies.
+        Read from the net-worth ledger (holdings_value), so it costs O(1).
+        """
+        return self.player_wealth[player] + self.holdings_value[player]
+
+    def wealth_summary(self):
+        """
+        Returns each player's cash plus the value of their shares in existing companies.
+        """
+        return {player: self.player_wealth[player] + self.holdings_value[player] for player in self.players}
 
-        for r_neighbor, c_neighbor in potential_neighbors:
-            # Check grid boundaries for the neighbor
-            # self.grid_size stores (number_of_rows, number_of_columns)
-            if 0 <= r_neighbor < self.grid_size[0] and 0 <= c_neighbor < self.grid_size[1]:
-                neighbor_coords = (r_neighbor, c_neighbor)
-                if neighbor_coords in self.company_map:
-                    return True # Adjacent to an existing company
-                if neighbor_coords in self.diamond_positions:
-                    return True # Adjacent to a diamond
-                if neighbor_coords in self.initial_o_marker_locations:
-                    return True # Adjacent to an 'O' marker
+    def standings(self):
+        """
+        Returns (player, net worth) pairs, richest first. Players with equal net worth keep
+        seat order, so the first entry is the player end_game declares the winner.
+        """
+        return sorted(self.wealth_summary().items(), key=lambda entry: entry[1], reverse=True)
+
+    def recompute_holdings_value(self):
+        """
+        Rebuilds the net-worth ledger from player_shares and company_info, for callers that
+        edit those dictionaries directly.
+        """
+        for player, shares in self.player_shares.items():
+            self.holdings_value[player] = sum(
+                num_shares * self.company_info[company]["value"]
+                for company, num_shares in shares.items() if company in self.company_info
+            )
+
+    def zobrist_hash(self):
+        """
+        Returns a 64-bit Zobrist hash of the position: every cell's state, which tiles
+        form which company, each player's share holdings and the player to move.
+
+        The board and company parts are kept up to date in O(1) by every tile placement,
+        diamond and merger (including undo and redo), and the holdings part by the
+        HoldingsMatrix every share count is written through. Holdings are hashed in buckets
+        of zobrist.SHARE_BUCKET shares. Keys are fixed across processes, so equal positions
+        hash equally in every replica. Cash and share values are not included.
+
+        Returns:
+            int: The hash, usable as a transposition-table or duplicate-game key.
+        """
+        return (self.board.zobrist ^ self.company_map.zobrist ^ self.holdings.zobrist
+                ^ turn_key(self.current_player_index))
+
+    # --- Legal moves ---
+
+    def legal_moves(self):
+        """
+        Returns every empty cell classified by what playing it would do.
+
+        The whole board is classified in one pass (vectorized when NumPy is installed)
+        and the result is cached until the board or the pool of company names changes,
+        so the UI, the AI and move previews share it.
+
+        Returns:
+            dict: (row, col) -> LegalMove for every empty cell, in row-major order.
+                  The dict is shared with later callers and must not be modified.
+        """
+        key = (self.board.version, bool(self.available_company_names))
+        if self._legal_moves_key != key:
+            if np is not None:
+                self._legal_moves = self._classify_empty_cells_vectorized()
+            else:
+                self._legal_moves = {
+                    self.board.coords_of(index): self._classify_index(index)
+                    for index in sorted(self.board._free_cells)
+                }
+            self._legal_moves_key = key
+        return self._legal_moves
+
+    def legal_move_at(self, coords):
+        """
+        Returns the LegalMove for the empty cell at coords, or None if it is occupied or off the board.
+        Uses the legal_moves() cache when it is current and classifies the one cell otherwise.
+        """
+        if self._legal_moves_key == (self.board.version, bool(self.available_company_names)):
+            return self._legal_moves.get(coords)
+        index = self.board.index_of(coords)
+        if index < 0 or self.board.cells[index] != EMPTY:
+            return None
+        return self._classify_index(index)
+
+    def _classify_index(self, index):
+        board = self.board
+        cells = board.cells
+        company_at_index = self.company_map.company_at_index
+        companies = set()
+        occupied = False
+        for neighbour in board.neighbours[index]:
+            state = cells[neighbour]
+            if state == COMPANY:
+                companies.add(company_at_index(neighbour))
+            elif state != EMPTY:
+                occupied = True
+        coords = board.coords_of(index)
+        if len(companies) > 1:
+            return LegalMove(coords, MOVE_MERGE, tuple(sorted(companies)))
+        if companies:
+            return LegalMove(coords, MOVE_EXPAND, tuple(companies))
+        if occupied and self.available_company_names:
+            return LegalMove(coords, MOVE_FOUND)
+        return LegalMove(coords, MOVE_DIAMOND)
+
+    def _classify_empty_cells_vectorized(self):
+        board = self.board
+        company_map = self.company_map
+        states = board.state_array()
+        roots = board.company_id_array(company_map.root_ids())
+
+        # Neighbour layers in North, South, West, East order; off-board neighbours read as empty
+        padded_states = np.pad(states, 1, constant_values=EMPTY)
+        padded_roots = np.pad(roots, 1, constant_values=NO_COMPANY)
+        shifts = ((slice(None, -2), slice(1, -1)), (slice(2, None), slice(1, -1)),
+                  (slice(1, -1), slice(None, -2)), (slice(1, -1), slice(2, None)))
+        neighbour_states = np.stack([padded_states[shift] for shift in shifts])
+        neighbour_roots = np.sort(np.stack([padded_roots[shift] for shift in shifts]), axis=0)
+
+        # Distinct adjacent companies: the sorted layers counting a root where it first appears
+        first_seen = np.ones(neighbour_roots.shape, dtype=bool)
+        first_seen[1:] = neighbour_roots[1:] != neighbour_roots[:-1]
+        distinct = (first_seen & (neighbour_roots != NO_COMPANY)).sum(axis=0)
+        occupied = (neighbour_states != EMPTY).any(axis=0)
+
+        empty = np.flatnonzero(states.ravel() == EMPTY)
+        distinct = distinct.ravel()[empty].tolist()
+        occupied = occupied.ravel()[empty].tolist()
+        cell_roots = neighbour_roots.reshape(4, -1)[:, empty].T.tolist()
+
+        can_found = bool(self.available_company_names)
+        company_of_root = company_map.company_of_root
+        coords_of = board.coords_of
+        moves = {}
+        for index, count, has_neighbour, neighbours in zip(empty.tolist(), distinct, occupied, cell_roots):
+            coords = coords_of(index)
+            if count:
+                companies = tuple(sorted({company_of_root(root) for root in neighbours if root != NO_COMPANY}))
+                moves[coords] = LegalMove(coords, MOVE_MERGE if count > 1 else MOVE_EXPAND, companies)
+            elif has_neighbour and can_found:
+                moves[coords] = LegalMove(coords, MOVE_FOUND)
+            else:
+                moves[coords] = LegalMove(coords, MOVE_DIAMOND)
+        return moves
+
+    def _can_found_company_at(self, coords):
+        board = self.board
+        index = board.index_of(coords)
+        if index < 0:
+            return False
+        cells = board.cells
+        # Any occupied orthogonal neighbour (company tile, diamond or 'O' marker) qualifies
+        for neighbour in board.neighbours[index]:
+            if cells[neighbour] != EMPTY:
+                return True
         return False # No qualifying adjacencies found
 
     # Additional methods can be added below as needed
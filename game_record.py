@@ -0,0 +1,290 @@
+# game_record.py
+#
+# Compact binary game records: a header describing the game's setup, then one
+# fixed-width record per placement, share trade, end of turn and state checkpoint.
+
+import io
+import os
+import struct
+import time
+
+from event_log import OFF, EventLog
+from game_logic import COMPANY_NAMES, GameState
+from zobrist import MASK64, mix64
+
+MAGIC = b"CCGR"
+FORMAT_VERSION = 1
+DEFAULT_CHECKPOINT_INTERVAL = 10  # Turns between state checkpoints
+RECORDS_DIR = 'game_records'      # Where GameScreen keeps finished games, like profiles_dir
+FILE_EXTENSION = '.ccgr'
+
+# Record kinds
+PLACE = 0       # player, cell index: the player's move on that cell
+PASS = 1        # player: the board was full, so the move was skipped
+BUY = 2         # player, company id, amount
+SELL = 3        # player, company id, amount
+END_TURN = 4    # player
+CHECKPOINT = 5  # turn counter (mod 2**16), 32-bit state hash after that turn
+
+RECORD = struct.Struct('<BBHI')  # kind, player index, cell index / company id / turn, amount / hash
+RECORD_SIZE = RECORD.size        # 8 bytes
+NO_SEED = MASK64                 # Header seed of a game without one
+
+_HEADER = struct.Struct('<4sBQHHHHH')  # magic, version, seed, rows, cols, turn limit, checkpoint interval, markers
+_CHUNK_RECORDS = 4096  # Records read per chunk when streaming
+
+
+class ReplayError(Exception):
+    """
+    A record could not be replayed, or a checkpoint hash did not match the replayed game.
+    """
+
+
+class GameRecordHeader:
+    """
+    The setup a game record starts from.
+    """
+    __slots__ = ('seed', 'grid_size', 'turn_limit', 'checkpoint_interval', 'o_marker_indices',
+                 'player_configurations')
+
+    def __init__(self, seed, grid_size, turn_limit, checkpoint_interval, o_marker_indices, player_configurations):
+        self.seed = seed  # None if the game was not seeded
+        self.grid_size = grid_size
+        self.turn_limit = turn_limit  # 0 if unknown
+        self.checkpoint_interval = checkpoint_interval
+        self.o_marker_indices = o_marker_indices  # Sorted flat cell indices
+        self.player_configurations = player_configurations
+
+    @classmethod
+    def from_game(cls, game_state, seed=None, turn_limit=0, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        configurations = [
+            {'name': name, 'type': game_state.player_types[name],
+             'profile_username': game_state.player_profile_details[name]['profile_username'],
+             'is_new_profile': False}
+            for name in game_state.players
+        ]
+        o_marker_indices = sorted(game_state.board.index_of(coords) for coords in game_state.initial_o_marker_locations)
+        return cls(seed, tuple(game_state.grid_size), turn_limit, checkpoint_interval, o_marker_indices, configurations)
+
+    def to_bytes(self):
+        rows, cols = self.grid_size
+        seed = NO_SEED if self.seed is None else self.seed & MASK64
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, seed, rows, cols, self.turn_limit,
+                              self.checkpoint_interval, len(self.o_marker_indices))]
+        parts.append(struct.pack(f'<{len(self.o_marker_indices)}H', *self.o_marker_indices))
+        parts.append(struct.pack('<B', len(self.player_configurations)))
+        for configuration in self.player_configurations:
+            for text in (configuration['name'], configuration['type'], configuration['profile_username'] or ''):
+                encoded = text.encode('utf-8')
+                parts.append(struct.pack('<B', len(encoded)) + encoded)
+        return b''.join(parts)
+
+    @classmethod
+    def read(cls, stream):
+        """
+        Reads a header from a binary stream, leaving it at the first record.
+        """
+        magic, version, seed, rows, cols, turn_limit, interval, marker_count = _HEADER.unpack(
+            _read_exactly(stream, _HEADER.size))
+        if magic != MAGIC:
+            raise ReplayError("Not a game record.")
+        if version != FORMAT_VERSION:
+            raise ReplayError(f"Unsupported game record version {version}.")
+        o_marker_indices = list(struct.unpack(f'<{marker_count}H', _read_exactly(stream, 2 * marker_count)))
+        player_count, = struct.unpack('<B', _read_exactly(stream, 1))
+        configurations = []
+        for _ in range(player_count):
+            name, player_type, username = (_read_text(stream) for _ in range(3))
+            configurations.append({'name': name, 'type': player_type, 'profile_username': username or None,
+                                   'is_new_profile': False})
+        return cls(None if seed == NO_SEED else seed, (rows, cols), turn_limit, interval, o_marker_indices,
+                   configurations)
+
+    def new_game(self, script_dir=None):
+        """
+        Returns a GameState set up as the recorded game started, for replaying it.
+        Logging and journaling are off, as in headless play.
+        """
+        script_dir = script_dir or os.path.dirname(os.path.abspath(__file__))
+        game_state = GameState(self.player_configurations, self.grid_size, script_dir)
+        game_state.log = EventLog(level=OFF)
+        game_state.journal = None
+        board = game_state.board
+        game_state.set_initial_o_marker_locations({board.coords_of(index) for index in self.o_marker_indices})
+        return game_state
+
+
+class GameRecorder:
+    """
+    Records a game as it is played. Attach it as game_state.recorder once the 'O' markers
+    are set; GameState then appends a record for every placement, trade and end of turn,
+    and a CHECKPOINT with state_hash() every `checkpoint_interval` turns.
+
+    Records live in one bytearray of RECORD_SIZE-byte entries. `length` is part of the
+    GameState undo ledger: undoing an action moves it back over the action's records and
+    redo moves it forward again, so the record always matches the game as it stands.
+
+    Usage:
+        game_state.recorder = GameRecorder(game_state, seed=seed, turn_limit=80)
+        ...  # Play the game
+        data = game_state.recorder.to_bytes()
+        final_state = replay(data)
+    """
+
+    def __init__(self, game_state, seed=None, turn_limit=0, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.header = GameRecordHeader.from_game(game_state, seed, turn_limit, checkpoint_interval)
+        self.length = 0  # Records in the game; bytes past it belong to undone actions
+        self._records = bytearray()
+
+    def __len__(self):
+        return self.length
+
+    def append(self, kind, player_index, argument=0, value=0):
+        end = self.length * RECORD_SIZE
+        if len(self._records) > end:
+            del self._records[end:]  # A new action drops what undo left for redo
+        self._records += RECORD.pack(kind, player_index, argument, value)
+        self.length += 1
+
+    # GameState calls these as the game is played
+
+    def place(self, player_index, cell_index):
+        self.append(PLACE, player_index, cell_index)
+
+    def pass_turn(self, player_index):
+        self.append(PASS, player_index)
+
+    def trade(self, player_index, company_name, amount, buying):
+        self.append(BUY if buying else SELL, player_index, COMPANY_NAMES.index(company_name), amount)
+
+    def end_of_turn(self, game_state, player_index):
+        """
+        Records END_TURN, and a checkpoint if the finished turn completes an interval.
+        """
+        self.append(END_TURN, player_index)
+        interval = self.header.checkpoint_interval
+        if interval and game_state.turn_counter % interval == 0:
+            self.append(CHECKPOINT, 0, game_state.turn_counter & 0xFFFF, state_hash(game_state) & 0xFFFFFFFF)
+
+    def records(self):
+        return bytes(self._records[:self.length * RECORD_SIZE])
+
+    def to_bytes(self):
+        return self.header.to_bytes() + self.records()
+
+    def save(self, directory=RECORDS_DIR):
+        """
+        Writes the record to a new timestamped file in directory and returns its path.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime('game_%Y%m%d_%H%M%S') + FILE_EXTENSION)
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(directory, time.strftime('game_%Y%m%d_%H%M%S') + f'_{suffix}' + FILE_EXTENSION)
+            suffix += 1
+        with open(path, 'wb') as record_file:
+            record_file.write(self.to_bytes())
+        return path
+
+
+def list_game_records(directory=RECORDS_DIR):
+    """
+    Returns the paths of the game records saved in directory, newest first.
+    """
+    if not os.path.isdir(directory):
+        return []
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(FILE_EXTENSION)]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def state_hash(game_state):
+    """
+    Returns the position's Zobrist hash with every player's cash folded in, so
+    checkpoints also catch trades and payouts.
+    """
+    value = game_state.zobrist_hash()
+    for player_index, player in enumerate(game_state.players):
+        value ^= mix64((player_index << 48) ^ game_state.player_wealth[player])
+    return value ^ (value >> 32)
+
+
+def read_records(stream):
+    """
+    Yields (kind, player_index, argument, value) for every record left in a binary stream,
+    reading it in chunks.
+    """
+    while True:
+        chunk = stream.read(RECORD_SIZE * _CHUNK_RECORDS)
+        if not chunk:
+            return
+        if len(chunk) % RECORD_SIZE:
+            raise ReplayError("Game record ends in the middle of a record.")
+        yield from RECORD.iter_unpack(chunk)
+
+
+def replay(source, verify=True, until_turn=None):
+    """
+    Streams a game record through a fresh GameState.
+
+    Parameters:
+        source: The record as bytes, or a binary stream positioned at its header.
+        verify (bool): Check every CHECKPOINT hash; a mismatch raises ReplayError.
+        until_turn (int): Stop once turn_counter reaches this turn (default: the whole game).
+
+    Returns:
+        GameState: The game after the last record replayed.
+    """
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+    header = GameRecordHeader.read(stream)
+    game_state = header.new_game()
+    for record in read_records(stream):
+        if until_turn is not None and game_state.turn_counter >= until_turn:
+            break
+        apply_record(game_state, record, verify)
+    return game_state
+
+
+def apply_record(game_state, record, verify=True):
+    """
+    Plays one (kind, player_index, argument, value) record on game_state.
+    """
+    kind, player_index, argument, value = record
+    if kind == CHECKPOINT:
+        if verify and (state_hash(game_state) & 0xFFFFFFFF) != value:
+            raise ReplayError(f"State hash mismatch at turn {game_state.turn_counter}.")
+        return
+    player = game_state.players[player_index]
+    if kind in (PLACE, PASS, END_TURN) and player_index != game_state.current_player_index:
+        raise ReplayError(f"Record for {player} out of turn at turn {game_state.turn_counter}.")
+    if kind == PLACE:
+        selected_cell, message = game_state.ai_take_turn(player, game_state.board.coords_of(argument))
+        if selected_cell is None:
+            raise ReplayError(message)
+        game_state.expand_into_adjacent_diamonds(player)
+    elif kind == PASS:
+        if game_state.board.empty_count():
+            raise ReplayError(f"{player} passed with free cells left at turn {game_state.turn_counter}.")
+        game_state.ai_take_turn(player)
+    elif kind in (BUY, SELL):
+        trade = game_state.buy_shares if kind == BUY else game_state.sell_shares
+        success, message = trade(COMPANY_NAMES[argument], player, value)
+        if not success:
+            raise ReplayError(message)
+    elif kind == END_TURN:
+        success, message = game_state.end_turn()
+        if not success:
+            raise ReplayError(message)
+    else:
+        raise ReplayError(f"Unknown record kind {kind}.")
+
+
+def _read_exactly(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ReplayError("Game record is truncated.")
+    return data
+
+
+def _read_text(stream):
+    length, = struct.unpack('<B', _read_exactly(stream, 1))
+    return _read_exactly(stream, length).decode('utf-8')
@@ -21,8 +21,13 @@ from kivy.clock import Clock
 from kivy.animation import Animation
 from kivy.app import App # Added import
 
+from ai_players import AI_PLAYER_TYPES, game_move_policies
+from ai_worker import AIMoveRequest, AIStretchRequest
+from game_record import GameRecorder
 from custom_widgets import ImageButton
-from game_logic import GameState
+from game_logic import (
+    DIAMOND_TILE, EMPTY_TILE, MOVE_EXPAND, MOVE_FOUND, MOVE_MERGE, GameState, random_o_marker_locations,
+)
 from profile_manager import ProfileManager, UserProfile
 
 
@@ -265,7 +270,16 @@ class GameScreen(Screen):
         self.blinking_buttons = []
         self.blinking_animations = []
 
-    def initialize_game(self, player_configurations, grid_size, game_turn_length, marker_percentage=0.1): # player_names -> player_configurations
+        # Pending AI turn: the scheduled start and the background move computation
+        self.ai_turn_event = None
+        self.ai_request = None
+        # Fast-forward: consecutive AI turns are resolved together and drawn once
+        self.fast_forward = False
+
+    def initialize_game(self, player_configurations, grid_size, game_turn_length, marker_percentage=0.1,
+                        replay_timeline=None): # player_names -> player_configurations
+        self.cancel_ai_turn()  # A move still being computed belongs to the previous game
+        self.replay_timeline = replay_timeline  # Set when showing a saved game (see start_replay)
         self.main_layout.clear_widgets()
         self.o_marker_buttons = []
         self.game_over_flag = False
@@ -279,7 +293,7 @@ class GameScreen(Screen):
             profile_username = p_config['profile_username'] # This can be None for AI
             player_game_name = p_config['name'] # This is the display name, e.g., "HumanPlayer1" or "AI 1 (Easy)"
 
-            if profile_username is not None: # Human player
+            if profile_username is not None and replay_timeline is None: # Human player
                 is_new = p_config.get('is_new_profile', False)
                 profile = None
                 if is_new:
@@ -305,7 +319,7 @@ class GameScreen(Screen):
                 # Store the UserProfile object (or a temporary one) against the player's game name
                 self.player_profile_objects[player_game_name] = profile if profile else UserProfile(profile_username) # Ensure a profile object is stored
 
-            else: # AI Player (profile_username is None)
+            else: # AI Player (profile_username is None), or any player of a replay, which leaves profiles alone
                 self.player_profile_objects[player_game_name] = None # Explicitly store None for AI players
                 print(f"GameScreen: Setting up AI player {player_game_name} with no profile object.")
 
@@ -314,6 +328,7 @@ class GameScreen(Screen):
         # GameState __init__ will now use 'name' for its primary player list.
         self.game_state = GameState(player_configurations, grid_size, script_dir)
         self.game_turn_length = game_turn_length  # Game turn length set by player
+        self.move_policies = game_move_policies()  # This game's AI players, with their own search tables
 
         # **Register the callback to handle GameState updates**
         self.game_state.register_callback(self.handle_game_state_update)
@@ -480,23 +495,11 @@ class GameScreen(Screen):
 
         # Initialize grid buttons
         self.grid_buttons = []
-        total_cells = self.grid_size[0] * self.grid_size[1]
         # Use the marker_percentage from StartScreen, default to 0.1 if not provided
-        max_circles = int(total_cells * marker_percentage)
-
-        # Create a list of all possible (row, col) coordinates
-        # grid_size = (rows, columns)
-        all_coordinates = []
-        for r in range(self.grid_size[0]): # Iterate through rows
-            for c in range(self.grid_size[1]): # Iterate through columns
-                all_coordinates.append((r, c))
-
-        # Randomly shuffle the list of all possible coordinates
-        random.shuffle(all_coordinates)
-
-        # Select the first `max_circles` coordinates for "O" markers
-        o_marker_locations_list = all_coordinates[:max_circles]
-        o_marker_locations_set = set(o_marker_locations_list)
+        if replay_timeline is not None:
+            o_marker_locations_set = replay_timeline.o_marker_locations  # The recorded game's layout
+        else:
+            o_marker_locations_set = random_o_marker_locations(self.grid_size, marker_percentage)
 
         # grid_size = (rows, columns)
         for row in range(self.grid_size[0]): # Iterate through rows
@@ -533,6 +536,9 @@ class GameScreen(Screen):
 
         # Pass the collected 'O' marker locations to GameState
         self.game_state.set_initial_o_marker_locations(o_marker_locations_set)
+        # Record the game from here on, so it can be kept and replayed
+        if replay_timeline is None:
+            self.game_state.recorder = GameRecorder(self.game_state, turn_limit=self.game_turn_length)
 
         # Removed animation for 'O' marker buttons as per subtask instructions
         # The new 'O' markers are Widgets with Ellipses, not Buttons with text/color animations.
@@ -556,18 +562,32 @@ class GameScreen(Screen):
         self.toggle_sidebar_button = Button(
             text="Toggle Sidebar", on_press=self.toggle_sidebar, font_size=18
         )
-        button_layout.add_widget(self.end_turn_button)
-        button_layout.add_widget(self.share_management_button)
+        self.undo_button = Button(
+            text="Undo", on_press=self.undo_last_action, font_size=18
+        )
+        self.redo_button = Button(
+            text="Redo", on_press=self.redo_last_action, font_size=18
+        )
+        if replay_timeline is not None:
+            self.add_replay_controls(button_layout)
+        else:
+            button_layout.add_widget(self.end_turn_button)
+            button_layout.add_widget(self.share_management_button)
+            button_layout.add_widget(self.undo_button)
+            button_layout.add_widget(self.redo_button)
         button_layout.add_widget(self.toggle_sidebar_button)
         self.game_layout.add_widget(button_layout)
 
         self.grid_plus_labels_container.bind(size=self.update_game_board_layout)
 
         self.main_layout.add_widget(self.game_layout)
-        self.update_player_info()
 
-        # Start the first turn
-        self.next_turn()
+        if replay_timeline is not None:
+            self.seek_replay(0)
+        else:
+            self.update_player_info()
+            # Start the first turn
+            self.next_turn()
 
         Clock.schedule_once(self._finalize_initial_layout, 0.5) # 0.5s delay
 
@@ -600,6 +620,44 @@ class GameScreen(Screen):
             self.sidebar_visible = True # Temporarily set to true so animate_sidebar_close runs fully
             self.animate_sidebar_close()
 
+    def start_replay(self, replay_timeline):
+        """
+        Show a saved game (a replay_viewer.ReplayTimeline) on the grid, with a turn slider
+        and step buttons in place of the move controls.
+        """
+        header = replay_timeline.header
+        replay_timeline.seek(0)  # The new grid starts out showing the start of the game
+        self.initialize_game(header.player_configurations, header.grid_size, replay_timeline.last_turn,
+                             replay_timeline=replay_timeline)
+
+    def add_replay_controls(self, button_layout):
+        timeline = self.replay_timeline
+        previous_button = Button(text="<", font_size=18, size_hint=(0.1, 1))
+        previous_button.bind(on_press=lambda instance: self.seek_replay(timeline.turn - 1))
+        self.replay_slider = Slider(min=0, max=max(timeline.last_turn, 1), value=timeline.turn, step=1,
+                                    size_hint=(0.6, 1))
+        self.replay_slider.bind(value=lambda instance, value: self.seek_replay(int(value)))
+        next_button = Button(text=">", font_size=18, size_hint=(0.1, 1))
+        next_button.bind(on_press=lambda instance: self.seek_replay(timeline.turn + 1))
+        button_layout.add_widget(previous_button)
+        button_layout.add_widget(self.replay_slider)
+        button_layout.add_widget(next_button)
+
+    def seek_replay(self, turn):
+        """
+        Show the replayed game at the end of the given turn. The timeline restores the
+        nearest keyframe and replays the turns after it, and only the cells that differ
+        from the turn on show are redrawn, as one diff.
+        """
+        timeline = self.replay_timeline
+        updated_entries = timeline.seek(turn)
+        self.game_state = timeline.game_state
+        if updated_entries:
+            self.handle_game_state_update(updated_entries)
+        self.replay_slider.value = timeline.turn  # No-op when the slider asked for this turn
+        self.info_label.text = f"Replay: turn {timeline.turn} of {timeline.last_turn}"
+        self.update_player_info()
+
     def handle_game_state_update(self, updated_entries):
         """
         Callback function to handle updates from GameState.
@@ -637,71 +695,78 @@ class GameScreen(Screen):
         current_coords = instance.coords
         current_player = self.game_state.players[self.game_state.current_player_index]
 
-        # Check for adjacent companies using company_map
-        adjacent_companies = self.game_state.get_adjacent_companies(current_coords)
-        if adjacent_companies:
-            if len(adjacent_companies) == 1:
-                # Expand the existing company
-                company_name = adjacent_companies.pop()
-                self.game_state.expand_company(current_coords, company_name, current_player)
-                # The UI will be updated via the callback
-                self.info_label.text = f"{current_player} expanded {company_name}!"
-                # Perform flip animation upon expansion
-                self.perform_flip_animation(instance)
-            else:
-                # Merge companies
-                self.game_state.merge_companies(current_coords, adjacent_companies, current_player)
-                merged_company_name = self.game_state.company_map[current_coords]["company_name"]
-                # The UI will be updated via the callback
-                self.info_label.text = f"{current_player} merged companies into {merged_company_name}!"
-                # Perform flip animation upon merging
-                self.perform_flip_animation(instance)
-        else: # No adjacent companies
-            # current_player is already defined in this scope
-            if self.game_state.available_company_names and self.game_state._can_found_company_at(current_coords):
-                # Create a new company
-                company_name, message = self.game_state.create_new_company(current_coords, current_player)
-                if company_name:
-                    # The UI will be updated via the callback from create_new_company
-                    self.info_label.text = message
-                    self.perform_flip_animation(instance) # instance is the button
+        # Deliver the whole move cascade (placement, merges, diamond absorption) to
+        # handle_game_state_update as one deduplicated diff
+        with self.game_state.batch_updates():
+            # Classify the move the same way the AI does (cached until the board changes)
+            move = self.game_state.legal_move_at(current_coords)
+            if move is None:
+                self.info_label.text = f"{current_coords} is already occupied."
+                return
+            self.game_state.record_placement(current_player, current_coords)
+            if move.kind in (MOVE_EXPAND, MOVE_MERGE):
+                if move.kind == MOVE_EXPAND:
+                    # Expand the existing company
+                    company_name = move.companies[0]
+                    self.game_state.expand_company(current_coords, company_name, current_player)
+                    # The UI will be updated via the callback
+                    self.info_label.text = f"{current_player} expanded {company_name}!"
+                    # Perform flip animation upon expansion
+                    self.perform_flip_animation(instance)
                 else:
-                    # create_new_company failed (e.g. trying to create on 'O' marker itself)
-                    self.info_label.text = message
-                    # Potentially place diamond if creation failed?
-                    # For now, let's assume if _can_found_company_at was true, but create_new_company failed,
-                    # it's a specific rule interaction (like on 'O' marker) and not a diamond placement.
-                    # The original human logic didn't have a fallback to diamond here if is_adjacent_to was true.
-                    # However, the AI logic *does* fallback. For consistency, maybe human should too.
-                    # Let's make it consistent: if create_new_company fails, human also tries diamond.
-                    if "Cannot create company on an 'O' marker tile" in message: # Or similar check
-                        self.info_label.text = message + " Try placing a diamond." # Guide user
-                        # No automatic diamond placement here, user must click again if they want diamond.
-                        # Button will be disabled after this interaction by disable_grid_buttons().
-                        # This makes it less like AI, but gives human more control after failure.
-                        pass
-                    # If create_new_company failed for other reasons (e.g. no names), message is already set.
-            else: # No available company names or cannot found company at current_coords
-                # Place a diamond
-                self.place_diamond(instance) # instance is the button
-                # self.info_label.text is set by place_diamond or its callers if needed.
-                # For direct call here, we might need:
-                # self.info_label.text = f"{current_player} placed a diamond."
-                # However, self.place_diamond itself calls game_state.place_diamond which returns a message.
-                # The current self.place_diamond(self, instance) in GameScreen:
-                #   success, message = self.game_state.place_diamond(current_coords, current_player_name)
-                #   if success: # updates visuals
-                #   else: self.info_label.text = message
-                # This seems fine. If place_diamond fails, it sets info_label. If it succeeds, a message is not explicitly set here,
-                # but game_state.place_diamond does return one. Let's ensure a generic success message if place_diamond itself doesn't set one.
-                # Checking place_diamond: it *does not* set info_label on success.
-                # So we should set it here.
-                if instance.source == self.game_state.diamond_image_path or instance.text == "◆": # Check if diamond was actually placed
-                     self.info_label.text = f"{current_player} placed a diamond at {current_coords}."
-                # If place_diamond failed, it will have set its own error message.
-
-        # After the move, expand companies into adjacent diamonds
-        self.expand_companies_into_adjacent_diamonds()
+                    # Merge companies
+                    self.game_state.merge_companies(current_coords, move.companies, current_player)
+                    merged_company_name = self.game_state.company_map[current_coords]["company_name"]
+                    # The UI will be updated via the callback
+                    self.info_label.text = f"{current_player} merged companies into {merged_company_name}!"
+                    # Perform flip animation upon merging
+                    self.perform_flip_animation(instance)
+            else: # No adjacent companies
+                # current_player is already defined in this scope
+                if move.kind == MOVE_FOUND:
+                    # Create a new company
+                    company_name, message = self.game_state.create_new_company(current_coords, current_player)
+                    if company_name:
+                        # The UI will be updated via the callback from create_new_company
+                        self.info_label.text = message
+                        self.perform_flip_animation(instance) # instance is the button
+                    else:
+                        # create_new_company failed (e.g. trying to create on 'O' marker itself)
+                        self.info_label.text = message
+                        # Potentially place diamond if creation failed?
+                        # For now, let's assume if _can_found_company_at was true, but create_new_company failed,
+                        # it's a specific rule interaction (like on 'O' marker) and not a diamond placement.
+                        # The original human logic didn't have a fallback to diamond here if is_adjacent_to was true.
+                        # However, the AI logic *does* fallback. For consistency, maybe human should too.
+                        # Let's make it consistent: if create_new_company fails, human also tries diamond.
+                        if "Cannot create company on an 'O' marker tile" in message: # Or similar check
+                            self.info_label.text = message + " Try placing a diamond." # Guide user
+                            # No automatic diamond placement here, user must click again if they want diamond.
+                            # Button will be disabled after this interaction by disable_grid_buttons().
+                            # This makes it less like AI, but gives human more control after failure.
+                            pass
+                        # If create_new_company failed for other reasons (e.g. no names), message is already set.
+                else: # No available company names or cannot found company at current_coords
+                    # Place a diamond
+                    self.place_diamond(instance) # instance is the button
+                    # self.info_label.text is set by place_diamond or its callers if needed.
+                    # For direct call here, we might need:
+                    # self.info_label.text = f"{current_player} placed a diamond."
+                    # However, self.place_diamond itself calls game_state.place_diamond which returns a message.
+                    # The current self.place_diamond(self, instance) in GameScreen:
+                    #   success, message = self.game_state.place_diamond(current_coords, current_player_name)
+                    #   if success: # updates visuals
+                    #   else: self.info_label.text = message
+                    # This seems fine. If place_diamond fails, it sets info_label. If it succeeds, a message is not explicitly set here,
+                    # but game_state.place_diamond does return one. Let's ensure a generic success message if place_diamond itself doesn't set one.
+                    # Checking place_diamond: it *does not* set info_label on success.
+                    # So we should set it here.
+                    if instance.source == self.game_state.diamond_image_path or instance.text == "◆": # Check if diamond was actually placed
+                         self.info_label.text = f"{current_player} placed a diamond at {current_coords}."
+                    # If place_diamond failed, it will have set its own error message.
+
+            # After the move, expand companies into adjacent diamonds
+            self.expand_companies_into_adjacent_diamonds()
         self.disable_grid_buttons()
         self.update_player_info()
         self.end_turn_button.disabled = False # Enable end turn button after human move
@@ -746,37 +811,26 @@ class GameScreen(Screen):
         Check all diamonds on the board to see if they are adjacent to any companies.
         If so, handle expansions or mergers accordingly.
         """
-        diamonds_to_remove = set()
-        for diamond_coords in list(self.game_state.diamond_positions):
-            adjacent_companies = self.game_state.get_adjacent_companies(diamond_coords)
-            if adjacent_companies:
-                button = self.grid_buttons[diamond_coords[0]][diamond_coords[1]]
-                if len(adjacent_companies) == 1:
-                    # Expand the company into the diamond
-                    company_name = adjacent_companies.pop()
-                    self.game_state.expand_company(diamond_coords, company_name, self.game_state.players[self.game_state.current_player_index])
-                    # The UI will be updated via the callback
-                    self.info_label.text += f" {company_name} expanded into a diamond!"
-                    # Perform flip animation upon expansion
-                    self.perform_flip_animation(button)
-                else:
-                    # Merge companies via the diamond
-                    self.game_state.merge_companies(diamond_coords, adjacent_companies, self.game_state.players[self.game_state.current_player_index])
-                    merged_company_name = self.game_state.company_map[diamond_coords]["company_name"]
-                    # The UI will be updated via the callback
-                    self.info_label.text += f" Companies merged into {merged_company_name} via a diamond!"
-                    # Perform flip animation upon merging
-                    self.perform_flip_animation(button)
-                # Mark the diamond for removal
-                diamonds_to_remove.add(diamond_coords)
-        # Remove the diamonds that have been absorbed
-        self.game_state.diamond_positions -= diamonds_to_remove
+        current_player = self.game_state.players[self.game_state.current_player_index]
+        # The rules live in GameState; the tiles themselves are redrawn via the callback
+        for diamond_coords, company_name, merged in self.game_state.expand_into_adjacent_diamonds(current_player):
+            if merged:
+                self.info_label.text += f" Companies merged into {company_name} via a diamond!"
+            else:
+                self.info_label.text += f" {company_name} expanded into a diamond!"
+            # Perform flip animation upon expansion or merging
+            self.perform_flip_animation(self.grid_buttons[diamond_coords[0]][diamond_coords[1]])
 
     def update_grid_button(self, button, company_name):
         """
         Update the grid button to reflect the company.
         This includes setting the correct logo and color.
+        Undo and redo also report cells that became a diamond or empty again.
         """
+        if company_name is EMPTY_TILE or company_name == DIAMOND_TILE:
+            self.reset_grid_button(button, diamond=company_name == DIAMOND_TILE)
+            return
+
         if company_name in self.valid_company_logos:
             logo_path = self.valid_company_logos[company_name]
             button.source = ''  # Clear current image
@@ -816,6 +870,59 @@ class GameScreen(Screen):
         button.disabled = True
         print(f"Button at ({button.coords[0]}, {button.coords[1]}) properties reset and disabled.")
 
+    def reset_grid_button(self, button, diamond):
+        """
+        Show a grid button as a diamond or as an empty square (after undo / redo).
+        """
+        if hasattr(button, 'anim') and button.anim:
+            button.anim.cancel(button)
+            delattr(button, 'anim')
+        button.angle = 0
+        button.scale_x = 1
+        button.color = [1, 1, 1, 1]
+        button.text = ""
+        if diamond and self.valid_diamond_path:
+            button.source = self.valid_diamond_path
+        else:
+            button.source = ''
+            if diamond:
+                button.text = u"◆"
+                button.font_size = 24
+        button.reload()
+        button.disabled = True
+
+    def undo_last_action(self, instance):
+        """
+        Undo the current human player's last action (a move or share trade) this turn.
+        """
+        self._step_history(self.game_state.journal.peek_undo(), self.game_state.undo)
+
+    def redo_last_action(self, instance):
+        """
+        Redo an action the current human player undid this turn.
+        """
+        self._step_history(self.game_state.journal.peek_redo(), self.game_state.redo)
+
+    def _step_history(self, entry, step):
+        current_player_name = self.game_state.players[self.game_state.current_player_index]
+        if self.game_state.get_player_type(current_player_name) in AI_PLAYER_TYPES or self.game_over_flag:
+            return
+        # Earlier turns (and the end_turn that closed them) stay committed
+        if entry is None or entry.turn != self.game_state.turn_counter or entry.label == "end_turn":
+            self.info_label.text = "Nothing to undo or redo this turn."
+            return
+
+        success, message = step()  # Changed cells are redrawn by handle_game_state_update
+        self.info_label.text = message
+
+        # The player may have moved again or taken their move back
+        self.disable_grid_buttons()
+        has_moved = self.game_state.player_has_moved[current_player_name]
+        if not has_moved:
+            self.enable_grid_buttons()
+        self.end_turn_button.disabled = not has_moved
+        self.update_player_info()
+
     def next_turn(self, instance=None):
         """
         Proceed to the next player's turn.
@@ -830,11 +937,15 @@ class GameScreen(Screen):
         player_type = self.game_state.get_player_type(current_player_name)
         self.info_label.text = f"{current_player_name}'s Turn ({player_type})"
 
-        if player_type == "AI (Easy)":
+        if player_type in AI_PLAYER_TYPES:
             self.info_label.text += " - Thinking..."
             self.disable_grid_buttons() # Stops blinking, disables all grid buttons
             self.end_turn_button.disabled = True
-            Clock.schedule_once(self.run_ai_turn, 1.0) # 1 second delay
+            if self.fast_forward:
+                self.info_label.text = "Fast-forwarding AI turns..."
+                self.ai_turn_event = Clock.schedule_once(self.run_ai_stretch, 0) # No delay between AI turns
+            else:
+                self.ai_turn_event = Clock.schedule_once(self.run_ai_turn, 1.0) # 1 second delay
         else: # Human player
             self.enable_grid_buttons()
             self.end_turn_button.disabled = True # Will be enabled once human makes a move
@@ -845,12 +956,101 @@ class GameScreen(Screen):
 
     def run_ai_turn(self, dt):
         """
-        Executes an AI player's turn.
+        Starts an AI player's turn: the move is chosen in a background thread on a snapshot
+        of the game, so rendering and input carry on while the AI thinks.
+        apply_ai_move plays it once it comes back.
         """
+        self.ai_turn_event = None
         current_player_name = self.game_state.players[self.game_state.current_player_index]
-        selected_cell, action_message = self.game_state.ai_take_turn(current_player_name)
+        policy = self.move_policies[self.game_state.get_player_type(current_player_name)]
+        self.ai_request = AIMoveRequest(policy, self.game_state, current_player_name, self._deliver_ai_move).start()
 
-        self.info_label.text = action_message # Display AI action
+    def _deliver_ai_move(self, request, selected_cell, error):
+        # Called on the worker thread: hand the result over to the Kivy main thread
+        Clock.schedule_once(lambda dt: self.apply_ai_move(request, selected_cell, error), 0)
+
+    def run_ai_stretch(self, dt):
+        """
+        Fast-forward: resolves every AI turn up to the next human turn (or the turn limit)
+        in a background thread. apply_ai_stretch plays them once they come back.
+        """
+        self.ai_turn_event = None
+        self.ai_request = AIStretchRequest(self.move_policies, self.game_state, self.game_turn_length,
+                                           self._deliver_ai_stretch).start()
+
+    def _deliver_ai_stretch(self, request, moves, error):
+        # Called on the worker thread: hand the result over to the Kivy main thread
+        Clock.schedule_once(lambda dt: self.apply_ai_stretch(request, moves, error), 0)
+
+    def apply_ai_stretch(self, request, moves, error):
+        """
+        Plays the AI turns an AIStretchRequest resolved, on the main thread, without the
+        per-turn delay, animations and sidebar updates. The turns form one batch, so the
+        grid is redrawn from a single merged diff, then next_turn hands over to the human
+        (or ends the game).
+        """
+        if request is not self.ai_request or request.cancelled or self.game_over_flag \
+                or request.turn != self.game_state.turn_counter:
+            return
+        self.ai_request = None
+        if error is not None or not moves:
+            if error is not None:
+                print(f"AI Error: fast-forward failed ({error!r}); playing turns one at a time.")
+            self.run_ai_turn(0)
+            return
+
+        played = 0
+        with self.game_state.batch_updates():
+            for player, selected_cell in moves:
+                if player != self.game_state.players[self.game_state.current_player_index]:
+                    break  # The live game went a different way; play the rest normally
+                if selected_cell is not None and self.game_state.legal_move_at(selected_cell) is None:
+                    selected_cell = None
+                self.game_state.ai_take_turn(player, selected_cell)
+                self.game_state.expand_into_adjacent_diamonds(player)
+                success, end_turn_message = self.game_state.end_turn()
+                if not success:
+                    print(f"AI Error: {end_turn_message}")
+                    break
+                played += 1
+
+        print(f"Fast-forward: played {played} AI turns.")
+        self.next_turn()
+        if not self.game_over_flag:
+            self.info_label.text = f"Fast-forwarded {played} AI turns. " + self.info_label.text
+
+    def cancel_ai_turn(self):
+        """
+        Abandons a scheduled or running AI turn (restart, leaving the game, game over).
+        """
+        if self.ai_turn_event is not None:
+            self.ai_turn_event.cancel()
+            self.ai_turn_event = None
+        if self.ai_request is not None:
+            self.ai_request.cancel()
+            self.ai_request = None
+
+    def apply_ai_move(self, request, selected_cell, error):
+        """
+        Plays the move an AIMoveRequest chose, on the main thread, then ends the AI's turn.
+        Results of cancelled or superseded requests are dropped.
+        """
+        if request is not self.ai_request or request.cancelled or self.game_over_flag \
+                or request.turn != self.game_state.turn_counter:
+            return
+        self.ai_request = None
+        current_player_name = request.player
+        if error is not None:
+            print(f"AI Error: {current_player_name} failed to choose a move ({error!r}); playing a random cell.")
+            selected_cell = None
+        elif selected_cell is not None and self.game_state.legal_move_at(selected_cell) is None:
+            selected_cell = None  # No longer empty; let ai_take_turn draw a random cell
+
+        # Batch the AI move and the diamond absorption after it into one board update
+        with self.game_state.batch_updates():
+            selected_cell, action_message = self.game_state.ai_take_turn(current_player_name, selected_cell)
+            self.info_label.text = action_message # Display AI action
+            self.expand_companies_into_adjacent_diamonds() # Important after AI move
 
         # Visual Update for AI's move AND Animation
         if selected_cell is not None and \
@@ -889,7 +1089,6 @@ class GameScreen(Screen):
         # Nothing specific to do for visuals if selected_cell is None.
 
         self.update_player_info()
-        self.expand_companies_into_adjacent_diamonds() # Important after AI move
         self.disable_grid_buttons() # Ensure grid is disabled after AI move
 
         success, end_turn_message = self.game_state.end_turn()
@@ -942,13 +1141,8 @@ class GameScreen(Screen):
         """
         current_player = self.game_state.players[self.game_state.current_player_index]
         cash = self.game_state.player_wealth[current_player]
-        holdings_value = 0
-        for company, num_shares in self.game_state.player_shares[current_player].items():
-            if company in self.game_state.company_info:
-                share_value = self.game_state.company_info[company]["value"]
-                total_share_value = share_value * num_shares
-                holdings_value += total_share_value
-        total_wealth = cash + holdings_value
+        holdings_value = self.game_state.holdings_value[current_player]
+        total_wealth = self.game_state.net_worth(current_player)
 
         content = BoxLayout(orientation='vertical', spacing=10, padding=10)
 
@@ -1166,12 +1360,8 @@ class GameScreen(Screen):
         """
         Enable a random selection of empty squares for the next turn.
         """
-        empty_squares = [
-            (r, c)
-            for r in range(self.grid_size[0]) # Iterate through rows
-            for c in range(self.grid_size[1]) # Iterate through columns
-            if isinstance(self.grid_buttons[r][c], ImageButton) and self.grid_buttons[r][c].source == ''
-        ]
+        # Every empty square, already classified by GameState; the press handler reuses the same cache
+        empty_squares = list(self.game_state.legal_moves())
         if not empty_squares:
             self.info_label.text = "No available squares to enable."
             return
@@ -1196,6 +1386,19 @@ class GameScreen(Screen):
             animation.start(button)
             self.blinking_animations.append(animation)
 
+    def save_game_record(self):
+        """
+        Keeps the finished game's record in game_record.RECORDS_DIR.
+        """
+        recorder = self.game_state.recorder
+        if recorder is None:
+            return
+        try:
+            path = recorder.save()
+            print(f"Game record saved to {path} ({len(recorder.to_bytes())} bytes).")
+        except OSError as e:
+            print(f"Warning: Could not save the game record: {e}")
+
     def end_game(self):
         """
         Calculate final wealth and determine the winner.
@@ -1204,19 +1407,15 @@ class GameScreen(Screen):
             return
 
         self.game_over_flag = True
+        self.cancel_ai_turn()
+        self.save_game_record()
 
-        player_wealth_summary = {
-            player_name: self.game_state.player_wealth[player_name] for player_name in self.game_state.players
-        }
-        for player_name, shares in self.game_state.player_shares.items():
-            for company, num_shares in shares.items():
-                if company in self.game_state.company_info: # Check if company still exists
-                    company_value = self.game_state.company_info[company]["value"]
-                    player_wealth_summary[player_name] += num_shares * company_value
+        standings = self.game_state.standings()
+        player_wealth_summary = dict(standings)
 
         winner_name = None # This will be the display name of the winner
-        if player_wealth_summary:
-            winner_name = max(player_wealth_summary, key=player_wealth_summary.get)
+        if standings:
+            winner_name = standings[0][0]
 
         end_game_messages = []
         if winner_name:
@@ -1258,7 +1457,6 @@ class GameScreen(Screen):
         user_profile = self.player_profile_objects.get(current_player_name) # This can be None for AI
 
         cash = self.game_state.player_wealth[current_player_name]
-        holdings_value = 0
 
         self.holdings_display_container.clear_widgets() # Clear previous holdings
 
@@ -1267,7 +1465,6 @@ class GameScreen(Screen):
             if company in self.game_state.company_info:
                 share_value = self.game_state.company_info[company]['value']
                 total_share_value = share_value * num_shares
-                holdings_value += total_share_value
 
                 holding_row_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=int(Window.height * 0.04))
                 
@@ -1292,9 +1489,9 @@ class GameScreen(Screen):
                 
                 self.holdings_display_container.add_widget(holding_row_layout)
 
-        total_wealth = cash + holdings_value
+        total_wealth = self.game_state.net_worth(current_player_name)
 
-        if current_player_type == "AI (Easy)" or user_profile is None:
+        if current_player_type in AI_PLAYER_TYPES or user_profile is None:
             self.current_player_label.text = f"[b]Current Player:[/b] {current_player_name} (AI)"
             # Optionally, hide or change text for profile-specific parts of the sidebar not covered
             # For example, if there was a dedicated "High Score" label, it would be set to "N/A" here.
@@ -1347,6 +1544,15 @@ class GameScreen(Screen):
         fullscreen_setting_layout.add_widget(self.fullscreen_switch)
         content_layout.add_widget(fullscreen_setting_layout)
 
+        # Fast-forward Toggle Setting
+        fast_forward_setting_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=44)
+        fast_forward_label = Label(text="Fast-forward AI turns:", size_hint_x=0.7)
+        fast_forward_switch = Switch(active=self.fast_forward, size_hint_x=0.3)
+        fast_forward_switch.bind(active=self.on_fast_forward_toggle)
+        fast_forward_setting_layout.add_widget(fast_forward_label)
+        fast_forward_setting_layout.add_widget(fast_forward_switch)
+        content_layout.add_widget(fast_forward_setting_layout)
+
         restart_button = Button(text="Restart Game", size_hint_y=None, height=44)
         restart_button.bind(on_press=self.restart_game_action)
         content_layout.add_widget(restart_button)
@@ -1359,10 +1565,14 @@ class GameScreen(Screen):
         self.settings_popup = Popup(
             title="Settings",
             content=content_layout,
-            size_hint=(0.6, 0.4) # 60% width, 40% height
+            size_hint=(0.6, 0.5) # 60% width, 50% height
         )
         self.settings_popup.open()
 
+    def on_fast_forward_toggle(self, switch_instance, active_state):
+        # Takes effect from the next AI turn; a turn already being computed plays normally
+        self.fast_forward = active_state
+
     def on_fullscreen_toggle(self, switch_instance, active_state):
         if active_state:
             Window.fullscreen = 'auto'
@@ -1378,6 +1588,7 @@ class GameScreen(Screen):
         """
         Action for restarting the game. Navigates to the 'start' screen.
         """
+        self.cancel_ai_turn()
         if hasattr(self, 'settings_popup') and self.settings_popup.parent:
             self.settings_popup.dismiss()
         
@@ -1388,6 +1599,7 @@ class GameScreen(Screen):
         """
         Action for going to the main menu. Navigates to the 'start' screen.
         """
+        self.cancel_ai_turn()
         if hasattr(self, 'settings_popup') and self.settings_popup.parent:
             self.settings_popup.dismiss()
 
@@ -0,0 +1,190 @@
+# headless.py
+#
+# Plays complete games with game_logic alone, without Kivy or a window.
+#
+#   python headless.py --games 500 --grid 28x24 --players 4 --turn-limit 80 --markers 0.1 --seed 1
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from ai_players import MOVE_POLICIES, default_ai_name, easy_move, reproducible_move_policies
+from event_log import OFF, EventLog
+from game_logic import GameState, random_o_marker_locations
+from game_record import FILE_EXTENSION, GameRecorder
+
+DEFAULT_GRID_SIZE = (28, 24)
+DEFAULT_TURN_LIMIT = 80
+DEFAULT_MARKER_PERCENTAGE = 0.1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class GameResult:
+    """
+    Outcome of one headless game.
+    """
+    __slots__ = ('seed', 'players', 'wealth', 'winner', 'turns', 'moves', 'mergers', 'record')
+
+    def __init__(self, seed, players, wealth, winner, turns, moves, mergers, record=None):
+        self.seed = seed
+        self.players = players  # Display names in seat order
+        self.wealth = wealth    # Player -> final cash plus share value
+        self.winner = winner
+        self.turns = turns
+        self.moves = moves
+        self.mergers = mergers  # Companies acquired in mergers during the game
+        self.record = record    # Binary game record (see game_record.py), if one was kept
+
+    def __repr__(self):
+        return f"GameResult(seed={self.seed!r}, winner={self.winner!r}, turns={self.turns}, wealth={self.wealth!r})"
+
+
+def ai_player_configurations(count, player_types=None):
+    """
+    Returns player configurations for `count` AI seats, named like the start screen does.
+
+    Parameters:
+        count (int): Number of seats.
+        player_types (list): Type of each seat (default: all "AI (Easy)").
+    """
+    player_types = player_types or ["AI (Easy)"] * count
+    return [
+        {'name': default_ai_name(i, player_type), 'profile_username': None, 'type': player_type,
+         'is_new_profile': False}
+        for i, player_type in enumerate(player_types[:count], start=1)
+    ]
+
+
+def seat_types(count, hard_seats=0, medium_seats=0):
+    """
+    Returns the player types of `count` seats: `hard_seats` "AI (Hard)" seats first,
+    then `medium_seats` "AI (Medium)" seats, and "AI (Easy)" for the rest.
+    """
+    types = ["AI (Hard)"] * hard_seats + ["AI (Medium)"] * medium_seats
+    return (types + ["AI (Easy)"] * count)[:count]
+
+
+def new_game(player_configurations, grid_size, marker_percentage, rng):
+    """
+    Sets up a GameState the way GameScreen.initialize_game does, minus the widgets.
+    Journaling and logging are off: a headless game is never undone or read live.
+    """
+    game_state = GameState(player_configurations, grid_size, SCRIPT_DIR)
+    game_state.log = EventLog(level=OFF)
+    game_state.journal = None
+    game_state.rng = rng
+    game_state.set_initial_o_marker_locations(random_o_marker_locations(grid_size, marker_percentage, rng))
+    return game_state
+
+
+def play_turn(game_state, move_policies=MOVE_POLICIES):
+    """
+    Plays the current player's turn: their move, the diamond absorption that follows it, and end_turn.
+
+    Returns:
+        tuple: (selected_cell, message) from the move, selected_cell None if the board was full.
+    """
+    player = game_state.players[game_state.current_player_index]
+    # Types without a policy (e.g. "Human") are played by easy_move
+    move = move_policies.get(game_state.get_player_type(player), easy_move)
+    with game_state.batch_updates():
+        selected_cell, message = move(game_state, player)
+        game_state.expand_into_adjacent_diamonds(player)
+    success, end_turn_message = game_state.end_turn()
+    if not success:
+        raise RuntimeError(f"{player} did not complete a move: {message} / {end_turn_message}")
+    return selected_cell, message
+
+
+def play_game(player_configurations, grid_size=DEFAULT_GRID_SIZE, turn_limit=DEFAULT_TURN_LIMIT,
+              marker_percentage=DEFAULT_MARKER_PERCENTAGE, seed=None, move_policies=None, record=False):
+    """
+    Plays one complete game and returns its GameResult.
+
+    The game ends, as in GameScreen.next_turn, once turn_counter reaches turn_limit, or
+    earlier when the board is full. Every random choice (markers and AI moves) comes from
+    a random.Random(seed), and by default AI (Hard) seats search a fixed number of
+    rollouts with a fresh transposition table (reproducible_move_policies), so a seed
+    replays the same game.
+
+    Parameters:
+        player_configurations (list): Player dicts as built by the start screen.
+        grid_size (tuple): (rows, cols).
+        turn_limit (int): Number of turns (one move per player turn) to play.
+        marker_percentage (float): Fraction of cells holding an 'O' marker.
+        seed: Seed for the game's random.Random (None for a fresh random game).
+        move_policies (dict): Player type -> move function, see MOVE_POLICIES (default:
+            reproducible_move_policies(), new for this game).
+        record (bool): Keep a binary game record of the game in GameResult.record.
+
+    Returns:
+        GameResult: Final wealth per player, the winner, and the turns, moves and mergers played.
+    """
+    if move_policies is None:
+        move_policies = reproducible_move_policies()
+    rng = random.Random(seed)
+    game_state = new_game(player_configurations, grid_size, marker_percentage, rng)
+    if record:
+        game_state.recorder = GameRecorder(game_state, seed=seed, turn_limit=turn_limit)
+    moves = 0
+    while game_state.turn_counter < turn_limit:
+        selected_cell, _ = play_turn(game_state, move_policies)
+        if selected_cell is None:
+            break  # Board full: nobody can move any more
+        moves += 1
+
+    standings = game_state.standings()
+    wealth = game_state.wealth_summary()
+    winner = standings[0][0] if standings else None
+    return GameResult(seed, list(game_state.players), wealth, winner, game_state.turn_counter, moves,
+                      game_state.merger_count, game_state.recorder.to_bytes() if record else None)
+
+
+def parse_grid_size(text):
+    rows, _, cols = text.lower().partition('x')
+    return int(rows), int(cols)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play complete Cosmic Conglomerate games without a window.")
+    parser.add_argument('--games', type=int, default=100, help="number of games to play")
+    parser.add_argument('--players', type=int, default=4, help="number of AI players (2-4)")
+    parser.add_argument('--hard-seats', type=int, default=0, help="how many of the first seats are AI (Hard)")
+    parser.add_argument('--medium-seats', type=int, default=0, help="how many seats after those are AI (Medium)")
+    parser.add_argument('--grid', type=parse_grid_size, default=DEFAULT_GRID_SIZE, help="grid size as ROWSxCOLS")
+    parser.add_argument('--turn-limit', type=int, default=DEFAULT_TURN_LIMIT)
+    parser.add_argument('--markers', type=float, default=DEFAULT_MARKER_PERCENTAGE, help="'O' marker fraction")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the first game; game i uses seed + i")
+    parser.add_argument('--record-dir', default=None, help="write a binary game record of every game here")
+    args = parser.parse_args(argv)
+    if args.record_dir:
+        os.makedirs(args.record_dir, exist_ok=True)
+
+    player_types = seat_types(args.players, args.hard_seats, args.medium_seats)
+    player_configurations = ai_player_configurations(args.players, player_types)
+    wins = {p['name']: 0 for p in player_configurations}
+    total_moves = 0
+    start = time.perf_counter()
+    for game_number in range(args.games):
+        seed = None if args.seed is None else args.seed + game_number
+        result = play_game(player_configurations, args.grid, args.turn_limit, args.markers, seed,
+                           record=bool(args.record_dir))
+        if args.record_dir:
+            with open(os.path.join(args.record_dir, f"game_{game_number:06d}{FILE_EXTENSION}"), 'wb') as record_file:
+                record_file.write(result.record)
+        wins[result.winner] += 1
+        total_moves += result.moves
+    elapsed = time.perf_counter() - start
+
+    print(f"Played {args.games} games on {args.grid[0]}x{args.grid[1]} in {elapsed:.2f}s")
+    print(f"{args.games / elapsed:10.1f} games/sec")
+    print(f"{total_moves / elapsed:10.0f} moves/sec")
+    for player, count in wins.items():
+        print(f"  {player}: {count} wins ({100 * count / args.games:.1f}%)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
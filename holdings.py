@@ -0,0 +1,223 @@
+# holdings.py
+#
+# Share holdings as a dense players x companies matrix of share counts, plus the
+# name-keyed player_shares views GameState exposes over it.
+
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+from zobrist import holding_key
+
+
+class HoldingsMatrix:
+    """
+    Dense players x companies matrix of share counts.
+
+    Players are numbered by seat (their index in GameState.players) and companies by
+    company id: the companies given at construction in order, then any other name the
+    first time company_id() sees it. Counts live in one flat int64 array stored company
+    by company, so a company's column is a contiguous run of one count per player and a
+    new company appends a column. Shares double at every split, so a long game can
+    outgrow int64; the counts then move to a plain list of Python ints.
+
+    Whole-column operations are what the rules need: a share split doubles one column
+    (scale_column) and a merger adds the acquired company's column onto the acquirer's
+    (add_column).
+
+    Every count is written through set() or _write(), which keep `zobrist`, the XOR of
+    zobrist.holding_key over all holdings, up to date in O(1) per count written.
+
+    Usage:
+        holdings = HoldingsMatrix(players, COMPANY_NAMES)
+        holdings.add(0, holdings.company_id("Pacifica"), 5)
+        holdings.scale_column(holdings.company_id("Pacifica"), 2)
+        player_shares = SharesByPlayer(holdings)  # {player: {company: shares}} view
+    """
+    __slots__ = ('players', 'player_ids', 'company_names', 'company_ids', 'counts', 'zobrist', '_player_count')
+
+    def __init__(self, players, company_names=()):
+        self.players = players
+        self.player_ids = {name: player_id for player_id, name in enumerate(players)}
+        self.company_names = list(company_names)
+        self.company_ids = {name: company_id for company_id, name in enumerate(self.company_names)}
+        self._player_count = len(players)
+        self.counts = array('q', bytes(8 * self._player_count * len(self.company_names)))
+        self.zobrist = 0
+
+    def copy(self):
+        clone = HoldingsMatrix.__new__(HoldingsMatrix)
+        clone.players = self.players
+        clone.player_ids = self.player_ids
+        clone.company_names = self.company_names.copy()
+        clone.company_ids = self.company_ids.copy()
+        clone._player_count = self._player_count
+        clone.counts = self.counts[:]
+        clone.zobrist = self.zobrist
+        return clone
+
+    def company_id(self, company_name):
+        """
+        Returns the company's id, adding an empty column for a name not seen before.
+        """
+        company_id = self.company_ids.get(company_name)
+        if company_id is None:
+            company_id = self.company_ids[company_name] = len(self.company_names)
+            self.company_names.append(company_name)
+            self.counts.extend([0] * self._player_count)
+        return company_id
+
+    def get(self, player_id, company_id):
+        return self.counts[company_id * self._player_count + player_id]
+
+    def set(self, player_id, company_id, shares):
+        offset = company_id * self._player_count + player_id
+        old_shares = self.counts[offset]
+        if old_shares != shares:
+            self._rehash(player_id, self.company_names[company_id], old_shares, shares)
+        try:
+            self.counts[offset] = shares
+        except OverflowError:
+            self.counts = list(self.counts)
+            self.counts[offset] = shares
+
+    def add(self, player_id, company_id, shares):
+        self.set(player_id, company_id, self.get(player_id, company_id) + shares)
+
+    def column(self, company_id):
+        """
+        Returns a copy of the company's column: every player's share count, by seat.
+        """
+        start = company_id * self._player_count
+        return self.counts[start:start + self._player_count]
+
+    def scale_column(self, company_id, factor):
+        """
+        Multiplies every player's shares in the company by factor (a share split).
+        """
+        start = company_id * self._player_count
+        self._write(start, [shares * factor for shares in self.counts[start:start + self._player_count]])
+
+    def add_column(self, from_company_id, to_company_id):
+        """
+        Adds every player's shares in one company to their shares in another and empties
+        the first (a merger's share transfer).
+        """
+        player_count = self._player_count
+        source = from_company_id * player_count
+        target = to_company_id * player_count
+        self._write(target, [a + b for a, b in zip(self.counts[target:target + player_count],
+                                                   self.counts[source:source + player_count])])
+        self._write(source, [0] * player_count)
+
+    def _write(self, start, values):
+        # Writes a run of counts within one column, moving to Python ints if one no longer fits in int64
+        company_id, first_player = divmod(start, self._player_count)
+        company_name = self.company_names[company_id]
+        for player_id, old_shares, shares in zip(range(first_player, self._player_count),
+                                                 self.counts[start:start + len(values)], values):
+            if old_shares != shares:
+                self._rehash(player_id, company_name, old_shares, shares)
+        if isinstance(self.counts, array):
+            try:
+                self.counts[start:start + len(values)] = array('q', values)
+                return
+            except OverflowError:
+                self.counts = list(self.counts)
+        self.counts[start:start + len(values)] = values
+
+    def _rehash(self, player_id, company_name, old_shares, shares):
+        self.zobrist ^= holding_key(player_id, company_name, old_shares) ^ holding_key(player_id, company_name, shares)
+
+    def row_items(self, player_id):
+        """
+        Returns (company_name, shares) for every company the player holds shares in, by company id.
+        """
+        counts = self.counts
+        player_count = self._player_count
+        return [(name, counts[offset]) for name, offset in
+                zip(self.company_names, range(player_id, len(counts), player_count)) if counts[offset]]
+
+    def clear_row(self, player_id):
+        for company_id in range(len(self.company_names)):
+            if self.get(player_id, company_id):
+                self.set(player_id, company_id, 0)
+
+
+class PlayerShares(MutableMapping):
+    """
+    One player's row of a HoldingsMatrix as a {company_name: shares} mapping. Companies
+    the player holds no shares in are absent, and setting a count of 0 removes one.
+    """
+    __slots__ = ('_holdings', '_player_id')
+
+    def __init__(self, holdings, player_id):
+        self._holdings = holdings
+        self._player_id = player_id
+
+    def __getitem__(self, company_name):
+        company_id = self._holdings.company_ids.get(company_name)
+        if company_id is not None:
+            shares = self._holdings.get(self._player_id, company_id)
+            if shares:
+                return shares
+        raise KeyError(company_name)
+
+    def __setitem__(self, company_name, shares):
+        holdings = self._holdings
+        holdings.set(self._player_id, holdings.company_id(company_name), shares)
+
+    def __delitem__(self, company_name):
+        self[company_name]  # KeyError unless the player holds shares in it
+        self._holdings.set(self._player_id, self._holdings.company_ids[company_name], 0)
+
+    def __contains__(self, company_name):
+        company_id = self._holdings.company_ids.get(company_name)
+        return company_id is not None and self._holdings.get(self._player_id, company_id) != 0
+
+    def __iter__(self):
+        return iter([name for name, _ in self._holdings.row_items(self._player_id)])
+
+    def __len__(self):
+        return len(self._holdings.row_items(self._player_id))
+
+    def items(self):
+        # One pass over the row instead of a lookup per key
+        return self._holdings.row_items(self._player_id)
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+class SharesByPlayer(Mapping):
+    """
+    GameState.player_shares: {player: PlayerShares} over a HoldingsMatrix, read and
+    written like the {player: {company_name: shares}} dict it replaces.
+    """
+    __slots__ = ('_holdings', '_rows')
+
+    def __init__(self, holdings):
+        self._holdings = holdings
+        self._rows = {player: PlayerShares(holdings, player_id) for player, player_id in holdings.player_ids.items()}
+
+    def __getitem__(self, player):
+        return self._rows[player]
+
+    def __setitem__(self, player, shares):
+        # Replaces the player's whole row, e.g. player_shares[player] = {company: 10}
+        row = self._rows[player]
+        shares = dict(shares)  # Read before clearing, in case shares is this row
+        self._holdings.clear_row(self._holdings.player_ids[player])
+        for company_name, count in shares.items():
+            row[company_name] = count
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __repr__(self):
+        return repr({player: row.copy() for player, row in self._rows.items()})
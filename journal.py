@@ -0,0 +1,98 @@
+# journal.py
+
+from collections import deque
+
+MISSING = object()  # Ledger value of a key that did not exist (e.g. shares a player did not hold)
+
+
+class JournalEntry:
+    """
+    The inverse deltas of one journaled GameState action.
+
+    - label: the action that produced it ("create_new_company", "buy_shares", "move", ...).
+    - turn: GameState.turn_counter when the action started.
+    - records: board undo records (see board.py), oldest first.
+    - ledger_changes: (key, old_value, new_value) for every changed bookkeeping value
+      (wealth, shares, company info, available names, turn pointer and counters).
+    """
+    __slots__ = ('label', 'turn', 'records', 'ledger_changes')
+
+    def __init__(self, label, turn, records, ledger_changes):
+        self.label = label
+        self.turn = turn
+        self.records = records
+        self.ledger_changes = ledger_changes
+
+    def __repr__(self):
+        return (f"JournalEntry({self.label!r}, turn={self.turn}, records={len(self.records)}, "
+                f"ledger_changes={len(self.ledger_changes)})")
+
+
+class Journal:
+    """
+    Bounded undo / redo history of JournalEntry objects.
+
+    At most `limit` entries are kept for undo; the oldest are dropped first, so memory
+    stays bounded however long the game runs. Recording a new entry clears the redo
+    history, as in any editor.
+    """
+
+    def __init__(self, limit=256):
+        self.limit = limit
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+
+    def __len__(self):
+        return len(self._undo)
+
+    def record(self, entry):
+        self._undo.append(entry)
+        self._redo.clear()
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def peek_undo(self):
+        """
+        Returns the entry undo() would revert next, or None.
+        """
+        return self._undo[-1] if self._undo else None
+
+    def peek_redo(self):
+        """
+        Returns the entry redo() would reapply next, or None.
+        """
+        return self._redo[-1] if self._redo else None
+
+    def pop_undo(self):
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        return entry
+
+    def pop_redo(self):
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        return entry
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+
+def diff_ledgers(before, after):
+    """
+    Returns the (key, old_value, new_value) changes between two ledger dicts.
+    Keys present in only one of them get MISSING on the other side.
+    """
+    changes = []
+    for key, old_value in before.items():
+        new_value = after.get(key, MISSING)
+        if new_value != old_value:
+            changes.append((key, old_value, new_value))
+    for key, new_value in after.items():
+        if key not in before:
+            changes.append((key, MISSING, new_value))
+    return changes
@@ -0,0 +1,154 @@
+# price_history.py
+#
+# Per-company share price history in fixed-capacity ring buffers with turn stamps.
+
+from array import array
+from collections.abc import Mapping
+
+DEFAULT_CAPACITY = 64  # Prices kept per company
+
+
+class PriceRing:
+    """
+    The last `capacity` share prices of one company, each stamped with the turn it was
+    set in. Prices and turns live in two fixed-size arrays written round-robin, so memory
+    stays the same however long the game runs.
+
+    Entries are numbered from 0 as they are appended and entry n sits in slot
+    n % capacity. `end` is the number appended so far and `start` the first entry of the
+    company's current life (a company name reused after a merger starts over). Undo moves
+    both back; `_high`, the furthest `end` has reached, tells which older entries the
+    round-robin has overwritten since.
+    """
+    __slots__ = ('capacity', 'prices', 'turns', 'start', 'end', '_high')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.prices = array('q', bytes(8 * capacity))
+        self.turns = array('q', bytes(8 * capacity))
+        self.start = 0
+        self.end = 0
+        self._high = 0
+
+    def copy(self):
+        duplicate = PriceRing.__new__(PriceRing)
+        duplicate.capacity = self.capacity
+        duplicate.prices = array('q', self.prices)
+        duplicate.turns = array('q', self.turns)
+        duplicate.start = self.start
+        duplicate.end = self.end
+        duplicate._high = self._high
+        return duplicate
+
+    def _first(self):
+        return max(self.start, self._high - self.capacity)
+
+    def __len__(self):
+        return max(self.end - self._first(), 0)
+
+    def append(self, turn, price):
+        """
+        Records price as set in turn, unless it equals the latest price.
+
+        Returns:
+            bool: True if an entry was added.
+        """
+        if len(self) and self.prices[(self.end - 1) % self.capacity] == price:
+            return False
+        slot = self.end % self.capacity
+        self.prices[slot] = price
+        self.turns[slot] = turn
+        self.end += 1
+        if self.end > self._high:
+            self._high = self.end
+        return True
+
+    def latest(self):
+        """
+        Returns the latest (turn, price), or None if there is none.
+        """
+        if not len(self):
+            return None
+        slot = (self.end - 1) % self.capacity
+        return self.turns[slot], self.prices[slot]
+
+    def entries(self):
+        """
+        Returns the (turn, price) entries, oldest first.
+        """
+        capacity = self.capacity
+        slots = [entry % capacity for entry in range(self._first(), self.end)]
+        return [(self.turns[slot], self.prices[slot]) for slot in slots]
+
+    def __repr__(self):
+        return f"PriceRing({self.entries()!r})"
+
+
+class PriceHistory(Mapping):
+    """
+    GameState.price_history: {company_name: PriceRing}.
+
+    GameState records a company's price whenever update_company_value, a share split or
+    a merger sets it. A game and its clones share rings copy-on-write, like the company
+    tile sets, so clone() copies one dict rather than every ring. Each ring's (start, end)
+    is part of the GameState undo ledger.
+
+    Usage:
+        for turn, price in game_state.price_history["Pacifica"].entries():
+            ...
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._rings = {}
+        self._owned = {}  # company name -> False while its ring is shared with a copy
+
+    def __getitem__(self, company_name):
+        return self._rings[company_name]
+
+    def __iter__(self):
+        return iter(self._rings)
+
+    def __len__(self):
+        return len(self._rings)
+
+    def copy(self):
+        duplicate = PriceHistory(self.capacity)
+        duplicate._rings = self._rings.copy()
+        self._owned = dict.fromkeys(self._rings, False)
+        duplicate._owned = self._owned.copy()
+        return duplicate
+
+    def _writable(self, company_name):
+        # Copy-on-write: a ring shared with a copy is duplicated before its first change
+        ring = self._rings.get(company_name)
+        if ring is None:
+            ring = self._rings[company_name] = PriceRing(self.capacity)
+            self._owned[company_name] = True
+        elif not self._owned[company_name]:
+            ring = self._rings[company_name] = ring.copy()
+            self._owned[company_name] = True
+        return ring
+
+    def record(self, company_name, turn, price):
+        """
+        Records the company's price as set in turn (skipped if it is unchanged).
+        """
+        ring = self._rings.get(company_name)
+        if ring is not None and len(ring) and ring.prices[(ring.end - 1) % ring.capacity] == price:
+            return False
+        return self._writable(company_name).append(turn, price)
+
+    def restart(self, company_name):
+        """
+        Starts an empty history for a company founded under a name used before.
+        """
+        ring = self._writable(company_name)
+        ring.start = ring.end
+
+    def restore(self, company_name, state):
+        # Undo / redo: state is a ring's (start, end) from the ledger
+        ring = self._writable(company_name)
+        ring.start, ring.end = state
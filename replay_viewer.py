@@ -0,0 +1,121 @@
+# replay_viewer.py
+#
+# Seeking through a finished game record: keyframe positions every few turns, so a jump
+# to any turn replays only the records since the nearest keyframe.
+
+import io
+
+from board import COMPANY
+from game_record import END_TURN, GameRecordHeader, apply_record, read_records
+
+DEFAULT_KEYFRAME_INTERVAL = 8  # Turns between keyframes
+
+
+class ReplayTimeline:
+    """
+    A game record indexed for seeking, behind GameScreen's replay mode.
+
+    Loading plays the record through once, checking its checkpoints, and keeps a
+    GameState.clone() of the game every `keyframe_interval` turns along with the record
+    offset at which every turn ends. seek(turn) then starts from the nearest keyframe at
+    or before the turn, or from the position on show when that is closer, and applies
+    only the records in between. A seek therefore replays fewer than keyframe_interval
+    turns however long the game is.
+
+    seek() returns every cell that differs from the position previously on show as one
+    list of (coords, company_name) entries, the format GameState callbacks receive.
+
+    Usage:
+        timeline = ReplayTimeline(data)
+        updated_entries = timeline.seek(40)
+        game_screen.handle_game_state_update(updated_entries)
+        game_state = timeline.game_state  # The game after turn 40
+    """
+
+    def __init__(self, source, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, verify=True):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+        stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+        self.header = GameRecordHeader.read(stream)
+        self.keyframe_interval = keyframe_interval
+        self._records = list(read_records(stream))
+
+        game_state = self.header.new_game()
+        self._turn_ends = [0]  # Turn -> records played by the end of it
+        self._keyframes = [(0, game_state.clone())]  # (records played, position) every keyframe_interval turns
+        for played, record in enumerate(self._records, 1):
+            apply_record(game_state, record, verify)
+            if record[0] == END_TURN:
+                self._turn_ends.append(played)
+                if game_state.turn_counter % keyframe_interval == 0:
+                    self._keyframes.append((played, game_state.clone()))
+        self._turn_ends[-1] = len(self._records)  # The last turn keeps any trades made after it
+        self.last_turn = len(self._turn_ends) - 1
+
+        self._updates = []
+        self.turn = 0
+        self._played = 0
+        self.game_state = self._working_copy(self._keyframes[0][1])
+
+    @property
+    def o_marker_locations(self):
+        """
+        The recorded game's 'O' marker cells, as a set of (row, col).
+        """
+        return set(self.game_state.initial_o_marker_locations)
+
+    def seek(self, turn):
+        """
+        Moves the replay to the end of the given turn (clamped to 0..last_turn).
+
+        Returns:
+            list: (coords, company_name) entries for the cells that changed on the board.
+        """
+        turn = max(0, min(turn, self.last_turn))
+        end = self._turn_ends[turn]
+        keyframe_played, keyframe = self._keyframes[turn // self.keyframe_interval]
+        if keyframe_played <= self._played <= end:
+            # Play on from the position on show; the batch reports every cell it touches
+            with self.game_state.batch_updates():
+                self._play(self.game_state, end)
+            updated_entries = self._updates[:]
+        else:
+            game_state = self._working_copy(keyframe)
+            self._played = keyframe_played
+            self._play(game_state, end)
+            updated_entries = board_updates(self.game_state, game_state)
+            self.game_state = game_state
+        self._updates.clear()
+        self.turn = turn
+        return updated_entries
+
+    def step(self, turns=1):
+        """
+        Seeks `turns` turns forward (or back, if negative) from the turn on show.
+        """
+        return self.seek(self.turn + turns)
+
+    def _play(self, game_state, end):
+        for record in self._records[self._played:end]:
+            apply_record(game_state, record, verify=False)  # Checked once, when loading
+        self._played = end
+
+    def _working_copy(self, keyframe):
+        # Keyframes stay untouched; the position on show is a clone that reports its cells
+        game_state = keyframe.clone()
+        game_state.register_callback(self._updates.extend)
+        return game_state
+
+
+def board_updates(old_state, new_state):
+    """
+    Returns (coords, company_name) entries for every cell whose contents differ between
+    two positions of the same game, reporting the contents in new_state.
+    """
+    old_company = old_state.company_map.company_at_index
+    new_company = new_state.company_map.company_at_index
+    changed = [
+        index for index, (before, after) in enumerate(zip(old_state.board.cells, new_state.board.cells))
+        if before != after or (after == COMPANY and old_company(index) != new_company(index))
+    ]
+    return new_state.cell_updates(changed)
@@ -0,0 +1,202 @@
+# score_maps.py
+
+import weakref
+
+from board import COMPANY, DIAMOND, EMPTY
+
+SHARE_VALUE_PER_TILE = 100   # Mirrors GameState.update_company_value
+O_MARKER_BONUS = 200
+FOUNDER_SHARES = 5           # Bonus shares for founding a company
+
+
+class CellScoreMap:
+    """
+    Per-cell move features of one game, kept up to date from GameState callback diffs.
+
+    Every empty cell is in at most one of two maps:
+      - frontier: cells next to company tiles -> the indices of those tiles.
+      - found_cells: other cells with an occupied neighbour (where a company can be
+        founded) -> the number of neighbouring diamonds.
+    Every other empty cell can only take a diamond and scores 0.
+
+    A cell's features depend only on its neighbours' states, so each diff entry only
+    refreshes the cell and its neighbours, and entries whose state did not change (the
+    acquired tiles of a merger, which just change company) are skipped. Company names,
+    sizes and values are read through the company map when cells are scored, so a
+    merger or an expansion elsewhere does not touch the maps.
+
+    Usage:
+        score_map = CellScoreMap(game_state)   # Registers itself as a callback
+        score, cell_indices = score_map.best_cells(player)
+    """
+
+    def __init__(self, game_state):
+        # Weak, so a map kept per game elsewhere (e.g. by an AI player) does not keep the game alive
+        self._game_state = weakref.ref(game_state)
+        self.frontier = {}
+        self.found_cells = {}
+        self.rebuild()
+        game_state.register_callback(self.on_update)
+
+    @property
+    def game_state(self):
+        return self._game_state()
+
+    def copy(self, game_state):
+        """
+        Returns a map following game_state, a clone of this map's game taken while the map
+        is in sync with it, without rescoring any cell.
+        """
+        duplicate = CellScoreMap.__new__(CellScoreMap)
+        duplicate._game_state = weakref.ref(game_state)
+        duplicate._states = self._states[:]
+        duplicate.frontier = self.frontier.copy()
+        duplicate.found_cells = self.found_cells.copy()
+        game_state.register_callback(duplicate.on_update)
+        return duplicate
+
+    def rebuild(self):
+        """
+        Recomputes every cell from the board, e.g. after a wholesale change that sent no diff.
+        """
+        board = self.game_state.board
+        self._states = bytearray(board.cells)  # Cell states as of the last diff
+        self.frontier.clear()
+        self.found_cells.clear()
+        for index in range(board.size):
+            self._refresh(index)
+
+    def on_update(self, updated_entries):
+        """
+        GameState callback: refreshes the cells around every cell whose state changed.
+        """
+        board = self.game_state.board
+        cells = board.cells
+        states = self._states
+        neighbours = board.neighbours
+        for coords, _ in updated_entries:
+            index = board.index_of(coords)
+            if index < 0 or states[index] == cells[index]:
+                continue
+            states[index] = cells[index]
+            self._refresh(index)
+            for neighbour in neighbours[index]:
+                self._refresh(neighbour)
+
+    def _refresh(self, index):
+        board = self.game_state.board
+        cells = board.cells
+        self.frontier.pop(index, None)
+        self.found_cells.pop(index, None)
+        if cells[index] != EMPTY:
+            return
+        company_tiles = []
+        diamonds = 0
+        occupied = False
+        for neighbour in board.neighbours[index]:
+            state = cells[neighbour]
+            if state == COMPANY:
+                company_tiles.append(neighbour)
+            elif state == DIAMOND:
+                diamonds += 1
+                occupied = True
+            elif state != EMPTY:
+                occupied = True
+        if company_tiles:
+            self.frontier[index] = tuple(company_tiles)
+        elif occupied:
+            self.found_cells[index] = diamonds
+
+    def in_sync(self):
+        """
+        Returns False if the board changed without a diff (the maps need a rebuild()).
+        """
+        return self._states == self.game_state.board.cells
+
+    def best_cells(self, player):
+        """
+        Scores every frontier and founding cell for player.
+
+        A cell scores the change in the player's share wealth the move would bring, minus
+        the largest such change for any opponent:
+          - expand: the company grows by the tile and the diamonds next to it, and gains
+            the 'O' marker bonus if the cell touches a marker;
+          - merge: as expand for the largest company, with the others' tiles and shares
+            folded into it;
+          - found: the founder's 5 shares at the new company's value.
+
+        Returns:
+            tuple: (best score, list of the cell indices with that score), or (0, []) when
+                   no cell scores.
+        """
+        game_state = self.game_state
+        board = game_state.board
+        company_map = game_state.company_map
+        # Resolve every company node once instead of a find per frontier tile
+        node_names = [company_map.company_of_root(root) for root in company_map.root_ids()]
+        company_ids = board.company_ids
+        o_adjacent = board.o_marker_adjacent
+        cells = board.cells
+        neighbours = board.neighbours
+        player_index = game_state.players.index(player)
+        holdings = game_state.holdings
+
+        # Every frontier cell next to the same companies scores the same for the same new value
+        groups = {}  # frozenset of names -> (size, touches a marker, shares held, share wealth) per player
+        scores = {}  # (names, new value) -> score
+
+        best_score = None
+        best = []
+        for index, tiles in self.frontier.items():
+            names = frozenset([node_names[company_ids[tile]] for tile in tiles])
+            group = groups.get(names)
+            if group is None:
+                group = groups[names] = self._group(names, holdings)
+            size, touches_marker, held, wealth = group
+            grown = 1
+            for neighbour in neighbours[index]:
+                if cells[neighbour] == DIAMOND:
+                    grown += 1
+            new_value = (size + grown) * SHARE_VALUE_PER_TILE
+            if touches_marker or o_adjacent[index]:
+                new_value += O_MARKER_BONUS
+            score = scores.get((names, new_value))
+            if score is None:
+                gains = [shares * new_value - before for shares, before in zip(held, wealth)]
+                own = gains.pop(player_index)
+                score = scores[(names, new_value)] = own - max(gains, default=0)
+            if best_score is None or score > best_score:
+                best_score, best = score, [index]
+            elif score == best_score:
+                best.append(index)
+
+        if game_state.available_company_names:
+            for index, diamonds in self.found_cells.items():
+                value = (1 + diamonds) * SHARE_VALUE_PER_TILE + (O_MARKER_BONUS if o_adjacent[index] else 0)
+                score = FOUNDER_SHARES * value
+                if best_score is None or score > best_score:
+                    best_score, best = score, [index]
+                elif score == best_score:
+                    best.append(index)
+
+        if best_score is None:
+            return 0, []
+        return best_score, best
+
+    def _group(self, names, holdings):
+        # Combined size, marker contact, and per-player shares and share wealth of the companies
+        game_state = self.game_state
+        company_map = game_state.company_map
+        size = 0
+        touches_marker = False
+        held = [0] * len(game_state.players)
+        wealth = [0] * len(game_state.players)
+        for name in names:
+            value = game_state.company_info[name]['value']
+            size += company_map.size_of(name)
+            touches_marker = touches_marker or company_map.o_marker_tiles_of(name) > 0
+            # The company's column of the holdings matrix: every seat's shares in it
+            for seat, count in enumerate(holdings.column(holdings.company_id(name))):
+                held[seat] += count
+                wealth[seat] += count * value
+        return size, touches_marker, held, wealth
@@ -23,6 +23,9 @@ FONT_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'fonts', 'Orbitron
 
 # Import profile manager
 from profile_manager import ProfileManager, UserProfile
+from ai_players import AI_PLAYER_TYPES, default_ai_name
+from game_record import ReplayError, list_game_records
+from replay_viewer import ReplayTimeline
 from kivy.uix.scrollview import ScrollView
 from kivy.metrics import dp
 
@@ -90,7 +93,7 @@ class StartScreen(Screen):
         # Player configuration inputs
         self.player_configs = []
         players_layout = BoxLayout(orientation='vertical', size_hint=(1, 0.3), spacing=10)
-        player_types = ["Off", "Human", "AI (Easy)"]
+        player_types = ["Off", "Human", *AI_PLAYER_TYPES]
         default_configs = [
             {"type": "Human", "name": "Player 1", "profile_text": "<Create New Profile>"},
             {"type": "AI (Easy)", "name": "AI 2 (Easy)", "profile_text": "<N/A for AI>"}, # Player 2 defaults to AI
@@ -154,7 +157,7 @@ class StartScreen(Screen):
                 name_input.text = ""
                 profile_spinner.disabled = True
                 profile_spinner.text = "<Create New Profile>"
-            elif player_default_type == "AI (Easy)":
+            elif player_default_type in AI_PLAYER_TYPES:
                 profile_spinner.disabled = True
                 profile_spinner.text = "<N/A for AI>"
                 name_input.disabled = False # AI names are editable
@@ -264,6 +267,19 @@ class StartScreen(Screen):
         self.manage_profiles_button.bind(on_press=self.show_profile_management_popup)
         layout.add_widget(self.manage_profiles_button)
 
+        # Watch Replay Button
+        self.watch_replay_button = Button(
+            text='Watch Replay',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size=20,
+            background_normal='',
+            background_color=(0.1, 0.5, 0.8, 1),
+            font_name=FONT_PATH
+        )
+        self.watch_replay_button.bind(on_press=self.show_replay_list_popup)
+        layout.add_widget(self.watch_replay_button)
+
         # Start button with rounded corners and custom font
         self.start_button = Button(
             text='Start Game',
@@ -331,13 +347,14 @@ class StartScreen(Screen):
         name_input = config['name_input']
         profile_spinner = config['profile_spinner']
 
-        if text == "AI (Easy)":
+        if text in AI_PLAYER_TYPES:
             profile_spinner.disabled = True
             profile_spinner.text = "<N/A for AI>" # Placeholder for AI
             name_input.disabled = False # Allow AI name editing
-            default_ai_name = f"AI {player_index + 1} (Easy)"
-            if not name_input.text.strip(): # If user cleared it or it's initial setup
-                name_input.text = default_ai_name
+            default_names = [default_ai_name(player_index + 1, ai_type) for ai_type in AI_PLAYER_TYPES]
+            # If user cleared it, it's initial setup, or it is another AI type's default name
+            if not name_input.text.strip() or name_input.text in default_names:
+                name_input.text = default_ai_name(player_index + 1, text)
             name_input.hint_text = "Enter AI Name" # Optional: provide a hint
             # else, keep the user's custom AI name if they typed one already
         elif text == "Human":
@@ -359,7 +376,7 @@ class StartScreen(Screen):
         name_input = config['name_input']
         player_type_spinner = config['type_spinner']
 
-        if player_type_spinner.text == "Off" or player_type_spinner.text == "AI (Easy)":
+        if player_type_spinner.text == "Off" or player_type_spinner.text in AI_PLAYER_TYPES:
             return # AI profile/name is fixed, "Off" means no input
 
         if selected_profile_name == "<Create New Profile>":
@@ -487,10 +504,10 @@ class StartScreen(Screen):
                     'is_new_profile': is_new_profile_flag
                 })
 
-            elif player_type == "AI (Easy)":
+            elif player_type in AI_PLAYER_TYPES:
                 player_game_name = name_input.text.strip()
                 if not player_game_name: # If empty after stripping
-                    player_game_name = f"AI {i + 1} (Easy)" # Default AI name
+                    player_game_name = default_ai_name(i + 1, player_type) # Default AI name
                     name_input.text = player_game_name # Update UI if it was empty
 
                 # AI players do not have user profiles in the same way.
@@ -584,10 +601,10 @@ class StartScreen(Screen):
 
                 # Ensure _on_profile_selection_change is called to update name_input state
                 self._on_profile_selection_change(profile_spinner, profile_spinner.text, p_index)
-            elif type_spinner.text == "AI (Easy)":
+            elif type_spinner.text in AI_PLAYER_TYPES:
                 profile_spinner.text = "<N/A for AI>" # Keep it as N/A
                 profile_spinner.values = ["<N/A for AI>"] # Or ensure this value is in its list if it's dynamic
-                name_input.text = f"AI {p_index + 1} (Easy)"
+                name_input.text = default_ai_name(p_index + 1, type_spinner.text)
             else: # Off
                 profile_spinner.text = "<Create New Profile>"
                 name_input.text = ""
@@ -659,6 +676,44 @@ class StartScreen(Screen):
 
                 self.profile_list_layout.add_widget(row_layout)
 
+    def show_replay_list_popup(self, instance):
+        """
+        Lists the saved game records, newest first; choosing one opens it in replay mode.
+        """
+        content_layout = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(10))
+        scroll_view = ScrollView(size_hint=(1, 0.85))
+        record_list_layout = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=None)
+        record_list_layout.bind(minimum_height=record_list_layout.setter('height'))
+        scroll_view.add_widget(record_list_layout)
+        content_layout.add_widget(scroll_view)
+
+        self.replay_list_popup = Popup(title="Saved Games", content=content_layout, size_hint=(0.6, 0.8))
+        record_paths = list_game_records()
+        for path in record_paths:
+            record_button = Button(text=os.path.basename(path), size_hint_y=None, height=dp(40),
+                                   font_name=FONT_PATH, font_size=dp(16))
+            record_button.bind(on_press=partial(self._open_replay, path))
+            record_list_layout.add_widget(record_button)
+        if not record_paths:
+            record_list_layout.add_widget(Label(text="No saved games yet.", size_hint_y=None, height=dp(40),
+                                                font_name=FONT_PATH, font_size=dp(16)))
+
+        close_button = Button(text="Close", size_hint=(1, 0.15), font_name=FONT_PATH, font_size=dp(18))
+        close_button.bind(on_press=self.replay_list_popup.dismiss)
+        content_layout.add_widget(close_button)
+        self.replay_list_popup.open()
+
+    def _open_replay(self, path, instance_button_UNUSED=None):
+        self.replay_list_popup.dismiss()
+        try:
+            with open(path, 'rb') as record_file:
+                replay_timeline = ReplayTimeline(record_file)
+        except (OSError, ReplayError) as e:
+            self._show_error_popup(f"Could not open {os.path.basename(path)}: {e}")
+            return
+        self.manager.current = 'game'
+        self.manager.get_screen('game').start_replay(replay_timeline)
+
     def _rename_profile_prompt(self, username_to_rename, instance_button_UNUSED=None): # Added default for instance
         rename_popup_content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(10))
         rename_popup_content.add_widget(Label(text=f"Renaming: {username_to_rename}", font_name=FONT_PATH, font_size=dp(16)))
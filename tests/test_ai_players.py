@@ -0,0 +1,158 @@
+import unittest
+import os
+import random
+import time
+
+# Assuming ai_players.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from ai_players import AI_PLAYER_TYPES, MOVE_POLICIES, GreedyPlayer, MonteCarloPlayer, default_ai_name, game_move_policies
+from board import EMPTY
+from headless import ai_player_configurations, new_game, play_game, play_turn, seat_types
+from score_maps import CellScoreMap
+
+
+class TestMonteCarloPlayer(unittest.TestCase):
+    def setUp(self):
+        self.game_state = new_game(ai_player_configurations(3), (12, 10), 0.1, random.Random(5))
+        for _ in range(9):
+            play_turn(self.game_state)
+        self.player = self.game_state.players[self.game_state.current_player_index]
+
+    def test_choice_is_reproducible_with_seeded_rng_and_rollout_cap(self):
+        choices = [
+            MonteCarloPlayer(time_budget=60, max_rollouts=24, rng=random.Random(11)).choose_cell(self.game_state, self.player)
+            for _ in range(2)
+        ]
+        self.assertEqual(choices[0], choices[1])
+        self.assertEqual(self.game_state.board.state_at(choices[0]), EMPTY)
+
+    def test_search_does_not_change_the_game(self):
+        wealth = self.game_state.wealth_summary()
+        turn = self.game_state.turn_counter
+        empty_count = self.game_state.board.empty_count()
+        MonteCarloPlayer(time_budget=60, max_rollouts=16, rng=random.Random(1)).choose_cell(self.game_state, self.player)
+        self.assertEqual(self.game_state.wealth_summary(), wealth)
+        self.assertEqual(self.game_state.turn_counter, turn)
+        self.assertEqual(self.game_state.board.empty_count(), empty_count)
+
+    def test_time_budget_bounds_the_search(self):
+        ai = MonteCarloPlayer(time_budget=0.05, rng=random.Random(2))
+        start = time.perf_counter()
+        ai.choose_cell(self.game_state, self.player)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreater(ai.last_rollouts, 0)
+
+    def test_call_plays_the_chosen_cell(self):
+        ai = MonteCarloPlayer(time_budget=60, max_rollouts=8, rng=random.Random(3))
+        selected_cell, _ = ai(self.game_state, self.player)
+        self.assertIsNotNone(selected_cell)
+        self.assertTrue(self.game_state.player_has_moved[self.player])
+        self.assertNotEqual(self.game_state.board.state_at(selected_cell), EMPTY)
+
+    def test_rollouts_share_transposed_positions_within_one_search(self):
+        game_state = new_game(ai_player_configurations(3), (6, 5), 0.1, random.Random(5))
+        for _ in range(20):
+            play_turn(game_state)
+        player = game_state.players[game_state.current_player_index]
+        ai = MonteCarloPlayer(time_budget=60, max_rollouts=100, rng=random.Random(9))
+        hits = []
+        ai.choose_cell(game_state, player, stop=lambda: hits.append(ai.transpositions.hits) and False)
+        self.assertEqual(hits[0], 0)
+        self.assertEqual(hits, sorted(hits))
+        self.assertGreater(hits[-1], 0)
+        self.assertGreater(len(ai.transpositions), 0)
+
+    def test_search_without_a_transposition_table(self):
+        ai = MonteCarloPlayer(time_budget=60, max_rollouts=16, rng=random.Random(9), transpositions=None)
+        self.assertEqual(self.game_state.board.state_at(ai.choose_cell(self.game_state, self.player)), EMPTY)
+        self.assertEqual(ai.last_rollouts, 16)
+
+    def test_every_game_gets_its_own_hard_player(self):
+        first, second = game_move_policies(), game_move_policies(time_budget=0.1)
+        self.assertEqual(set(first), set(AI_PLAYER_TYPES))
+        self.assertIsNot(first["AI (Hard)"], second["AI (Hard)"])
+        self.assertIsNot(first["AI (Hard)"].transpositions, second["AI (Hard)"].transpositions)
+        self.assertIsNot(first["AI (Hard)"], MOVE_POLICIES["AI (Hard)"])
+        self.assertEqual(second["AI (Hard)"].time_budget, 0.1)
+
+    def test_full_board_has_no_choice(self):
+        game_state = new_game(ai_player_configurations(2), (3, 3), 0.0, random.Random(4))
+        while play_turn(game_state)[0] is not None:
+            pass
+        player = game_state.players[game_state.current_player_index]
+        self.assertIsNone(MonteCarloPlayer(time_budget=60, max_rollouts=4).choose_cell(game_state, player))
+
+    def test_hard_seats_play_headless_games(self):
+        configurations = ai_player_configurations(2, ["AI (Hard)", "AI (Easy)"])
+        policies = dict(MOVE_POLICIES, **{"AI (Hard)": MonteCarloPlayer(time_budget=60, max_rollouts=4, rollout_turns=2)})
+        result = play_game(configurations, (8, 8), turn_limit=10, seed=6, move_policies=policies)
+        self.assertEqual(result.moves, 10)
+        self.assertEqual(result.players, ["AI 1 (Hard)", "AI 2 (Easy)"])
+
+
+class TestGreedyPlayer(unittest.TestCase):
+    def setUp(self):
+        self.game_state = new_game(ai_player_configurations(2), (8, 8), 0.0, random.Random(4))
+        self.player, self.rival = self.game_state.players
+
+    def test_avoids_a_merger_that_pays_a_rival_more(self):
+        self.game_state.create_new_company([(0, 0), (0, 1)], self.player)
+        self.game_state.create_new_company([(0, 3)], self.rival)
+        self.assertNotEqual(GreedyPlayer().choose_cell(self.game_state, self.player), (0, 2))
+
+    def test_expands_its_own_company(self):
+        company, _ = self.game_state.create_new_company([(3, 3)], self.player)
+        self.game_state.create_new_company([(7, 0)], self.rival)
+        cell = GreedyPlayer().choose_cell(self.game_state, self.player)
+        self.assertIn(cell, {(2, 3), (4, 3), (3, 2), (3, 4)})
+
+    def test_prefers_a_merger_into_its_holdings(self):
+        self.game_state.create_new_company([(0, 0), (0, 1)], self.player)
+        self.game_state.create_new_company([(0, 3)], self.player)
+        self.assertEqual(GreedyPlayer().choose_cell(self.game_state, self.player), (0, 2))
+
+    def test_score_map_follows_the_game(self):
+        ai = GreedyPlayer()
+        policies = {"AI (Easy)": ai}
+        for _ in range(40):
+            play_turn(self.game_state, policies)
+            score_map = ai.score_map(self.game_state)
+            fresh = CellScoreMap(self.game_state.clone())
+            self.assertEqual(score_map.frontier, fresh.frontier)
+            self.assertEqual(score_map.found_cells, fresh.found_cells)
+
+    def test_score_map_is_rebuilt_after_a_change_without_a_diff(self):
+        ai = GreedyPlayer()
+        score_map = ai.score_map(self.game_state)
+        self.game_state.diamond_positions = {(4, 4)}  # Wholesale replacement: no callback
+        self.assertFalse(score_map.in_sync())
+        ai.score_map(self.game_state)
+        self.assertIn(self.game_state.board.index_of((4, 5)), score_map.found_cells)
+
+    def test_every_game_gets_its_own_hard_player(self):
+        first, second = game_move_policies(), game_move_policies(time_budget=0.1)
+        self.assertEqual(set(first), set(AI_PLAYER_TYPES))
+        self.assertIsNot(first["AI (Hard)"], second["AI (Hard)"])
+        self.assertIsNot(first["AI (Hard)"].transpositions, second["AI (Hard)"].transpositions)
+        self.assertIsNot(first["AI (Hard)"], MOVE_POLICIES["AI (Hard)"])
+        self.assertEqual(second["AI (Hard)"].time_budget, 0.1)
+
+    def test_full_board_has_no_choice(self):
+        self.game_state.diamond_positions = [(r, c) for r in range(8) for c in range(8)]
+        self.assertIsNone(GreedyPlayer().choose_cell(self.game_state, self.player))
+
+
+class TestPlayerTypes(unittest.TestCase):
+    def test_types_and_default_names(self):
+        self.assertEqual(AI_PLAYER_TYPES, ("AI (Easy)", "AI (Medium)", "AI (Hard)"))
+        self.assertEqual(default_ai_name(2, "AI (Hard)"), "AI 2 (Hard)")
+
+    def test_seat_types(self):
+        self.assertEqual(seat_types(4, hard_seats=1, medium_seats=2),
+                         ["AI (Hard)", "AI (Medium)", "AI (Medium)", "AI (Easy)"])
+        self.assertEqual(seat_types(2, medium_seats=3), ["AI (Medium)", "AI (Medium)"])
+
+
+if __name__ == '__main__':
+    unittest.main()
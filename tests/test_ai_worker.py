@@ -0,0 +1,138 @@
+import unittest
+import os
+import random
+import threading
+import time
+from unittest.mock import patch
+
+# Assuming ai_worker.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from ai_players import MOVE_POLICIES, GreedyPlayer, MonteCarloPlayer, easy_move
+from ai_worker import AIMoveRequest, AIStretchRequest
+from headless import ai_player_configurations, new_game, play_turn
+from score_maps import CellScoreMap
+
+
+class FailingPlayer:
+    def choose_cell(self, game_state, player, stop=None):
+        raise RuntimeError("no move")
+
+
+class TestAIMoveRequest(unittest.TestCase):
+    def setUp(self):
+        self.game_state = new_game(ai_player_configurations(2), (10, 10), 0.1, random.Random(2))
+        for _ in range(6):
+            play_turn(self.game_state)
+        self.player = self.game_state.players[self.game_state.current_player_index]
+        self.delivered = []
+        self.done = threading.Event()
+
+    def deliver(self, request, selected_cell, error):
+        self.delivered.append((request, selected_cell, error))
+        self.done.set()
+
+    def test_move_is_chosen_on_a_snapshot(self):
+        for policy in (easy_move, GreedyPlayer(), MonteCarloPlayer(time_budget=0.05)):
+            self.done.clear()
+            self.delivered.clear()
+            empty_count = self.game_state.board.empty_count()
+            request = AIMoveRequest(policy, self.game_state, self.player, self.deliver).start()
+            self.assertTrue(self.done.wait(5))
+            delivered_request, selected_cell, error = self.delivered[0]
+            self.assertIs(delivered_request, request)
+            self.assertIsNone(error)
+            self.assertIsNotNone(self.game_state.legal_move_at(selected_cell))
+            self.assertEqual(self.game_state.board.empty_count(), empty_count)
+            self.assertEqual(request.turn, self.game_state.turn_counter)
+
+    def test_greedy_snapshots_copy_the_live_score_map(self):
+        game_state = new_game(ai_player_configurations(2, ["AI (Medium)", "AI (Medium)"]), (10, 10), 0.1,
+                              random.Random(3))
+        policy = GreedyPlayer()
+        rebuild = CellScoreMap.rebuild
+        rebuilds = []
+        with patch.object(CellScoreMap, 'rebuild', lambda score_map: rebuilds.append(score_map) or rebuild(score_map)):
+            for _ in range(10):
+                player = game_state.players[game_state.current_player_index]
+                self.done.clear()
+                self.delivered.clear()
+                AIMoveRequest(policy, game_state, player, self.deliver).start()
+                self.assertTrue(self.done.wait(5))
+                _, selected_cell, error = self.delivered[0]
+                self.assertIsNone(error)
+                with game_state.batch_updates():  # As GameScreen.apply_ai_move plays it
+                    game_state.ai_take_turn(player, selected_cell)
+                    game_state.expand_into_adjacent_diamonds(player)
+                game_state.end_turn()
+        # Only the live game's map was built from scratch, on the first turn
+        self.assertEqual(len(rebuilds), 1)
+        live = policy.score_map(game_state)
+        fresh = CellScoreMap(game_state.clone())
+        self.assertEqual((live.frontier, live.found_cells), (fresh.frontier, fresh.found_cells))
+
+    def test_cancelled_request_is_not_delivered(self):
+        policy = MonteCarloPlayer(time_budget=30)
+        request = AIMoveRequest(policy, self.game_state, self.player, self.deliver)
+        start = time.perf_counter()
+        request.start()
+        time.sleep(0.05)
+        request.cancel()
+        request.join(5)
+        self.assertFalse(request.is_alive())
+        self.assertLess(time.perf_counter() - start, 5)  # The search stopped well before its budget
+        self.assertTrue(request.cancelled)
+        self.assertEqual(self.delivered, [])
+
+    def test_errors_are_delivered(self):
+        AIMoveRequest(FailingPlayer(), self.game_state, self.player, self.deliver).start()
+        self.assertTrue(self.done.wait(5))
+        _, selected_cell, error = self.delivered[0]
+        self.assertIsNone(selected_cell)
+        self.assertIsInstance(error, RuntimeError)
+
+
+class TestAIStretchRequest(unittest.TestCase):
+    def setUp(self):
+        # Three AI seats, then a human
+        configurations = ai_player_configurations(4, ["AI (Easy)", "AI (Medium)", "AI (Easy)", "AI (Medium)"])
+        configurations[3]['type'] = "Human"
+        self.game_state = new_game(configurations, (10, 10), 0.1, random.Random(5))
+        for _ in range(4):
+            play_turn(self.game_state)
+        self.delivered = []
+        self.done = threading.Event()
+
+    def deliver(self, request, moves, error):
+        self.delivered.append((request, moves, error))
+        self.done.set()
+
+    def test_stretch_stops_at_the_human_and_replays_in_one_diff(self):
+        request = AIStretchRequest(MOVE_POLICIES, self.game_state, 100, self.deliver).start()
+        self.assertTrue(self.done.wait(5))
+        _, moves, error = self.delivered[0]
+        self.assertIsNone(error)
+        self.assertEqual([player for player, _ in moves], self.game_state.players[:3])
+        self.assertEqual(self.game_state.turn_counter, request.turn)  # The live game was not touched
+
+        diffs = []
+        self.game_state.register_callback(diffs.append)
+        with self.game_state.batch_updates():
+            for player, selected_cell in moves:
+                self.game_state.ai_take_turn(player, selected_cell)
+                self.game_state.expand_into_adjacent_diamonds(player)
+                self.game_state.end_turn()
+        self.assertEqual(len(diffs), 1)
+        self.assertEqual(self.game_state.players[self.game_state.current_player_index], self.game_state.players[3])
+        self.assertEqual(self.game_state.zobrist_hash(), request.snapshot.zobrist_hash())
+        self.assertEqual(self.game_state.player_wealth, request.snapshot.player_wealth)
+
+    def test_stretch_stops_at_the_turn_limit(self):
+        request = AIStretchRequest(MOVE_POLICIES, self.game_state, self.game_state.turn_counter + 2, self.deliver)
+        request.start()
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(len(self.delivered[0][1]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
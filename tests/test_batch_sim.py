@@ -0,0 +1,100 @@
+import unittest
+import os
+import random
+
+# Assuming batch_sim.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from batch_sim import BatchSimulator, np
+from board import COMPANY
+from game_logic import COMPANY_NAMES
+from headless import ai_player_configurations, new_game
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestBatchSimulatorAgainstGameState(unittest.TestCase):
+    """
+    Differential tests: every game of a batch is replayed cell by cell through GameState,
+    and the two must agree on the whole position after every turn.
+    """
+
+    def replay_and_compare(self, games, grid_size, players, marker_percentage, seed, turns):
+        simulator = BatchSimulator(games, grid_size, players, marker_percentage, seed=seed)
+        configurations = ai_player_configurations(players)
+        game_states = []
+        for game in range(games):
+            game_state = new_game(configurations, grid_size, 0.0, random.Random(game))
+            game_state.set_initial_o_marker_locations(simulator.o_marker_locations(game))
+            game_states.append(game_state)
+
+        for _ in range(turns):
+            if simulator.finished.all():
+                break
+            simulator.step()
+            for game, game_state in enumerate(game_states):
+                cell = int(simulator.last_cells[game])
+                if cell < 0:
+                    continue
+                player = game_state.players[game_state.current_player_index]
+                selected_cell, _ = game_state.ai_take_turn(player, game_state.board.coords_of(cell))
+                self.assertIsNotNone(selected_cell)
+                game_state.expand_into_adjacent_diamonds(player)
+                game_state.end_turn()
+                self.assert_same_position(simulator, game, game_state)
+        return simulator
+
+    def assert_same_position(self, simulator, game, game_state):
+        board = game_state.board
+        message = f"game {game}, turn {simulator.turn}"
+        self.assertEqual(bytes(simulator.cells[game, :simulator.size]), bytes(board.cells), message)
+        tiles = [(index, game_state.company_map.company_at_index(index)) for index in board.positions(COMPANY)]
+        self.assertEqual(tiles, [(index, COMPANY_NAMES[simulator.company[game, index]]) for index, _ in tiles], message)
+
+        active = {COMPANY_NAMES[company] for company in np.flatnonzero(simulator.active[game])}
+        self.assertEqual(active, set(game_state.company_info), message)
+        for name in active:
+            company = COMPANY_NAMES.index(name)
+            self.assertEqual(simulator.company_size[game, company], game_state.company_map.size_of(name), message)
+            self.assertEqual(simulator.company_value[game, company], game_state.company_info[name]['value'], message)
+        for player_index, player in enumerate(game_state.players):
+            shares = {COMPANY_NAMES[company]: int(count)
+                      for company, count in enumerate(simulator.shares[game, player_index]) if count}
+            self.assertEqual(shares, {name: count for name, count in game_state.player_shares[player].items() if count},
+                             message)
+
+        queue = [COMPANY_NAMES[company] for company in simulator.name_queue[game, :simulator.name_count[game]]]
+        self.assertEqual(queue, game_state.available_company_names, message)
+        self.assertEqual(simulator.merger_count[game], game_state.merger_count, message)
+        self.assertEqual(simulator.wealth()[game].tolist(), list(game_state.wealth_summary().values()), message)
+
+    def test_games_to_a_full_board(self):
+        # Small boards fill up: name exhaustion, mergers, splits and diamond cascades all occur
+        simulator = self.replay_and_compare(24, (8, 9), 4, 0.1, seed=11, turns=100)
+        self.assertTrue(simulator.finished.all())
+        self.assertGreater(simulator.merger_count.sum(), 0)
+
+    def test_default_length_games(self):
+        self.replay_and_compare(8, (16, 12), 3, 0.1, seed=5, turns=80)
+
+    def test_boards_without_markers(self):
+        self.replay_and_compare(12, (7, 7), 2, 0.0, seed=2, turns=60)
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestBatchSimulator(unittest.TestCase):
+    def test_seed_replays_the_same_games(self):
+        first = BatchSimulator(50, (12, 12), seed=9).run(80)
+        second = BatchSimulator(50, (12, 12), seed=9).run(80)
+        self.assertTrue((first.wealth() == second.wealth()).all())
+        self.assertTrue((first.cells == second.cells).all())
+
+    def test_run_stops_when_every_board_is_full(self):
+        simulator = BatchSimulator(10, (4, 4), marker_percentage=0.25, seed=3).run(1000)
+        self.assertTrue(simulator.finished.all())
+        self.assertLess(simulator.turn, 1000)
+        self.assertTrue((simulator.moves == 4 * 4 - 4).all())
+        self.assertTrue((simulator.free_count == 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+import unittest
+import os
+
+# Assuming board.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from board import (
+    Board, CompanyMap, neighbour_table, DiamondPositions, DisjointSet, OMarkerLocations,
+    EMPTY, DIAMOND, O_MARKER, COMPANY, NO_COMPANY, np,
+)
+
+
+class TestDisjointSet(unittest.TestCase):
+    def test_union_and_find(self):
+        sets = DisjointSet()
+        a, b, c = sets.make_set(), sets.make_set(), sets.make_set()
+        root, absorbed = sets.union(a, b)
+        self.assertEqual({root, absorbed}, {a, b})
+        self.assertEqual(sets.find(a), sets.find(b))
+        self.assertNotEqual(sets.find(a), sets.find(c))
+        self.assertEqual(sets.union(b, a), (sets.find(a), None))
+        self.assertEqual(sets.root_ids(), [root, root, c])
+
+    def test_copy_is_independent(self):
+        sets = DisjointSet()
+        a, b = sets.make_set(), sets.make_set()
+        duplicate = sets.copy()
+        duplicate.union(a, b)
+        self.assertNotEqual(sets.find(a), sets.find(b))
+        self.assertEqual(duplicate.find(a), duplicate.find(b))
+
+    def test_split_rolls_back_the_last_union(self):
+        sets = DisjointSet()
+        a, b, c = sets.make_set(), sets.make_set(), sets.make_set()
+        sets.union(a, b)
+        rank = sets.rank_of(sets.find(a))
+        root, child = sets.union(a, c)
+        sets.find(c)
+        sets.split(root, child, rank)
+        self.assertEqual(sets.root_ids(), [root, root, c])
+        sets.pop_set()
+        self.assertEqual(len(sets), 2)
+
+
+class TestNeighbourTable(unittest.TestCase):
+    def test_in_bounds_neighbours(self):
+        table = neighbour_table((3, 4))
+        self.assertEqual(len(table), 12)
+        self.assertEqual(table[0], (4, 1))             # Corner: South, East
+        self.assertEqual(table[5], (1, 9, 4, 6))       # Interior: North, South, West, East
+        self.assertEqual(table[11], (7, 10))           # Bottom-right corner: North, West
+
+    def test_table_is_shared_per_grid_size(self):
+        self.assertIs(Board((3, 4)).neighbours, Board((3, 4)).neighbours)
+        self.assertIsNot(Board((3, 4)).neighbours, Board((4, 3)).neighbours)
+
+
+class TestBoard(unittest.TestCase):
+    def setUp(self):
+        self.board = Board((4, 5))
+
+    def test_indexing(self):
+        self.assertEqual(self.board.index_of((1, 2)), 7)
+        self.assertEqual(self.board.coords_of(7), (1, 2))
+        self.assertEqual(self.board.index_of((4, 0)), -1)
+        self.assertEqual(self.board.index_of((0, -1)), -1)
+        self.assertEqual(self.board.index_of("bad"), -1)
+        with self.assertRaises(ValueError):
+            self.board.checked_index((0, 5))
+
+    def test_o_markers_and_adjacency(self):
+        self.board.set_o_markers({(0, 0), (2, 2)})
+        self.assertEqual(self.board.state_at((0, 0)), O_MARKER)
+        adjacent = {self.board.coords_of(i) for i, flag in enumerate(self.board.o_marker_adjacent) if flag}
+        self.assertEqual(adjacent, {(0, 1), (1, 0), (1, 2), (3, 2), (2, 1), (2, 3)})
+
+        self.board.set_o_markers({(3, 4)})
+        self.assertEqual(self.board.state_at((0, 0)), EMPTY)
+        self.assertEqual(OMarkerLocations(self.board), {(3, 4)})
+
+    def test_diamond_view(self):
+        diamonds = DiamondPositions(self.board)
+        diamonds.add((1, 1))
+        diamonds |= {(1, 2), (3, 3)}
+        self.assertEqual(diamonds, {(1, 1), (1, 2), (3, 3)})
+        self.assertEqual(self.board.state_at((1, 2)), DIAMOND)
+
+        diamonds -= {(1, 1)}
+        diamonds.difference_update([(1, 2)])
+        self.assertEqual(diamonds, {(3, 3)})
+        self.assertNotIn((9, 9), diamonds)
+
+        self.board.set_o_markers({(0, 0)})
+        with self.assertRaises(ValueError):
+            diamonds.add((0, 0))
+
+    def test_empty_cell_list_follows_every_state_change(self):
+        diamonds = DiamondPositions(self.board)
+        company_map = CompanyMap(self.board)
+        self.board.set_o_markers({(0, 0)})
+        diamonds.add((1, 1))
+        company_map[(1, 1)] = {"company_name": "Corp", "owner": "P1", "value": 100}
+        company_map[(2, 2)] = {"company_name": "Corp", "owner": "P1", "value": 100}
+        del company_map[(2, 2)]
+        diamonds.add((3, 4))
+
+        expected = {i for i in range(self.board.size) if self.board.cells[i] == EMPTY}
+        self.assertEqual(self.board.empty_count(), len(expected))
+        self.assertEqual(set(self.board._free_cells), expected)
+        for index in expected:
+            self.assertEqual(self.board._free_cells[self.board._free_position[index]], index)
+
+    def test_random_empty_index(self):
+        diamonds = DiamondPositions(self.board)
+        for index in range(self.board.size - 1):
+            diamonds.add(self.board.coords_of(index))
+        self.assertEqual(self.board.random_empty_index(), self.board.size - 1)
+        diamonds.add(self.board.coords_of(self.board.size - 1))
+        self.assertIsNone(self.board.random_empty_index())
+
+    def test_sample_empty_indices(self):
+        diamonds = DiamondPositions(self.board)
+        diamonds.add((0, 0))
+        sample = self.board.sample_empty_indices(5)
+        self.assertEqual(len(set(sample)), 5)
+        self.assertNotIn(self.board.index_of((0, 0)), sample)
+        self.assertEqual(sorted(self.board.sample_empty_indices(self.board.size)), list(range(1, self.board.size)))
+
+    def test_company_tile_replaces_diamond(self):
+        diamonds = DiamondPositions(self.board)
+        company_map = CompanyMap(self.board)
+        diamonds.add((2, 2))
+        company_map[(2, 2)] = {"company_name": "Corp", "owner": "P1", "value": 100}
+
+        self.assertNotIn((2, 2), diamonds)
+        self.assertEqual(self.board.state_at((2, 2)), COMPANY)
+        self.assertEqual(dict(company_map[(2, 2)]), {"company_name": "Corp", "owner": "P1", "value": 100})
+
+        del company_map[(2, 2)]
+        self.assertEqual(self.board.state_at((2, 2)), EMPTY)
+        self.assertEqual(self.board.company_ids[self.board.index_of((2, 2))], NO_COMPANY)
+
+
+    def test_copies_are_independent(self):
+        company_map = CompanyMap(self.board)
+        company_map[(0, 0)] = {"company_name": "Corp", "owner": "P1", "value": 100}
+        company_map[(0, 1)] = {"company_name": "Corp", "owner": "P1", "value": 100}
+
+        board_copy = self.board.copy()
+        map_copy = company_map.copy(board_copy)
+        map_copy[(0, 2)] = {"company_name": "Corp", "owner": "P2", "value": 100}
+        del map_copy[(0, 0)]
+        DiamondPositions(board_copy).add((3, 3))
+
+        self.assertEqual(company_map.tiles_of("Corp"), {(0, 0), (0, 1)})
+        self.assertEqual(map_copy.tiles_of("Corp"), {(0, 1), (0, 2)})
+        self.assertEqual(self.board.state_at((3, 3)), EMPTY)
+        self.assertEqual(self.board.empty_count(), self.board.size - 2)
+        self.assertEqual(board_copy.empty_count(), self.board.size - 3)
+        self.assertIs(board_copy.neighbours, self.board.neighbours)
+
+        # The original still owns nothing after the copy, so its own changes are isolated too
+        company_map[(1, 0)] = {"company_name": "Corp", "owner": "P1", "value": 100}
+        self.assertNotIn((1, 0), map_copy)
+        self.assertEqual(map_copy.size_of("Corp"), 2)
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestBoardArrayViews(unittest.TestCase):
+    def setUp(self):
+        self.board = Board((3, 4))
+        self.company_map = CompanyMap(self.board)
+
+    def test_state_views_share_memory(self):
+        states = self.board.state_array()
+        self.assertEqual(states.shape, (3, 4))
+        self.assertEqual(states.dtype, np.int8)
+        DiamondPositions(self.board).add((1, 3))
+        self.assertEqual(states[1, 3], DIAMOND)
+        self.assertFalse(self.board.empty_mask()[1, 3])
+        self.assertEqual(int(self.board.empty_mask().sum()), 11)
+        with self.assertRaises(ValueError):
+            states[0, 0] = COMPANY
+
+    def test_company_ids_resolve_through_mergers(self):
+        for coords in [(0, 0), (0, 1)]:
+            self.company_map[coords] = {"company_name": "Big", "owner": "P1", "value": 200}
+        self.company_map[(2, 3)] = {"company_name": "Small", "owner": "P1", "value": 100}
+        self.company_map.absorb_company("Small", "Big")
+
+        root_ids = self.company_map.root_ids()
+        resolved = self.board.company_id_array(root_ids)
+        self.assertEqual(resolved[0, 0], resolved[2, 3])
+        self.assertEqual(self.company_map.company_of_root(int(resolved[2, 3])), "Big")
+        self.assertEqual(resolved[1, 1], NO_COMPANY)
+
+        counts = self.board.tile_counts(root_ids)
+        self.assertEqual(counts[resolved[0, 0]], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
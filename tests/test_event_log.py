@@ -0,0 +1,73 @@
+import unittest
+import io
+import os
+
+# Assuming event_log.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from event_log import EventLog, LogRecord, DEBUG, INFO, WARNING, OFF
+from game_logic import GameState
+
+
+class ExplodingField:
+    """A field value that fails the test if anything tries to format it."""
+    def __format__(self, spec):
+        raise AssertionError("Disabled log record was formatted")
+
+
+class TestEventLog(unittest.TestCase):
+    def test_disabled_levels_never_reach_the_sink_or_format(self):
+        records = []
+        log = EventLog(level=WARNING, sink=records.append)
+        log.debug("noise", "{value}", value=ExplodingField())
+        log.info("noise", "{value}", value=ExplodingField())
+        self.assertEqual(records, [])
+
+        log.level = OFF
+        log.warning("noise", "{value}", value=ExplodingField())
+        self.assertEqual(records, [])
+
+    def test_enabled_records_are_structured_and_formatted_lazily(self):
+        records = []
+        log = EventLog(level=DEBUG, sink=records.append)
+        log.info("shares_bought", "{player} bought {amount} shares.", player="P1", amount=3)
+
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertIsInstance(record, LogRecord)
+        self.assertEqual((record.level, record.event), (INFO, "shares_bought"))
+        self.assertEqual(record.fields, {"player": "P1", "amount": 3})
+        self.assertEqual(record.message, "P1 bought 3 shares.")
+
+    def test_default_sink_prints_to_stream(self):
+        stream = io.StringIO()
+        log = EventLog(level=INFO, stream=stream)
+        log.info("turn_ended", "Turn ended. It's now {player}'s turn.", player="P2")
+        self.assertEqual(stream.getvalue(), "Turn ended. It's now P2's turn.\n")
+
+
+class TestGameStateEvents(unittest.TestCase):
+    def setUp(self):
+        player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(player_configurations, (5, 5), os.path.dirname(__file__))
+        self.records = []
+        self.game_state.log = EventLog(level=INFO, sink=self.records.append)
+
+    def test_actions_emit_info_events(self):
+        player = self.game_state.players[0]
+        company_name, _ = self.game_state.create_new_company((0, 0), player)
+        self.game_state.buy_shares(company_name, player, 1)
+        self.game_state.end_turn()
+
+        events = [record.event for record in self.records]
+        self.assertEqual(events, ["company_created", "shares_bought", "turn_ended"])
+
+    def test_rejections_are_warnings(self):
+        self.game_state.sell_shares("Nerdniss", self.game_state.players[0], 1)
+        self.assertEqual([(r.level, r.event) for r in self.records], [(WARNING, "sell_rejected")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,18 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import os # Add this if script_dir usage in GameState needs it for tests
+import random
 
 # Assuming game_logic.py is in the parent directory relative to the 'tests' directory
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from game_logic import GameState
+import game_logic
+from ai_players import GreedyPlayer, MonteCarloPlayer
+from game_logic import (
+    DIAMOND_TILE, EMPTY_TILE, MOVE_DIAMOND, MOVE_EXPAND, MOVE_FOUND, MOVE_MERGE, GameState, LegalMove,
+    random_o_marker_locations,
+)
+from board import EMPTY, DIAMOND, O_MARKER, COMPANY
 
 class TestGameLogicOMarkerBonus(unittest.TestCase):
 
@@ -359,6 +366,7 @@ class TestDiamondPlacement(unittest.TestCase):
         self.assertTrue(success)
         self.assertEqual(message, f"Diamond placed at {diamond_coord}.")
         self.assertIn(diamond_coord, self.game_state.diamond_positions)
+        self.game_state.notify_callbacks.assert_called_with([(diamond_coord, DIAMOND_TILE)])
         self.assertEqual(len(self.game_state.available_company_names), 0)
         self.assertEqual(self.game_state.active_companies, initial_active_companies)
         self.assertNotIn(diamond_coord, self.game_state.company_map)
@@ -496,5 +504,657 @@ class TestBonusShares(unittest.TestCase):
                              f"Player {player_name} should not have bonus shares for None-player company creation.")
 
 
+class TestCompanyTileIndex(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False},
+            {'name': 'Player2', 'profile_username': 'Player2', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.grid_size = (10, 10)
+        self.game_state = GameState(self.player_configurations, self.grid_size, self.mock_script_dir)
+        self.game_state.notify_callbacks = MagicMock()
+
+    def test_index_tracks_create_and_expand(self):
+        player = self.game_state.players[0]
+        company_name, _ = self.game_state.create_new_company([(0, 0), (0, 1)], player)
+        self.game_state.expand_company((0, 2), company_name, player)
+
+        self.assertEqual(self.game_state.company_map.tiles_of(company_name), {(0, 0), (0, 1), (0, 2)})
+        self.assertEqual(self.game_state.company_info[company_name]['size'], 3)
+
+    def test_index_tracks_merge(self):
+        player = self.game_state.players[0]
+        big, _ = self.game_state.create_new_company([(0, 0), (0, 1)], player)
+        small, _ = self.game_state.create_new_company([(0, 3)], player)
+
+        self.game_state.expand_company((0, 2), big, player)  # Triggers the merge
+
+        self.assertEqual(self.game_state.company_map.tiles_of(big), {(0, 0), (0, 1), (0, 2), (0, 3)})
+        self.assertEqual(self.game_state.company_map.tiles_of(small), frozenset())
+        self.assertEqual(self.game_state.company_info[big]['size'], 4)
+
+    def test_plain_dict_assignment_is_indexed(self):
+        player = self.game_state.players[0]
+        self.game_state.company_map = {
+            (1, 1): {"company_name": "Corp", "owner": player, "value": 0},
+            (1, 2): {"company_name": "Corp", "owner": player, "value": 0},
+        }
+        self.assertEqual(self.game_state.company_map.size_of("Corp"), 2)
+
+        del self.game_state.company_map[(1, 1)]
+        self.assertEqual(self.game_state.company_map.tiles_of("Corp"), {(1, 2)})
+
+        self.game_state.company_map[(1, 2)] = {"company_name": "Other", "owner": player, "value": 0}
+        self.assertEqual(self.game_state.company_map.size_of("Corp"), 0)
+        self.assertEqual(self.game_state.company_map.size_of("Other"), 1)
+
+
+class TestCompanyUnionFind(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (10, 10), self.mock_script_dir)
+        self.callback = MagicMock()
+        self.game_state.register_callback(self.callback)
+
+    def test_chain_of_mergers_resolves_to_final_acquirer(self):
+        player = self.game_state.players[0]
+        first, _ = self.game_state.create_new_company([(0, 0), (0, 1), (0, 2)], player)
+        second, _ = self.game_state.create_new_company([(0, 4)], player)
+        third, _ = self.game_state.create_new_company([(2, 3)], player)
+
+        self.game_state.expand_company((0, 3), first, player)  # first absorbs second
+        self.game_state.expand_company((1, 3), first, player)  # first absorbs third
+
+        for coords in [(0, 0), (0, 4), (2, 3), (1, 3)]:
+            self.assertEqual(self.game_state.company_map[coords]['company_name'], first)
+        self.assertEqual(self.game_state.company_map.size_of(first), 7)
+        self.assertEqual(self.game_state.company_map[(2, 3)]['value'], self.game_state.company_info[first]['value'])
+
+    def test_merge_updates_resolve_absorbed_tiles_when_iterated(self):
+        player = self.game_state.players[0]
+        big, _ = self.game_state.create_new_company([(5, 0), (5, 1)], player)
+        small, _ = self.game_state.create_new_company([(5, 3), (6, 3)], player)
+        self.game_state.company_map[(5, 2)] = {"company_name": big, "owner": player, "value": 0}
+
+        updates = self.game_state.merge_companies((5, 2), {big, small}, player)
+
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(set(updates), {((5, 3), big), ((6, 3), big), ((5, 2), big)})
+        self.callback.assert_called_with(updates)
+
+    def test_absorbed_name_can_be_founded_again(self):
+        player = self.game_state.players[0]
+        big, _ = self.game_state.create_new_company([(0, 0), (0, 1)], player)
+        small, _ = self.game_state.create_new_company([(0, 3)], player)
+        self.game_state.expand_company((0, 2), big, player)
+        self.assertIn(small, self.game_state.available_company_names)
+
+        self.game_state.available_company_names.remove(small)
+        self.game_state.available_company_names.insert(0, small)
+        refounded, _ = self.game_state.create_new_company([(8, 8)], player)
+
+        self.assertEqual(refounded, small)
+        self.assertEqual(self.game_state.company_map.tiles_of(small), {(8, 8)})
+        self.assertEqual(self.game_state.company_map[(0, 3)]['company_name'], big)
+
+
+class TestOMarkerAdjacencyCounters(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (10, 10), self.mock_script_dir)
+        self.game_state.notify_callbacks = MagicMock()
+        self.player = self.game_state.players[0]
+
+    def test_counter_follows_tiles_joining_and_leaving(self):
+        self.game_state.set_initial_o_marker_locations({(4, 4)})
+        company_name, _ = self.game_state.create_new_company([(0, 0)], self.player)
+        self.assertEqual(self.game_state.company_map.o_marker_tiles_of(company_name), 0)
+
+        self.game_state.company_map[(4, 3)] = {"company_name": company_name, "owner": self.player, "value": 0}
+        self.game_state.company_map[(3, 4)] = {"company_name": company_name, "owner": self.player, "value": 0}
+        self.assertEqual(self.game_state.company_map.o_marker_tiles_of(company_name), 2)
+
+        del self.game_state.company_map[(4, 3)]
+        self.assertEqual(self.game_state.company_map.o_marker_tiles_of(company_name), 1)
+
+    def test_counter_is_summed_on_merge(self):
+        self.game_state.set_initial_o_marker_locations({(9, 9)})
+        big, _ = self.game_state.create_new_company([(0, 0), (0, 1)], self.player)
+        small, _ = self.game_state.create_new_company([(8, 9)], self.player)
+        self.assertEqual(self.game_state.company_info[small]['value'], 100 + 200)
+
+        self.game_state.company_map.absorb_company(small, big)
+        self.game_state.update_company_value(big)
+
+        self.assertEqual(self.game_state.company_map.o_marker_tiles_of(big), 1)
+        self.assertEqual(self.game_state.company_info[big]['value'], 3 * 100 + 200)
+
+    def test_markers_set_after_tiles_are_recounted(self):
+        company_name, _ = self.game_state.create_new_company([(5, 5), (5, 6)], self.player)
+        self.assertEqual(self.game_state.company_map.o_marker_tiles_of(company_name), 0)
+
+        self.game_state.initial_o_marker_locations = {(6, 5), (6, 6)}
+        self.assertEqual(self.game_state.company_map.o_marker_tiles_of(company_name), 2)
+
+
+class TestBoardViews(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        self.game_state.notify_callbacks = MagicMock()
+        self.player = self.game_state.players[0]
+
+    def test_moves_are_written_to_the_board(self):
+        self.game_state.set_initial_o_marker_locations({(5, 5)})
+        self.game_state.place_diamond((0, 0), self.player)
+        self.game_state.place_diamond((0, 1), self.player)  # Forms a company from the two diamonds
+        self.game_state.place_diamond((3, 3), self.player)
+
+        board = self.game_state.board
+        self.assertEqual(board.state_at((0, 0)), COMPANY)
+        self.assertEqual(board.state_at((0, 1)), COMPANY)
+        self.assertEqual(board.state_at((3, 3)), DIAMOND)
+        self.assertEqual(board.state_at((5, 5)), O_MARKER)
+        self.assertEqual(board.state_at((2, 2)), EMPTY)
+        self.assertEqual(self.game_state.diamond_positions, {(3, 3)})
+
+    def test_reassigning_views_replaces_board_contents(self):
+        self.game_state.diamond_positions.add((1, 1))
+        self.game_state.diamond_positions = {(2, 2)}
+        self.assertEqual(self.game_state.board.state_at((1, 1)), EMPTY)
+        self.assertIn((2, 2), self.game_state.diamond_positions)
+
+        self.game_state.company_map = {(4, 4): {"company_name": "Corp", "owner": self.player, "value": 0}}
+        self.game_state.company_map = {}
+        self.assertEqual(self.game_state.board.state_at((4, 4)), EMPTY)
+        self.assertEqual(len(self.game_state.company_map), 0)
+
+
+class TestAdjacencyQueries(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (5, 5), self.mock_script_dir)
+        self.game_state.notify_callbacks = MagicMock()
+        self.player = self.game_state.players[0]
+
+    def test_adjacent_companies_at_board_edges(self):
+        left, _ = self.game_state.create_new_company([(0, 1)], self.player)
+        right, _ = self.game_state.create_new_company([(1, 0)], self.player)
+        self.assertEqual(self.game_state.get_adjacent_companies((0, 0)), {left, right})
+        self.assertEqual(self.game_state.get_adjacent_companies((4, 4)), set())
+
+    def test_can_found_company_at(self):
+        self.assertFalse(self.game_state._can_found_company_at((2, 2)))
+        self.game_state.diamond_positions.add((2, 3))
+        self.assertTrue(self.game_state._can_found_company_at((2, 2)))
+        self.game_state.set_initial_o_marker_locations({(4, 3)})
+        self.assertTrue(self.game_state._can_found_company_at((4, 4)))
+
+    def test_connected_diamonds(self):
+        for coords in [(0, 0), (0, 1), (1, 1), (3, 3)]:
+            self.game_state.diamond_positions.add(coords)
+        self.assertEqual(self.game_state._get_connected_diamonds((1, 2)), {(1, 2), (1, 1), (0, 1), (0, 0)})
+
+
+class TestAITurn(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'AI 1 (Easy)', 'profile_username': None, 'type': 'AI (Easy)', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (4, 4), self.mock_script_dir)
+        self.game_state.notify_callbacks = MagicMock()
+        self.player = self.game_state.players[0]
+
+    def test_ai_only_picks_empty_cells_until_board_is_full(self):
+        self.game_state.set_initial_o_marker_locations({(0, 0)})
+        picked = set()
+        for _ in range(15):
+            selected_cell, _ = self.game_state.ai_take_turn(self.player)
+            self.assertIsNotNone(selected_cell)
+            self.assertNotIn(selected_cell, picked)
+            self.assertNotEqual(selected_cell, (0, 0))
+            picked.add(selected_cell)
+
+        selected_cell, message = self.game_state.ai_take_turn(self.player)
+        self.assertIsNone(selected_cell)
+        self.assertEqual(message, f"{self.player} (AI) has no available moves.")
+
+
+class TestBatchedUpdates(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        self.callback = MagicMock()
+        self.game_state.register_callback(self.callback)
+        self.player = self.game_state.players[0]
+
+    def test_move_cascade_is_delivered_once_with_last_write_winning(self):
+        big, _ = self.game_state.create_new_company([(0, 0), (0, 1)], self.player)
+        small, _ = self.game_state.create_new_company([(0, 3)], self.player)
+        self.callback.reset_mock()
+
+        with self.game_state.batch_updates():
+            self.game_state.expand_company((0, 2), big, self.player)  # Notifies the expansion, then the merge
+            self.callback.assert_not_called()
+
+        self.callback.assert_called_once()
+        diff = self.callback.call_args[0][0]
+        self.assertEqual(len(diff), len(dict(diff)), "Each cell should appear once.")
+        self.assertEqual(dict(diff), {(0, 2): big, (0, 3): big})
+
+    def test_nested_batches_deliver_at_outermost_exit(self):
+        with self.game_state.batch_updates():
+            with self.game_state.batch_updates():
+                self.game_state.create_new_company([(3, 3)], self.player)
+            self.callback.assert_not_called()
+        self.callback.assert_called_once()
+
+    def test_batch_delivers_even_if_the_move_raises(self):
+        with self.assertRaises(TypeError):
+            with self.game_state.batch_updates():
+                self.game_state.create_new_company([(4, 4)], self.player)
+                self.game_state.create_new_company("not coords", self.player)
+        self.callback.assert_called_once()
+
+    def test_empty_batch_does_not_notify(self):
+        with self.game_state.batch_updates():
+            pass
+        self.callback.assert_not_called()
+
+
+class TestClone(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False},
+            {'name': 'Player2', 'profile_username': None, 'type': 'AI (Easy)', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        self.game_state.initial_o_marker_locations = {(5, 5)}
+        self.callback = MagicMock()
+        self.game_state.register_callback(self.callback)
+        self.player = self.game_state.players[0]
+        self.company, _ = self.game_state.create_new_company([(0, 0), (0, 1)], self.player)
+        self.game_state.buy_shares(self.company, self.player, 2)
+        self.game_state.diamond_positions.add((3, 3))
+        self.callback.reset_mock()
+
+    def test_clone_matches_original(self):
+        clone = self.game_state.clone()
+        self.assertEqual(dict(clone.company_map.items()), dict(self.game_state.company_map.items()))
+        self.assertEqual(clone.company_info, self.game_state.company_info)
+        self.assertEqual(clone.player_shares, self.game_state.player_shares)
+        self.assertEqual(clone.player_wealth, self.game_state.player_wealth)
+        self.assertEqual(set(clone.diamond_positions), {(3, 3)})
+        self.assertEqual(set(clone.initial_o_marker_locations), {(5, 5)})
+        self.assertEqual(clone.available_company_names, self.game_state.available_company_names)
+        self.assertEqual(clone.callbacks, [])
+
+    def test_moves_on_clone_leave_original_untouched(self):
+        shares_before = dict(self.game_state.player_shares[self.player])
+        clone = self.game_state.clone()
+        other, _ = clone.create_new_company([(0, 3)], self.player)
+        clone.expand_company((0, 2), self.company, self.player)  # Merges the new company
+        clone.buy_shares(self.company, self.player, 1)
+        clone.place_diamond((4, 4), self.player)
+        clone.end_turn()
+
+        self.callback.assert_not_called()
+        self.assertEqual(clone.company_map.size_of(self.company), 4)
+        self.assertEqual(self.game_state.company_map.tiles_of(self.company), {(0, 0), (0, 1)})
+        self.assertNotIn((0, 3), self.game_state.company_map)
+        self.assertEqual(self.game_state.company_info[self.company]['size'], 2)
+        self.assertEqual(self.game_state.player_shares[self.player], shares_before)
+        self.assertEqual(set(self.game_state.diamond_positions), {(3, 3)})
+        self.assertIn(other, self.game_state.available_company_names)
+        self.assertEqual(self.game_state.current_player_index, 0)
+        self.assertEqual(self.game_state.board.empty_count(), 36 - 4)
+
+    def test_original_moves_leave_clone_untouched(self):
+        clone = self.game_state.clone()
+        self.game_state.expand_company((1, 0), self.company, self.player)
+        self.assertEqual(clone.company_map.tiles_of(self.company), {(0, 0), (0, 1)})
+        self.assertEqual(clone.company_info[self.company]['size'], 2)
+
+    def test_clone_has_its_own_random_generator(self):
+        self.game_state.rng = random.Random(11)
+        state = self.game_state.rng.getstate()
+        clone = self.game_state.clone()
+        self.assertIsNot(clone.rng, self.game_state.rng)
+        # The clone starts where the game's generator is, and searching on it leaves the game's alone
+        self.assertEqual(clone.rng.getstate(), state)
+        GreedyPlayer().choose_cell(clone, self.player)
+        MonteCarloPlayer(time_budget=60, max_rollouts=20, transpositions=None).choose_cell(clone, self.player)
+        self.assertEqual(self.game_state.rng.getstate(), state)
+        self.assertNotEqual(clone.rng.getstate(), state)
+
+        rng = random.Random(3)
+        self.assertIs(self.game_state.clone(rng).rng, rng)
+
+
+class TestUndoRedo(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False},
+            {'name': 'Player2', 'profile_username': 'Player2', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        self.game_state.initial_o_marker_locations = {(5, 5)}
+        self.callback = MagicMock()
+        self.game_state.register_callback(self.callback)
+        self.player = self.game_state.players[0]
+
+    def snapshot(self):
+        game_state = self.game_state
+        return (
+            {coords: dict(info) for coords, info in game_state.company_map.items()},
+            set(game_state.diamond_positions),
+            {name: dict(info) for name, info in game_state.company_info.items()},
+            {player: dict(shares) for player, shares in game_state.player_shares.items()},
+            dict(game_state.player_wealth),
+            dict(game_state.player_has_moved),
+            list(game_state.available_company_names),
+            game_state.current_player_index,
+            game_state.turn_counter,
+            game_state.active_companies,
+            game_state.board.empty_count(),
+        )
+
+    def players_turn(self):
+        return self.game_state.players[self.game_state.current_player_index]
+
+    def test_undo_and_redo_a_merger(self):
+        big, _ = self.game_state.create_new_company([(0, 0), (0, 1)], self.player)
+        small, _ = self.game_state.create_new_company([(0, 3), (1, 3)], self.player)
+        self.game_state.buy_shares(small, self.player, 1)
+        before = self.snapshot()
+
+        self.game_state.expand_company((0, 2), big, self.player)
+        after = self.snapshot()
+        self.callback.reset_mock()
+
+        self.assertEqual(self.game_state.undo(), (True, "Undid expand company."))
+        self.assertEqual(self.snapshot(), before)
+        self.assertEqual(self.game_state.company_map.tiles_of(small), {(0, 3), (1, 3)})
+        # Only the cells the merger touched are redrawn
+        self.callback.assert_called_once()
+        self.assertEqual(set(self.callback.call_args[0][0]),
+                         {((0, 2), EMPTY_TILE), ((0, 3), small), ((1, 3), small)})
+
+        self.assertEqual(self.game_state.redo(), (True, "Redid expand company."))
+        self.assertEqual(self.snapshot(), after)
+        self.assertEqual(self.game_state.company_map[(1, 3)]['company_name'], big)
+
+    def test_undo_diamonds_and_turns(self):
+        start = self.snapshot()
+        self.game_state.place_diamond((3, 3), self.player)
+        self.game_state.end_turn()
+        self.game_state.place_diamond((3, 4), self.players_turn())  # Two diamonds found a company
+
+        self.game_state.undo()
+        self.assertEqual(set(self.game_state.diamond_positions), {(3, 3)})
+        self.assertEqual(set(self.callback.call_args[0][0]), {((3, 3), DIAMOND_TILE), ((3, 4), EMPTY_TILE)})
+        self.game_state.undo()
+        self.assertEqual(self.game_state.current_player_index, 0)
+        self.game_state.undo()
+        self.assertEqual(self.snapshot(), start)
+        self.assertEqual(self.game_state.undo(), (False, "Nothing to undo."))
+
+    def test_batch_is_one_undo_step(self):
+        company, _ = self.game_state.create_new_company([(0, 0)], self.player)
+        self.game_state.diamond_positions.add((2, 0))
+        before = self.snapshot()
+        with self.game_state.batch_updates():
+            self.game_state.expand_company((1, 0), company, self.player)
+            self.game_state.expand_company((2, 0), company, self.player)
+        self.game_state.undo()
+        self.assertEqual(self.snapshot(), before)
+
+    def test_new_action_clears_redo(self):
+        self.game_state.place_diamond((3, 3), self.player)
+        self.game_state.undo()
+        self.game_state.place_diamond((2, 2), self.player)
+        self.assertEqual(self.game_state.redo(), (False, "Nothing to redo."))
+
+    def test_failed_actions_are_not_recorded(self):
+        self.game_state.end_turn()  # Rejected: no move made yet
+        self.game_state.buy_shares("Nerdniss", self.player, 1)  # Rejected: no such company
+        self.assertEqual(len(self.game_state.journal), 0)
+
+    def test_clones_do_not_journal(self):
+        clone = self.game_state.clone()
+        clone.place_diamond((3, 3), self.player)
+        self.assertIsNone(clone.journal)
+        self.assertEqual(len(self.game_state.journal), 0)
+
+
+class TestTurnFlowHelpers(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False},
+            {'name': 'Player2', 'profile_username': 'Player2', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        self.player = self.game_state.players[0]
+
+    def test_expand_into_adjacent_diamonds(self):
+        first, _ = self.game_state.create_new_company([(0, 0)], self.player)
+        second, _ = self.game_state.create_new_company([(0, 2), (0, 3)], self.player)
+        self.game_state.diamond_positions.update([(0, 1), (3, 0), (4, 4)])
+
+        absorbed = self.game_state.expand_into_adjacent_diamonds(self.player)
+
+        self.assertEqual(absorbed, [((0, 1), second, True)])
+        self.assertEqual(set(self.game_state.diamond_positions), {(3, 0), (4, 4)})
+        self.assertEqual(self.game_state.company_map.size_of(second), 4)
+        self.assertNotIn(first, self.game_state.company_info)
+
+    def test_absorption_visits_diamonds_in_board_order(self):
+        behind, _ = self.game_state.create_new_company([(2, 2)], self.player)
+        ahead, _ = self.game_state.create_new_company([(4, 0)], self.player)
+        self.game_state.diamond_positions.update([(2, 0), (2, 1), (4, 1), (4, 2)])
+
+        absorbed = self.game_state.expand_into_adjacent_diamonds(self.player)
+
+        # (2, 0) is visited before (2, 1) joins a company, so it waits for the next pass;
+        # (4, 2) is visited after (4, 1) has joined one
+        self.assertEqual(absorbed, [((2, 1), behind, False), ((4, 1), ahead, False), ((4, 2), ahead, False)])
+        self.assertEqual(set(self.game_state.diamond_positions), {(2, 0)})
+        self.assertEqual(self.game_state.expand_into_adjacent_diamonds(self.player), [((2, 0), behind, False)])
+
+    def test_absorbed_diamonds_are_company_tiles_for_the_rest_of_the_pass(self):
+        first, _ = self.game_state.create_new_company([(1, 1)], self.player)
+        second, _ = self.game_state.create_new_company([(2, 3)], self.player)
+        self.game_state.diamond_positions.update([(2, 1), (2, 2), (3, 2)])
+
+        absorbed = self.game_state.expand_into_adjacent_diamonds(self.player)
+
+        # (2, 1) is part of first when (2, 2) merges the two companies, so (2, 2) touches one
+        # diamond, not two, and no company is founded from them
+        self.assertEqual(absorbed, [((2, 1), first, False), ((2, 2), first, True), ((3, 2), first, False)])
+        self.assertEqual(list(self.game_state.company_info), [first])
+        self.assertEqual(self.game_state.company_map.tiles_of(first), {(1, 1), (2, 1), (2, 2), (2, 3), (3, 2)})
+        self.assertEqual(self.game_state.company_count, 2)
+        self.assertEqual(set(self.game_state.diamond_positions), set())
+
+    def test_merger_acquirer_is_chosen_by_tiles_on_the_board(self):
+        first, _ = self.game_state.create_new_company([(0, 0), (0, 1)], self.player)
+        absorbed, _ = self.game_state.create_new_company([(0, 3)], self.player)
+        self.game_state.ai_take_turn(self.player, (0, 2))  # first takes over absorbed: 4 tiles
+        other, _ = self.game_state.create_new_company([(2, 0), (2, 1), (2, 2), (2, 3)], self.player)
+        self.assertEqual(self.game_state.company_map.size_of(first), 4)
+
+        # Sizes are counted on the board rather than read from company_info (which lags
+        # a tile behind after the merger above), and a tie goes to the first name
+        self.game_state.ai_take_turn(self.player, (1, 0))
+        self.assertEqual(self.game_state.company_map[(1, 0)]["company_name"], first)
+        self.assertEqual(list(self.game_state.company_info), [first])
+        self.assertEqual(self.game_state.company_map.size_of(first), 9)
+
+    def test_wealth_summary_counts_cash_and_shares(self):
+        company, _ = self.game_state.create_new_company([(0, 0)], self.player)  # 5 founder shares
+        value = self.game_state.company_info[company]['value']
+        self.assertEqual(self.game_state.wealth_summary(), {'Player1': 6000 + 5 * value, 'Player2': 6000})
+
+    def test_random_o_marker_locations(self):
+        locations = random_o_marker_locations((10, 10), 0.1, random.Random(5))
+        self.assertEqual(len(locations), 10)
+        self.assertEqual(locations, random_o_marker_locations((10, 10), 0.1, random.Random(5)))
+        self.assertTrue(all(0 <= r < 10 and 0 <= c < 10 for r, c in locations))
+
+
+
+class TestLegalMoves(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False},
+            {'name': 'Player2', 'profile_username': 'Player2', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        self.player = self.game_state.players[0]
+        self.first, _ = self.game_state.create_new_company([(0, 0)], self.player)
+        self.second, _ = self.game_state.create_new_company([(0, 2), (0, 3)], self.player)
+        self.game_state.diamond_positions.add((4, 4))
+
+    def test_cells_are_classified(self):
+        moves = self.game_state.legal_moves()
+        self.assertEqual(moves[(0, 1)], LegalMove((0, 1), MOVE_MERGE, tuple(sorted([self.first, self.second]))))
+        self.assertEqual(moves[(1, 3)], LegalMove((1, 3), MOVE_EXPAND, (self.second,)))
+        self.assertEqual(moves[(3, 4)].kind, MOVE_FOUND)  # Next to the diamond
+        self.assertEqual(moves[(5, 0)].kind, MOVE_DIAMOND)
+        self.assertNotIn((0, 0), moves)
+        self.assertNotIn((4, 4), moves)
+        self.assertEqual(len(moves), self.game_state.board.empty_count())
+        self.assertEqual(list(moves), sorted(moves))
+
+    def test_no_company_names_left_means_diamonds(self):
+        self.game_state.available_company_names.clear()
+        self.assertEqual(self.game_state.legal_moves()[(3, 4)].kind, MOVE_DIAMOND)
+        self.assertEqual(self.game_state.legal_move_at((1, 3)).kind, MOVE_EXPAND)
+
+    def test_cache_lasts_until_the_board_changes(self):
+        moves = self.game_state.legal_moves()
+        self.assertIs(self.game_state.legal_moves(), moves)
+        self.game_state.expand_company((1, 3), self.second, self.player)
+        updated = self.game_state.legal_moves()
+        self.assertIsNot(updated, moves)
+        self.assertNotIn((1, 3), updated)
+        self.assertEqual(updated[(2, 3)].companies, (self.second,))
+
+    def test_merger_invalidates_the_cache(self):
+        self.game_state.create_new_company([(2, 0)], self.player)
+        self.game_state.legal_moves()
+        self.game_state.merge_companies((1, 0), self.game_state.get_adjacent_companies((1, 0)), self.player)
+        self.assertEqual(self.game_state.legal_moves()[(1, 1)].companies, (self.game_state.company_map.company_at((0, 0)),))
+
+    def test_legal_move_at(self):
+        self.assertIsNone(self.game_state.legal_move_at((0, 0)))
+        self.assertIsNone(self.game_state.legal_move_at((9, 9)))
+        self.assertEqual(self.game_state.legal_move_at((0, 1)).kind, MOVE_MERGE)
+        self.game_state.legal_moves()
+        self.assertIs(self.game_state.legal_move_at((0, 1)), self.game_state.legal_moves()[(0, 1)])
+
+    def test_vectorized_pass_matches_per_cell_pass(self):
+        rng = random.Random(8)
+        self.game_state.rng = rng
+        for _ in range(25):
+            player = self.game_state.players[self.game_state.current_player_index]
+            self.game_state.ai_take_turn(player)
+            self.game_state.expand_into_adjacent_diamonds(player)
+            self.game_state.end_turn()
+            vectorized = dict(self.game_state.legal_moves())
+            with patch.object(game_logic, 'np', None):
+                self.game_state._legal_moves_key = None
+                self.assertEqual(self.game_state.legal_moves(), vectorized)
+
+    def test_ai_rejects_an_occupied_cell(self):
+        self.game_state.player_has_moved[self.player] = False
+        selected_cell, _ = self.game_state.ai_take_turn(self.player, (0, 0))
+        self.assertIsNone(selected_cell)
+        self.assertFalse(self.game_state.player_has_moved[self.player])
+
+class TestNetWorthLedger(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': name, 'profile_username': None, 'type': 'AI (Easy)', 'is_new_profile': False}
+            for name in ('Player1', 'Player2', 'Player3')
+        ]
+        self.game_state = GameState(self.player_configurations, (9, 9), self.mock_script_dir)
+
+    def recomputed(self):
+        summary = dict(self.game_state.player_wealth)
+        for player, shares in self.game_state.player_shares.items():
+            for company, num_shares in shares.items():
+                summary[player] += num_shares * self.game_state.company_info[company]['value']
+        return summary
+
+    def test_ledger_follows_trades_mergers_and_undo(self):
+        rng = random.Random(3)
+        self.game_state.rng = rng
+        for _ in range(70):
+            player = self.game_state.players[self.game_state.current_player_index]
+            with self.game_state.batch_updates():
+                self.game_state.ai_take_turn(player)
+                self.game_state.expand_into_adjacent_diamonds(player)
+            if self.game_state.company_info and rng.random() < 0.6:
+                company = rng.choice(sorted(self.game_state.company_info))
+                self.game_state.buy_shares(company, player, rng.randint(1, 5))
+                self.game_state.sell_shares(company, player, 1)
+                if rng.random() < 0.3:
+                    self.game_state.undo()
+                    self.assertEqual(self.game_state.wealth_summary(), self.recomputed())
+                    self.game_state.redo()
+            self.game_state.end_turn()
+            self.assertEqual(self.game_state.wealth_summary(), self.recomputed())
+            for player in self.game_state.players:
+                self.assertEqual(self.game_state.net_worth(player), self.recomputed()[player])
+        self.assertGreater(self.game_state.merger_count, 0)
+        self.assertEqual(self.game_state.clone().wealth_summary(), self.recomputed())
+
+    def test_share_split_keeps_net_worth(self):
+        company, _ = self.game_state.create_new_company([(0, 0)], 'Player1')
+        self.game_state.buy_shares(company, 'Player2', 3)
+        for row in range(4):
+            for col in range(9):
+                if (row, col) not in self.game_state.company_map:
+                    self.game_state.expand_company((row, col), company, 'Player1')
+                    self.assertEqual(self.game_state.wealth_summary(), self.recomputed())
+        self.assertGreater(self.game_state.player_shares['Player2'][company], 3)  # Split at least once
+
+    def test_standings_rank_by_net_worth(self):
+        company, _ = self.game_state.create_new_company([(0, 0)], 'Player2')
+        self.game_state.player_wealth['Player3'] += 1
+        standings = self.game_state.standings()
+        self.assertEqual([player for player, _ in standings], ['Player2', 'Player3', 'Player1'])
+        self.assertEqual(standings[0][1], 6000 + 5 * self.game_state.company_info[company]['value'])
+
+    def test_recompute_after_direct_edits(self):
+        company, _ = self.game_state.create_new_company([(0, 0)], 'Player1')
+        self.game_state.player_shares['Player3'][company] = 7
+        self.game_state.recompute_holdings_value()
+        self.assertEqual(self.game_state.wealth_summary(), self.recomputed())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import io
+import os
+import random
+import tempfile
+
+# Assuming game_record.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from game_record import (
+    CHECKPOINT, PLACE, RECORD, RECORD_SIZE, GameRecorder, GameRecordHeader, ReplayError, list_game_records,
+    read_records, replay, state_hash,
+)
+from headless import ai_player_configurations, new_game, play_game, play_turn
+from journal import Journal
+
+
+class TestGameRecord(unittest.TestCase):
+    def setUp(self):
+        self.player_configurations = ai_player_configurations(3, ["AI (Easy)", "AI (Medium)", "AI (Easy)"])
+
+    def assert_same_game(self, game_state, replayed):
+        self.assertEqual(replayed.turn_counter, game_state.turn_counter)
+        self.assertEqual(bytes(replayed.board.cells), bytes(game_state.board.cells))
+        self.assertEqual(replayed.zobrist_hash(), game_state.zobrist_hash())
+        self.assertEqual(replayed.player_wealth, game_state.player_wealth)
+        self.assertEqual(replayed.wealth_summary(), game_state.wealth_summary())
+
+    def test_recorded_game_replays_to_the_same_state(self):
+        result = play_game(self.player_configurations, (16, 12), turn_limit=80, seed=4, record=True)
+        replayed = replay(result.record)
+        self.assertEqual(replayed.turn_counter, result.turns)
+        self.assertEqual(replayed.wealth_summary(), result.wealth)
+        self.assertEqual(replayed.merger_count, result.mergers)
+
+    def test_header_round_trip(self):
+        game_state = new_game(self.player_configurations, (9, 7), 0.1, random.Random(1))
+        header = GameRecorder(game_state, seed=99, turn_limit=50, checkpoint_interval=4).header
+        read_back = GameRecordHeader.read(io.BytesIO(header.to_bytes()))
+        self.assertEqual(read_back.seed, 99)
+        self.assertEqual(read_back.grid_size, (9, 7))
+        self.assertEqual(read_back.turn_limit, 50)
+        self.assertEqual(read_back.checkpoint_interval, 4)
+        self.assertEqual(read_back.player_configurations, header.player_configurations)
+        self.assertEqual(read_back.new_game().initial_o_marker_locations, game_state.initial_o_marker_locations)
+        self.assertIsNone(GameRecordHeader.read(io.BytesIO(GameRecorder(game_state).header.to_bytes())).seed)
+
+    def test_trades_and_checkpoints_are_replayed(self):
+        game_state = new_game(self.player_configurations, (10, 10), 0.1, random.Random(6))
+        game_state.recorder = GameRecorder(game_state, checkpoint_interval=3)
+        for turn in range(30):
+            play_turn(game_state)
+            if game_state.company_info and turn % 4 == 0:
+                player = game_state.players[game_state.current_player_index]
+                company = sorted(game_state.company_info)[0]
+                game_state.buy_shares(company, player, 2)
+                game_state.sell_shares(company, player, 1)
+        data = game_state.recorder.to_bytes()
+        kinds = [record[0] for record in read_records(io.BytesIO(game_state.recorder.records()))]
+        self.assertEqual(kinds.count(CHECKPOINT), 10)
+        self.assert_same_game(game_state, replay(io.BytesIO(data)))
+
+    def test_checkpoint_mismatch_is_reported(self):
+        result = play_game(self.player_configurations, (10, 10), turn_limit=20, seed=8, record=True)
+        data = bytearray(result.record)
+        header_size = len(GameRecordHeader.read(io.BytesIO(result.record)).to_bytes())
+        for offset in range(header_size, len(data), RECORD_SIZE):
+            kind, player, argument, value = RECORD.unpack_from(data, offset)
+            if kind == CHECKPOINT:
+                RECORD.pack_into(data, offset, kind, player, argument, value ^ 1)
+                break
+        with self.assertRaises(ReplayError):
+            replay(bytes(data))
+        self.assertEqual(replay(bytes(data), verify=False).turn_counter, 20)
+
+    def test_undo_and_redo_keep_the_record_in_step(self):
+        game_state = new_game(self.player_configurations, (8, 8), 0.1, random.Random(3))
+        game_state.journal = Journal()
+        game_state.recorder = GameRecorder(game_state)
+        for _ in range(6):
+            play_turn(game_state)
+        length = len(game_state.recorder)
+
+        player = game_state.players[game_state.current_player_index]
+        with game_state.batch_updates():
+            game_state.ai_take_turn(player)
+            game_state.expand_into_adjacent_diamonds(player)
+        self.assertEqual(len(game_state.recorder), length + 1)
+        game_state.undo()
+        self.assertEqual(len(game_state.recorder), length)
+        game_state.redo()
+        self.assertEqual(len(game_state.recorder), length + 1)
+        self.assertEqual(RECORD.unpack(game_state.recorder.records()[-RECORD_SIZE:])[0], PLACE)
+        game_state.end_turn()
+        self.assert_same_game(game_state, replay(game_state.recorder.to_bytes()))
+
+        # A different move after an undo replaces the undone one
+        player = game_state.players[game_state.current_player_index]
+        with game_state.batch_updates():
+            game_state.ai_take_turn(player)
+        game_state.undo()
+        with game_state.batch_updates():
+            game_state.ai_take_turn(player)
+            game_state.expand_into_adjacent_diamonds(player)
+        game_state.end_turn()
+        self.assert_same_game(game_state, replay(game_state.recorder.to_bytes()))
+
+    def test_replay_can_stop_at_a_turn(self):
+        result = play_game(self.player_configurations, (12, 12), turn_limit=40, seed=2, record=True)
+        partial = replay(result.record, until_turn=25)
+        self.assertEqual(partial.turn_counter, 25)
+
+    def test_records_are_compact(self):
+        result = play_game(ai_player_configurations(4), turn_limit=80, seed=5, record=True)
+        # Two records per turn plus checkpoints, after a header dominated by the marker layout
+        self.assertLess(len(result.record), 1000 + 80 * 2 * RECORD_SIZE)
+        clone = play_game(ai_player_configurations(4), turn_limit=80, seed=5, record=True)
+        self.assertEqual(clone.record, result.record)
+        self.assertEqual(state_hash(replay(result.record)), state_hash(replay(clone.record)))
+
+    def test_saved_records_are_listed_newest_first(self):
+        game_state = new_game(self.player_configurations, (8, 8), 0.1, random.Random(4))
+        recorder = GameRecorder(game_state)
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(list_game_records(directory), [])
+            first = recorder.save(directory)
+            second = recorder.save(directory)
+            os.utime(first, (1, 1))
+            self.assertEqual(list_game_records(directory), [second, first])
+        self.assertEqual(list_game_records(os.path.join(directory, 'missing')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
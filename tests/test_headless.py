@@ -0,0 +1,51 @@
+import unittest
+import os
+
+# Assuming headless.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from headless import ai_player_configurations, new_game, parse_grid_size, play_game, play_turn
+import random
+
+
+class TestHeadlessGames(unittest.TestCase):
+    def setUp(self):
+        self.player_configurations = ai_player_configurations(3)
+
+    def test_game_stops_at_turn_limit(self):
+        result = play_game(self.player_configurations, (16, 12), turn_limit=30, seed=7)
+        self.assertEqual(result.turns, 30)
+        self.assertEqual(result.moves, 30)
+        self.assertEqual(set(result.wealth), {p['name'] for p in self.player_configurations})
+        self.assertEqual(result.winner, max(result.wealth, key=result.wealth.get))
+
+    def test_seed_replays_the_same_game(self):
+        first = play_game(self.player_configurations, (16, 12), turn_limit=60, seed=42)
+        second = play_game(self.player_configurations, (16, 12), turn_limit=60, seed=42)
+        self.assertEqual(first.wealth, second.wealth)
+        self.assertEqual(first.winner, second.winner)
+
+    def test_full_board_ends_the_game(self):
+        result = play_game(self.player_configurations, (4, 4), turn_limit=1000, marker_percentage=0.25, seed=3)
+        self.assertLess(result.moves, 1000)
+        self.assertLessEqual(result.moves, 4 * 4 - 4)
+
+    def test_play_turn_absorbs_diamonds_and_passes_the_turn(self):
+        game_state = new_game(self.player_configurations, (6, 6), 0.0, random.Random(0))
+        player = game_state.players[0]
+        company, _ = game_state.create_new_company([(0, 0)], player)
+        game_state.diamond_positions.add((1, 0))
+        game_state.player_has_moved[player] = False
+
+        play_turn(game_state)
+
+        self.assertNotIn((1, 0), game_state.diamond_positions)
+        self.assertEqual(game_state.company_map[(1, 0)]['company_name'], company)
+        self.assertEqual(game_state.current_player_index, 1)
+
+    def test_parse_grid_size(self):
+        self.assertEqual(parse_grid_size("28x24"), (28, 24))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import os
+import random
+
+# Assuming holdings.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from game_logic import COMPANY_NAMES
+from headless import ai_player_configurations, new_game, play_turn
+from holdings import HoldingsMatrix, SharesByPlayer
+
+
+class TestHoldingsMatrix(unittest.TestCase):
+    def setUp(self):
+        self.players = ['Ann', 'Bo', 'Cy']
+        self.holdings = HoldingsMatrix(self.players, COMPANY_NAMES)
+        self.player_shares = SharesByPlayer(self.holdings)
+
+    def test_ids_follow_seats_and_company_names(self):
+        self.assertEqual(self.holdings.player_ids, {'Ann': 0, 'Bo': 1, 'Cy': 2})
+        self.assertEqual([self.holdings.company_id(name) for name in COMPANY_NAMES], list(range(len(COMPANY_NAMES))))
+        self.assertEqual(self.holdings.company_id('Extra'), len(COMPANY_NAMES))
+        self.assertEqual(len(self.holdings.counts), 3 * (len(COMPANY_NAMES) + 1))
+
+    def test_column_operations(self):
+        pacifica, nerdniss = self.holdings.company_id('Pacifica'), self.holdings.company_id('Nerdniss')
+        self.holdings.set(0, pacifica, 5)
+        self.holdings.set(2, pacifica, 3)
+        self.holdings.set(2, nerdniss, 4)
+        self.holdings.scale_column(pacifica, 2)
+        self.assertEqual(list(self.holdings.column(pacifica)), [10, 0, 6])
+        self.holdings.add_column(pacifica, nerdniss)
+        self.assertEqual(list(self.holdings.column(pacifica)), [0, 0, 0])
+        self.assertEqual(list(self.holdings.column(nerdniss)), [10, 0, 10])
+
+    def test_counts_outgrowing_int64_switch_to_python_ints(self):
+        pacifica, nerdniss = self.holdings.company_id('Pacifica'), self.holdings.company_id('Nerdniss')
+        self.holdings.set(1, pacifica, 5)
+        self.holdings.set(1, nerdniss, 2 ** 62)
+        for _ in range(70):
+            self.holdings.scale_column(pacifica, 2)
+        self.assertEqual(self.holdings.get(1, pacifica), 5 * 2 ** 70)
+        self.holdings.add_column(nerdniss, pacifica)
+        self.assertEqual(self.player_shares['Bo'], {'Pacifica': 5 * 2 ** 70 + 2 ** 62})
+        self.holdings.add(1, pacifica, 2 ** 64)
+        self.player_shares['Bo'] = {'StronCannon': 3}
+        self.assertEqual(self.holdings.copy().get(1, self.holdings.company_id('StronCannon')), 3)
+
+    def test_views_read_and_write_like_dicts(self):
+        ann = self.player_shares['Ann']
+        ann['Pacifica'] = 4
+        ann['Nerdniss'] = ann.get('Nerdniss', 0) + 2
+        self.assertEqual(ann, {'Nerdniss': 2, 'Pacifica': 4})
+        self.assertIn('Pacifica', ann)
+        self.assertNotIn('Beetleguice', ann)
+        self.assertEqual(ann.pop('Pacifica'), 4)
+        ann['Nerdniss'] -= 2  # A count of 0 drops out
+        self.assertEqual(len(ann), 0)
+        with self.assertRaises(KeyError):
+            del ann['Nerdniss']
+
+        self.player_shares['Bo'] = {'StronCannon': 7, 'NewCorp': 1}
+        self.assertEqual(dict(self.player_shares['Bo'].items()), {'StronCannon': 7, 'NewCorp': 1})
+        self.player_shares['Bo'] = {'Pacifica': 1}
+        self.assertEqual(self.player_shares['Bo'].copy(), {'Pacifica': 1})
+        self.assertEqual(list(self.player_shares), self.players)
+
+    def test_copy_is_independent(self):
+        self.player_shares['Cy']['Pacifica'] = 3
+        clone = self.holdings.copy()
+        clone.set(2, clone.company_id('Pacifica'), 9)
+        clone.company_id('Extra')
+        self.assertEqual(self.player_shares['Cy']['Pacifica'], 3)
+        self.assertNotIn('Extra', self.holdings.company_ids)
+
+
+class TestGameStateHoldings(unittest.TestCase):
+    def test_player_shares_match_the_matrix_through_a_game(self):
+        game_state = new_game(ai_player_configurations(4), (9, 9), 0.1, random.Random(12))
+        holdings = game_state.holdings
+        for _ in range(70):
+            play_turn(game_state)
+            for player, player_id in holdings.player_ids.items():
+                expected = {name: holdings.get(player_id, company_id)
+                            for name, company_id in holdings.company_ids.items() if holdings.get(player_id, company_id)}
+                self.assertEqual(game_state.player_shares[player], expected)
+            # Shares only exist in active companies
+            for name, company_id in holdings.company_ids.items():
+                if name not in game_state.company_info:
+                    self.assertFalse(any(holdings.column(company_id)))
+        self.assertGreater(game_state.merger_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
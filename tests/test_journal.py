@@ -0,0 +1,42 @@
+import unittest
+import os
+
+# Assuming journal.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from journal import MISSING, Journal, JournalEntry, diff_ledgers
+
+
+class TestJournal(unittest.TestCase):
+    def test_history_is_bounded(self):
+        journal = Journal(limit=3)
+        for turn in range(10):
+            journal.record(JournalEntry("end_turn", turn, [], []))
+        self.assertEqual(len(journal), 3)
+        self.assertEqual([journal.pop_undo().turn for _ in range(3)], [9, 8, 7])
+        self.assertFalse(journal.can_undo())
+
+    def test_recording_clears_redo(self):
+        journal = Journal()
+        journal.record(JournalEntry("buy_shares", 0, [], []))
+        entry = journal.pop_undo()
+        self.assertIs(journal.peek_redo(), entry)
+        self.assertIs(journal.pop_redo(), entry)
+        journal.pop_undo()
+        journal.record(JournalEntry("sell_shares", 0, [], []))
+        self.assertFalse(journal.can_redo())
+
+
+class TestDiffLedgers(unittest.TestCase):
+    def test_only_changed_keys_are_kept(self):
+        before = {('wealth', 'P1'): 6000, ('wealth', 'P2'): 6000, ('shares', 'P1', 'Corp'): 5}
+        after = {('wealth', 'P1'): 5800, ('wealth', 'P2'): 6000, ('shares', 'P2', 'Corp'): 2}
+        self.assertEqual(sorted(diff_ledgers(before, after), key=repr), sorted([
+            (('wealth', 'P1'), 6000, 5800),
+            (('shares', 'P1', 'Corp'), 5, MISSING),
+            (('shares', 'P2', 'Corp'), MISSING, 2),
+        ], key=repr))
+
+
+if __name__ == '__main__':
+    unittest.main()
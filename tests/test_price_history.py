@@ -0,0 +1,124 @@
+import unittest
+import os
+import random
+
+# Assuming price_history.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from game_logic import GameState
+from headless import ai_player_configurations, new_game
+from journal import Journal
+from price_history import PriceHistory, PriceRing
+
+
+class TestPriceRing(unittest.TestCase):
+    def test_keeps_the_latest_prices_in_fixed_space(self):
+        ring = PriceRing(capacity=4)
+        self.assertIsNone(ring.latest())
+        for turn in range(10):
+            ring.append(turn, 100 * (turn + 1))
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(ring.entries(), [(6, 700), (7, 800), (8, 900), (9, 1000)])
+        self.assertEqual(ring.latest(), (9, 1000))
+        self.assertEqual(len(ring.prices), 4)
+
+    def test_unchanged_prices_are_not_repeated(self):
+        ring = PriceRing(capacity=8)
+        self.assertTrue(ring.append(1, 300))
+        self.assertFalse(ring.append(2, 300))
+        self.assertTrue(ring.append(2, 400))
+        self.assertEqual(ring.entries(), [(1, 300), (2, 400)])
+
+    def test_rewinding_drops_entries_the_ring_overwrote(self):
+        ring = PriceRing(capacity=4)
+        for turn in range(6):
+            ring.append(turn, turn + 1)
+        ring.end = 3  # As undo would
+        self.assertEqual(ring.entries(), [(2, 3)])  # Entries 0 and 1 were overwritten by 4 and 5
+        ring.end = 6  # Redo
+        self.assertEqual(ring.entries(), [(2, 3), (3, 4), (4, 5), (5, 6)])
+        ring.end = 4
+        ring.append(9, 99)
+        self.assertEqual(ring.entries(), [(2, 3), (3, 4), (9, 99)])
+
+
+class TestGameStatePriceHistory(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False},
+            {'name': 'Player2', 'profile_username': 'Player2', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (9, 9), self.mock_script_dir)
+
+    def test_values_and_splits_are_recorded(self):
+        company, _ = self.game_state.create_new_company([(0, 0)], 'Player1')
+        self.game_state.turn_counter = 3
+        self.game_state.expand_company((0, 1), company, 'Player1')
+        self.assertEqual(self.game_state.price_history[company].entries(), [(0, 100), (3, 200)])
+        for col in range(2, 9):
+            for row in range(5):
+                if (row, col) not in self.game_state.company_map:
+                    self.game_state.expand_company((row, col), company, 'Player1')
+        prices = [price for _, price in self.game_state.price_history[company].entries()]
+        split = prices.index(3200)
+        self.assertEqual(prices[split + 1], 1600)  # The split halved it
+        self.assertEqual(prices[-1], self.game_state.company_info[company]['value'])
+
+    def test_merger_records_the_acquirer_and_reused_names_start_over(self):
+        first, _ = self.game_state.create_new_company([(0, 0), (0, 1)], 'Player1')
+        second, _ = self.game_state.create_new_company([(0, 3)], 'Player2')
+        self.game_state.expand_company((0, 2), first, 'Player1')  # Merges second into first
+        self.assertNotIn(second, self.game_state.company_info)
+        self.assertEqual(self.game_state.price_history[first].latest()[1], 400)
+
+        for name in list(self.game_state.available_company_names):
+            if name == second:
+                break
+            self.game_state.create_new_company([(5, len(self.game_state.company_info) * 2)], 'Player1')
+        reused, _ = self.game_state.create_new_company([(8, 8)], 'Player2')
+        self.assertEqual(reused, second)
+        self.assertEqual(self.game_state.price_history[second].entries(), [(0, 100)])
+
+    def test_undo_redo_and_clones(self):
+        game_state = new_game(ai_player_configurations(3), (9, 9), 0.1, random.Random(4))
+        game_state.journal = Journal()
+        rng = random.Random(9)
+        for _ in range(60):
+            player = game_state.players[game_state.current_player_index]
+            before = {name: ring.entries() for name, ring in game_state.price_history.items()}
+            clone = game_state.clone()
+            with game_state.batch_updates():
+                game_state.ai_take_turn(player)
+                game_state.expand_into_adjacent_diamonds(player)
+            after = {name: ring.entries() for name, ring in game_state.price_history.items()}
+            for name, info in game_state.company_info.items():
+                self.assertEqual(game_state.price_history[name].latest()[1], info['value'])
+            self.assertEqual({name: ring.entries() for name, ring in clone.price_history.items()}, before)
+            if rng.random() < 0.5:
+                game_state.undo()
+                undone = {name: ring.entries() for name, ring in game_state.price_history.items() if len(ring)}
+                self.assertEqual(undone.keys(), {name for name, entries in before.items() if entries})
+                for name, entries in undone.items():
+                    # Entries the turn's prices overwrote in the ring are gone, the rest are back
+                    self.assertEqual(entries, before[name][len(before[name]) - len(entries):])
+                    self.assertEqual(entries[-1], before[name][-1])
+                game_state.redo()
+                self.assertEqual({name: ring.entries() for name, ring in game_state.price_history.items()}, after)
+            game_state.end_turn()
+        self.assertGreater(game_state.merger_count, 0)
+
+    def test_history_capacity_is_fixed(self):
+        history = PriceHistory(capacity=3)
+        for turn in range(50):
+            history.record('Pacifica', turn, turn * 100)
+        self.assertEqual(len(history['Pacifica']), 3)
+        self.assertEqual(len(history['Pacifica'].turns), 3)
+        copy = history.copy()
+        copy.record('Pacifica', 50, 1)
+        self.assertEqual(history['Pacifica'].latest(), (49, 4900))
+        self.assertEqual(copy['Pacifica'].latest(), (50, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import random
+
+# Assuming replay_viewer.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from game_logic import EMPTY_TILE
+from game_record import replay
+from headless import ai_player_configurations, play_game
+from replay_viewer import ReplayTimeline, board_updates
+
+
+class TestReplayTimeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        configurations = ai_player_configurations(3, ["AI (Easy)", "AI (Medium)", "AI (Easy)"])
+        cls.record = play_game(configurations, (14, 12), turn_limit=60, seed=7, record=True).record
+
+    def assert_board_matches(self, timeline, board_view, turn):
+        expected = replay(self.record, until_turn=turn)
+        game_state = timeline.game_state
+        self.assertEqual(game_state.turn_counter, turn)
+        self.assertEqual(bytes(game_state.board.cells), bytes(expected.board.cells))
+        self.assertEqual(game_state.zobrist_hash(), expected.zobrist_hash())
+        # The updates seen so far draw the same board as the replayed game
+        cells = expected.cell_updates(range(len(expected.board.cells)))
+        self.assertEqual({coords: name for coords, name in board_view.items() if name is not EMPTY_TILE},
+                         {coords: name for coords, name in cells if name is not EMPTY_TILE})
+
+    def test_seeking_in_any_order(self):
+        timeline = ReplayTimeline(self.record, keyframe_interval=5)
+        self.assertEqual(timeline.last_turn, 60)
+        board_view = {}
+        rng = random.Random(2)
+        turns = [rng.randrange(timeline.last_turn + 1) for _ in range(25)] + [60, 0, 59, 60, 1, 2, 3]
+        for turn in turns:
+            board_view.update(timeline.seek(turn))
+            self.assertEqual(timeline.turn, turn)
+            self.assert_board_matches(timeline, board_view, turn)
+
+    def test_stepping_reports_only_changed_cells(self):
+        timeline = ReplayTimeline(self.record)
+        board_view = {}
+        for turn in range(1, 11):
+            updated_entries = timeline.step()
+            self.assertTrue(updated_entries)
+            self.assertEqual(len(updated_entries), len(dict(updated_entries)))
+            board_view.update(updated_entries)
+            self.assert_board_matches(timeline, board_view, turn)
+        self.assertEqual(timeline.seek(10), [])
+        timeline.seek(100)
+        self.assertEqual(timeline.turn, timeline.last_turn)
+        self.assertEqual(timeline.seek(timeline.last_turn), [])
+
+    def test_keyframes_are_not_changed_by_seeking(self):
+        timeline = ReplayTimeline(self.record, keyframe_interval=4)
+        timeline.seek(60)
+        timeline.seek(9)
+        start = replay(self.record, until_turn=0)
+        timeline.seek(0)
+        self.assertEqual(bytes(timeline.game_state.board.cells), bytes(start.board.cells))
+        self.assertEqual(timeline.o_marker_locations, set(start.initial_o_marker_locations))
+
+    def test_board_updates_between_positions(self):
+        before = replay(self.record, until_turn=20)
+        after = replay(self.record, until_turn=30)
+        updated_entries = board_updates(before, after)
+        self.assertEqual(board_updates(after, after), [])
+        changed = {after.board.index_of(coords) for coords, _ in updated_entries}
+        for index in range(len(after.board.cells)):
+            if index not in changed:
+                self.assertEqual(before.board.cells[index], after.board.cells[index])
+
+
+if __name__ == '__main__':
+    unittest.main()
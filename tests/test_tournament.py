@@ -0,0 +1,58 @@
+import unittest
+import os
+
+# Assuming tournament.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from headless import GameResult, ai_player_configurations, play_game
+from tournament import TournamentStats, game_seed, run_tournament
+
+
+class TestTournamentStats(unittest.TestCase):
+    def test_streaming_aggregate(self):
+        players = ['A', 'B']
+        stats = TournamentStats(players)
+        stats.add(GameResult(1, players, {'A': 9000, 'B': 6000}, 'A', 80, 80, 2))
+        stats.add(GameResult(2, players, {'A': 7000, 'B': 12000}, 'B', 80, 80, 0))
+        stats.add(GameResult(3, players, {'A': 11000, 'B': 6000}, 'A', 80, 80, 1))
+
+        self.assertEqual(stats.wins_by_seat, [2, 1])
+        self.assertAlmostEqual(stats.win_rates()['A'], 2 / 3)
+        self.assertEqual(stats.wealth_count, 6)
+        self.assertEqual((stats.wealth_min, stats.wealth_max), (6000, 12000))
+        self.assertAlmostEqual(stats.wealth_mean(), 51000 / 6)
+        self.assertEqual(stats.wealth_histogram, {5000: 4, 10000: 2})
+        self.assertEqual(stats.merger_histogram, {2: 1, 0: 1, 1: 1})
+        self.assertEqual(stats.mergers_per_game(), 1.0)
+        self.assertTrue(stats.report())
+
+
+class TestRunTournament(unittest.TestCase):
+    def setUp(self):
+        self.player_configurations = ai_player_configurations(2)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        sequential = run_tournament(8, self.player_configurations, (10, 8), 40, 0.1, base_seed=5, workers=1)
+        parallel = run_tournament(8, self.player_configurations, (10, 8), 40, 0.1, base_seed=5, workers=2,
+                                  chunksize=1)
+        self.assertEqual(sequential.games, 8)
+        self.assertEqual(vars(sequential), vars(parallel))
+
+    def test_games_replay_from_their_seed(self):
+        seen = []
+        run_tournament(3, self.player_configurations, (10, 8), 40, 0.1, base_seed=9, workers=1,
+                       on_result=seen.append)
+        replay = play_game(self.player_configurations, (10, 8), 40, 0.1, seed=game_seed(9, 2))
+        self.assertEqual(seen[2].seed, game_seed(9, 2))
+        self.assertEqual(seen[2].wealth, replay.wealth)
+
+    def test_hard_seats_are_reproducible(self):
+        configurations = ai_player_configurations(2, ["AI (Hard)", "AI (Easy)"])
+        runs = [run_tournament(2, configurations, (8, 8), 8, 0.1, base_seed=5, workers=workers, chunksize=1)
+                for workers in (1, 1, 2)]
+        self.assertEqual(vars(runs[0]), vars(runs[1]))
+        self.assertEqual(vars(runs[0]), vars(runs[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import threading
+
+# Assuming transposition.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from transposition import TranspositionTable
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(capacity=3)
+
+    def test_lookup_counts_hits_and_misses(self):
+        self.assertIsNone(self.table.lookup(1))
+        self.table.store(1, "one")
+        self.assertEqual(self.table.lookup(1), "one")
+        self.assertEqual((self.table.hits, self.table.misses), (1, 1))
+        self.assertEqual(self.table.hit_rate(), 0.5)
+        self.assertIn(1, self.table)
+        self.assertEqual((self.table.hits, self.table.misses), (1, 1))  # Membership tests are not counted
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for key in (1, 2, 3):
+            self.table.store(key, key)
+        self.table.lookup(1)      # 2 is now the least recently used
+        self.table.store(4, 4)
+        self.assertEqual(len(self.table), 3)
+        self.assertNotIn(2, self.table)
+        self.assertIn(1, self.table)
+        self.assertEqual(self.table.evictions, 1)
+
+    def test_deeper_entries_are_kept(self):
+        self.assertTrue(self.table.store(1, "deep", depth=5))
+        self.assertFalse(self.table.store(1, "shallow", depth=2))
+        self.assertEqual(self.table.lookup(1), "deep")
+        self.assertTrue(self.table.store(1, "deeper", depth=5))
+        self.assertEqual(self.table.depth_of(1), 5)
+        self.assertEqual(self.table.depth_of(9), -1)
+
+    def test_clear(self):
+        self.table.store(1, 1)
+        self.table.lookup(1)
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+        self.assertEqual(self.table.hits, 0)
+
+    def test_concurrent_searches_share_the_table(self):
+        table = TranspositionTable(capacity=64)
+
+        def search(offset):
+            for key in range(offset, offset + 5000):
+                table.lookup(key % 100)
+                table.store(key % 100, key)
+
+        threads = [threading.Thread(target=search, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(table), 64)
+        self.assertEqual(table.hits + table.misses, 20000)
+
+    def test_capacity_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(capacity=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import os
+import random
+
+# Assuming zobrist.py is in the parent directory relative to the 'tests' directory
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from board import COMPANY, DIAMOND, EMPTY, Board, CompanyMap, DiamondPositions
+from game_logic import GameState
+from journal import Journal
+from zobrist import SHARE_BUCKET, cell_keys, company_key, holding_key, name_key, tile_keys
+
+
+class TestZobristKeys(unittest.TestCase):
+    def test_keys_are_fixed(self):
+        self.assertIs(cell_keys((4, 5)), cell_keys((4, 5)))
+        self.assertEqual(list(cell_keys((4, 5))[EMPTY]), [0] * 20)
+        self.assertEqual(len(set(cell_keys((4, 5))[COMPANY]) | set(tile_keys((4, 5)))), 40)
+        # blake2b, not the per-process salted hash()
+        self.assertEqual(name_key("Nerdniss"), 0x2e4c7b6a663db801)
+
+    def test_board_hash_follows_cell_states(self):
+        board = Board((4, 4))
+        diamonds = DiamondPositions(board)
+        diamonds.add((1, 1))
+        self.assertEqual(board.zobrist, cell_keys((4, 4))[DIAMOND][5])
+        diamonds.discard((1, 1))
+        self.assertEqual(board.zobrist, 0)
+
+    def test_company_hash_ignores_tile_order(self):
+        maps = []
+        for order in ([(0, 0), (0, 1), (1, 1)], [(1, 1), (0, 0), (0, 1)]):
+            company_map = CompanyMap(Board((3, 3)))
+            for coords in order:
+                company_map.add_tile(coords, "Corp", "P1")
+            maps.append(company_map)
+        self.assertEqual(maps[0].zobrist, maps[1].zobrist)
+        keys = tile_keys((3, 3))
+        self.assertEqual(maps[0].zobrist, company_key("Corp", (keys[0] + keys[1] + keys[4]) % 2 ** 64))
+
+    def test_merger_hashes_like_a_company_built_whole(self):
+        merged = CompanyMap(Board((3, 3)))
+        merged.add_tile((0, 0), "Big", "P1")
+        merged.add_tile((0, 1), "Big", "P1")
+        merged.add_tile((0, 2), "Small", "P2")
+        merged.absorb_company("Small", "Big")
+
+        built = CompanyMap(Board((3, 3)))
+        for coords in [(0, 0), (0, 1), (0, 2)]:
+            built.add_tile(coords, "Big", "P1")
+        self.assertEqual(merged.zobrist, built.zobrist)
+
+
+class TestGameStateZobristHash(unittest.TestCase):
+    def setUp(self):
+        self.mock_script_dir = os.path.dirname(__file__)
+        self.player_configurations = [
+            {'name': 'Player1', 'profile_username': 'Player1', 'type': 'Human', 'is_new_profile': False},
+            {'name': 'Player2', 'profile_username': 'Player2', 'type': 'Human', 'is_new_profile': False}
+        ]
+        self.game_state = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        self.player = self.game_state.players[0]
+
+    def test_hash_changes_with_every_part_of_the_position(self):
+        seen = {self.game_state.zobrist_hash()}
+        self.game_state.place_diamond((3, 3), self.player)
+        seen.add(self.game_state.zobrist_hash())
+        company, _ = self.game_state.create_new_company([(0, 0)], self.player)
+        seen.add(self.game_state.zobrist_hash())
+        self.game_state.buy_shares(company, self.player, 5)  # 5 founder shares + 5: the next bucket
+        seen.add(self.game_state.zobrist_hash())
+        self.game_state.end_turn()
+        seen.add(self.game_state.zobrist_hash())
+        self.assertEqual(len(seen), 5)
+
+    def test_holdings_in_the_same_bucket_hash_the_same(self):
+        company, _ = self.game_state.create_new_company([(0, 0)], self.player)  # 5 founder shares
+        founded = self.game_state.zobrist_hash()
+        self.game_state.buy_shares(company, self.player, SHARE_BUCKET - 1)  # Still the first bucket
+        self.assertEqual(self.game_state.zobrist_hash(), founded)
+        self.game_state.buy_shares(company, self.player, 1)
+        self.assertNotEqual(self.game_state.zobrist_hash(), founded)
+        # Fewer shares than a bucket hash like none at all
+        other = self.game_state.players[1]
+        self.game_state.buy_shares(company, other, SHARE_BUCKET - 1)
+        self.assertEqual(holding_key(1, company, SHARE_BUCKET - 1), 0)
+
+    def test_holdings_term_is_kept_up_to_date(self):
+        game_state = GameState(self.player_configurations, (8, 8), self.mock_script_dir)
+        game_state.journal = Journal()
+        game_state.rng = random.Random(8)
+        holdings = game_state.holdings
+        for turn in range(40):
+            player = game_state.players[game_state.current_player_index]
+            game_state.ai_take_turn(player)
+            game_state.expand_into_adjacent_diamonds(player)
+            for company in list(game_state.company_info)[:2]:
+                game_state.buy_shares(company, player, turn % 7)
+            if turn % 5 == 4:
+                game_state.undo()
+            game_state.player_has_moved[player] = True
+            game_state.end_turn()
+            expected = 0
+            for player_index in range(len(game_state.players)):
+                for company, shares in holdings.row_items(player_index):
+                    expected ^= holding_key(player_index, company, shares)
+            self.assertEqual(holdings.zobrist, expected)
+        self.assertEqual(holdings.copy().zobrist, holdings.zobrist)
+
+    def test_undo_and_redo_restore_the_hash(self):
+        start = self.game_state.zobrist_hash()
+        self.game_state.create_new_company([(0, 0)], self.player)
+        self.game_state.create_new_company([(0, 2)], self.player)
+        before_merge = self.game_state.zobrist_hash()
+        self.game_state.merge_companies((0, 1), self.game_state.get_adjacent_companies((0, 1)), self.player)
+        after_merge = self.game_state.zobrist_hash()
+
+        self.game_state.undo()
+        self.assertEqual(self.game_state.zobrist_hash(), before_merge)
+        self.game_state.redo()
+        self.assertEqual(self.game_state.zobrist_hash(), after_merge)
+        while self.game_state.undo()[0]:
+            pass
+        self.assertEqual(self.game_state.zobrist_hash(), start)
+
+    def test_clone_and_replay_hash_equally(self):
+        self.game_state.journal = Journal()
+        replica = GameState(self.player_configurations, (6, 6), self.mock_script_dir)
+        for game_state in (self.game_state, replica):
+            game_state.rng = random.Random(3)
+            for _ in range(12):
+                player = game_state.players[game_state.current_player_index]
+                game_state.ai_take_turn(player)
+                game_state.expand_into_adjacent_diamonds(player)
+                game_state.end_turn()
+        self.assertEqual(self.game_state.zobrist_hash(), replica.zobrist_hash())
+        self.assertEqual(self.game_state.clone().zobrist_hash(), self.game_state.zobrist_hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
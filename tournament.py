@@ -0,0 +1,197 @@
+# tournament.py
+#
+# Plays many headless AI-vs-AI games across all cores and aggregates the results as
+# they arrive.
+#
+#   python tournament.py --games 10000 --players 4 --grid 28x24 --seed 1 [--workers 16]
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from headless import (
+    DEFAULT_GRID_SIZE, DEFAULT_MARKER_PERCENTAGE, DEFAULT_TURN_LIMIT,
+    ai_player_configurations, parse_grid_size, play_game, seat_types,
+)
+
+WEALTH_BUCKET = 5000  # Width of the final-wealth histogram buckets (£)
+
+
+def game_seed(base_seed, game_number):
+    """
+    Seed of game `game_number` in a tournament started with base_seed.
+    Any game can be replayed alone with headless.play_game(..., seed=game_seed(...)).
+    """
+    return base_seed + game_number
+
+
+class TournamentStats:
+    """
+    Streaming aggregate of GameResults: add() each result as it arrives, in any order.
+
+    Only counters and integer sums are kept, so memory does not grow with the number
+    of games and the totals do not depend on the order in which workers finish.
+    """
+
+    def __init__(self, players):
+        self.players = list(players)  # Seat order
+        self.games = 0
+        self.moves = 0
+        self.wins_by_seat = [0] * len(self.players)
+        # Final wealth of every player in every game
+        self.wealth_count = 0
+        self.wealth_sum = 0
+        self.wealth_sum_of_squares = 0
+        self.wealth_min = None
+        self.wealth_max = None
+        self.wealth_histogram = {}  # Bucket start -> number of final wealths in [start, start + WEALTH_BUCKET)
+        # Mergers per game
+        self.merger_sum = 0
+        self.merger_max = 0
+        self.merger_histogram = {}  # Mergers in a game -> number of games
+
+    def add(self, result):
+        self.games += 1
+        self.moves += result.moves
+        self.wins_by_seat[result.players.index(result.winner)] += 1
+        for player in result.players:
+            wealth = result.wealth[player]
+            self.wealth_count += 1
+            self.wealth_sum += wealth
+            self.wealth_sum_of_squares += wealth * wealth
+            self.wealth_min = wealth if self.wealth_min is None else min(self.wealth_min, wealth)
+            self.wealth_max = wealth if self.wealth_max is None else max(self.wealth_max, wealth)
+            bucket = wealth // WEALTH_BUCKET * WEALTH_BUCKET
+            self.wealth_histogram[bucket] = self.wealth_histogram.get(bucket, 0) + 1
+        self.merger_sum += result.mergers
+        self.merger_max = max(self.merger_max, result.mergers)
+        self.merger_histogram[result.mergers] = self.merger_histogram.get(result.mergers, 0) + 1
+
+    def win_rates(self):
+        """
+        Returns {seat player name: fraction of games won}.
+        """
+        return {player: wins / self.games if self.games else 0.0
+                for player, wins in zip(self.players, self.wins_by_seat)}
+
+    def wealth_mean(self):
+        return self.wealth_sum / self.wealth_count if self.wealth_count else 0.0
+
+    def wealth_stdev(self):
+        if not self.wealth_count:
+            return 0.0
+        mean = self.wealth_mean()
+        return max(self.wealth_sum_of_squares / self.wealth_count - mean * mean, 0.0) ** 0.5
+
+    def mergers_per_game(self):
+        return self.merger_sum / self.games if self.games else 0.0
+
+    def report(self):
+        """
+        Returns the aggregate as printable lines.
+        """
+        lines = [f"Games: {self.games}   Moves: {self.moves}"]
+        lines.append("Win rate by seat:")
+        for seat, (player, rate) in enumerate(self.win_rates().items(), start=1):
+            lines.append(f"  Seat {seat} ({player}): {100 * rate:5.1f}%")
+        lines.append(f"Final wealth: mean £{self.wealth_mean():.0f}, stdev £{self.wealth_stdev():.0f}, "
+                     f"min £{self.wealth_min}, max £{self.wealth_max}")
+        for bucket in sorted(self.wealth_histogram):
+            count = self.wealth_histogram[bucket]
+            lines.append(f"  £{bucket:>7} - £{bucket + WEALTH_BUCKET - 1:<7} {count:8} "
+                         f"({100 * count / self.wealth_count:5.1f}%)")
+        lines.append(f"Mergers: {self.mergers_per_game():.2f} per game, max {self.merger_max}")
+        for mergers in sorted(self.merger_histogram):
+            lines.append(f"  {mergers:3} mergers: {self.merger_histogram[mergers]} games")
+        return lines
+
+
+# Per-process game settings, installed once by the pool initializer so tasks only carry a seed
+_worker_settings = None
+
+
+def _init_worker(settings):
+    global _worker_settings
+    _worker_settings = settings
+
+
+def _play_seed(seed):
+    player_configurations, grid_size, turn_limit, marker_percentage = _worker_settings
+    return play_game(player_configurations, grid_size, turn_limit, marker_percentage, seed)
+
+
+def run_tournament(games, player_configurations, grid_size=DEFAULT_GRID_SIZE, turn_limit=DEFAULT_TURN_LIMIT,
+                   marker_percentage=DEFAULT_MARKER_PERCENTAGE, base_seed=0, workers=None, chunksize=None,
+                   on_result=None):
+    """
+    Plays `games` headless games on a process pool and aggregates their results.
+
+    Game i is played with seed game_seed(base_seed, i) and policies of its own (AI (Hard)
+    seats search a fixed number of rollouts, see headless.play_game), so a tournament is
+    reproducible whatever the number of workers. Results are folded into the TournamentStats as they
+    complete rather than collected first.
+
+    Parameters:
+        games (int): Number of games to play.
+        player_configurations (list): Seats, as for headless.play_game.
+        grid_size, turn_limit, marker_percentage: Game settings, as for headless.play_game.
+        base_seed (int): Seed of game 0.
+        workers (int): Worker processes (default: all cores). 1 plays in this process.
+        chunksize (int): Seeds handed to a worker at a time (default: a few chunks per worker).
+        on_result (callable): Optional callback receiving each GameResult as it arrives.
+
+    Returns:
+        TournamentStats: The aggregated results.
+    """
+    workers = workers or os.cpu_count() or 1
+    settings = (player_configurations, grid_size, turn_limit, marker_percentage)
+    stats = TournamentStats(p['name'] for p in player_configurations)
+    seeds = (game_seed(base_seed, game_number) for game_number in range(games))
+
+    if workers == 1:
+        _init_worker(settings)
+        for result in map(_play_seed, seeds):
+            stats.add(result)
+            if on_result:
+                on_result(result)
+        return stats
+
+    chunksize = chunksize or max(1, games // (workers * 8))
+    with Pool(workers, initializer=_init_worker, initargs=(settings,)) as pool:
+        for result in pool.imap_unordered(_play_seed, seeds, chunksize):
+            stats.add(result)
+            if on_result:
+                on_result(result)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a multiprocess AI-vs-AI tournament.")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--players', type=int, default=4, help="number of AI players (2-4)")
+    parser.add_argument('--hard-seats', type=int, default=0, help="how many of the first seats are AI (Hard)")
+    parser.add_argument('--medium-seats', type=int, default=0, help="how many seats after those are AI (Medium)")
+    parser.add_argument('--grid', type=parse_grid_size, default=DEFAULT_GRID_SIZE, help="grid size as ROWSxCOLS")
+    parser.add_argument('--turn-limit', type=int, default=DEFAULT_TURN_LIMIT)
+    parser.add_argument('--markers', type=float, default=DEFAULT_MARKER_PERCENTAGE, help="'O' marker fraction")
+    parser.add_argument('--seed', type=int, default=0, help="seed of game 0; game i uses seed + i")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    player_types = seat_types(args.players, args.hard_seats, args.medium_seats)
+    player_configurations = ai_player_configurations(args.players, player_types)
+    stats = run_tournament(args.games, player_configurations, args.grid, args.turn_limit,
+                           args.markers, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for line in stats.report():
+        print(line)
+    print(f"{args.games / elapsed:.1f} games/sec with {args.workers or os.cpu_count()} workers")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
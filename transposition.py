@@ -0,0 +1,102 @@
+# transposition.py
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 1 << 16  # Entries; a few MB with small tuple values
+
+
+class TranspositionTable:
+    """
+    Bounded cache of evaluated positions for AI search, keyed by a position hash
+    (normally GameState.zobrist_hash()).
+
+    The table never holds more than `capacity` entries: storing into a full table evicts
+    the least recently used entry. Each entry carries a depth (search depth, rollout
+    count, ...) and a store never replaces a deeper entry for the same key with a
+    shallower one, so the best-searched estimate of a position survives.
+
+    hits, misses and evictions count lookup() and store() outcomes since creation or
+    the last reset_counters(). Lookups and stores hold a lock, so a search that was
+    cancelled but is still running on a worker thread can share the table with the
+    next one.
+
+    Usage:
+        table = TranspositionTable(capacity=100000)
+        value = table.lookup(key)
+        if value is None:
+            value = evaluate(position)
+            table.store(key, value, depth)
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("A transposition table needs a capacity of at least 1.")
+        self.capacity = capacity
+        self._entries = OrderedDict()  # key -> (value, depth), least recently used first
+        self._lock = threading.Lock()  # Guards _entries and the counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        # A membership test is neither a hit nor a use
+        return key in self._entries
+
+    def lookup(self, key):
+        """
+        Returns the value stored for key, or None, and marks the entry as recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def depth_of(self, key):
+        """
+        Returns the depth stored with key, or -1 if the key is not in the table.
+        """
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else -1
+
+    def store(self, key, value, depth=0):
+        """
+        Stores value for key unless a deeper entry is already stored for it.
+
+        Returns:
+            bool: True if the value was stored.
+        """
+        entries = self._entries
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None:
+                entries.move_to_end(key)
+                if entry[1] > depth:
+                    return False
+            elif len(entries) >= self.capacity:
+                entries.popitem(last=False)
+                self.evictions += 1
+            entries[key] = (value, depth)
+            return True
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset_counters(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self.reset_counters()
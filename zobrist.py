@@ -0,0 +1,79 @@
+# zobrist.py
+
+import random
+from array import array
+from functools import lru_cache
+from hashlib import blake2b
+
+MASK64 = (1 << 64) - 1
+ZOBRIST_SEED = 0x5EED_C0DE  # Fixed, so every process and replica draws the same keys
+SHARE_BUCKET = 5            # Share holdings are hashed as shares // SHARE_BUCKET (a founder's grant)
+
+
+def mix64(value):
+    """
+    splitmix64 finalizer: scrambles a 64-bit integer so nearby inputs give unrelated outputs.
+    """
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK64
+    return value ^ (value >> 31)
+
+
+@lru_cache(maxsize=None)
+def cell_keys(grid_size, states=4):
+    """
+    Returns the Zobrist keys of a (rows, cols) grid: keys[state][index] for every cell state.
+    The EMPTY (0) row is all zeros, so an empty board hashes to 0.
+    Built once per grid size and shared by every board of that size.
+    """
+    rows, cols = grid_size
+    rng = random.Random(ZOBRIST_SEED ^ (rows << 16) ^ cols)
+    keys = [array('Q', bytes(8 * rows * cols))]
+    for _ in range(1, states):
+        keys.append(array('Q', (rng.getrandbits(64) for _ in range(rows * cols))))
+    return tuple(keys)
+
+
+@lru_cache(maxsize=None)
+def tile_keys(grid_size):
+    """
+    Returns one key per cell of a (rows, cols) grid for summing a company's tiles.
+    """
+    rows, cols = grid_size
+    rng = random.Random(~ZOBRIST_SEED ^ (rows << 16) ^ cols)
+    return array('Q', (rng.getrandbits(64) for _ in range(rows * cols)))
+
+
+@lru_cache(maxsize=None)
+def name_key(name):
+    """
+    Returns a 64-bit key for a company or player name that is the same in every process
+    (unlike hash(), which is salted per process).
+    """
+    return int.from_bytes(blake2b(str(name).encode(), digest_size=8).digest(), 'little')
+
+
+def company_key(company_name, tile_sum):
+    """
+    Key of one company: its name together with the sum of its tiles' tile_keys.
+
+    Summing makes a company's key independent of the order its tiles joined in, and lets
+    an expansion (one addition) or a merger (adding two sums) update it in O(1).
+    """
+    return mix64(name_key(company_name) ^ tile_sum)
+
+
+def turn_key(player_index):
+    return mix64(ZOBRIST_SEED + 1 + player_index)
+
+
+def holding_key(player_index, company_name, shares):
+    """
+    Key of one player's holding in a company. Holdings in the same bucket of SHARE_BUCKET
+    shares share a key, and the bucket of fewer than SHARE_BUCKET shares has key 0, like
+    holding no shares at all.
+    """
+    bucket = shares // SHARE_BUCKET
+    if not bucket:
+        return 0
+    return mix64(name_key(company_name) ^ mix64((bucket << 8) ^ player_index))